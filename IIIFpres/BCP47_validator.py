@@ -0,0 +1,247 @@
+"""
+A validator of the BCP47 language tags.
+
+The tags are parsed following the structure of RFC 5646 (language, extended
+language, script, region, variants, extensions and private use subtags) and
+each subtag is looked up in a set, so that checking a tag does not depend on
+the size of the registry. The parsing of a tag is cached.
+
+Example:
+    >>> from IIIFpres import BCP47_validator
+    >>> BCP47_validator.is_valid("de-DE")
+    True
+    >>> BCP47_validator.parse("zh-Hant-TW")
+    LanguageTag(language='zh', extlang=(), script='Hant', region='TW', variants=(), extensions=(), privateuse=())
+    >>> BCP47_validator.validate("en-YY")
+    Traceback (most recent call last):
+    ...
+    ValueError: Unknown region subtag 'YY' in 'en-YY'.
+
+Attributes:
+    LANGUAGES (set[str]): The primary and extended language subtags of the
+        `IANA sub tag registry`_.
+
+    SCRIPTS (set[str]): The script subtags (ISO 15924).
+
+    REGIONS (set[str]): The region subtags (ISO 3166-1 and UN M.49).
+
+    VARIANTS (set[str]): The variant subtags.
+
+    GRANDFATHERED (set[str]): The tags registered before RFC 4646 that are
+        accepted as a whole.
+
+    The sets can be extended if a subtag is added to the registry e.g.
+    ``BCP47_validator.VARIANTS.add("newvar")``.
+
+.. _IANA sub tag registry:
+    https://www.iana.org/assignments/language-subtag-registry/language-subtag-registry
+"""
+import collections
+import functools
+from .BCP47_tags_list import lang_tags
+
+LANGUAGES = set(tag for tag in lang_tags if tag.isalpha())
+
+SCRIPTS = set("""
+Adlm Afak Aghb Ahom Arab Aran Armi Armn Avst Bali Bamu Bass Batk Beng Bhks
+Blis Bopo Brah Brai Bugi Buhd Cakm Cans Cari Cham Cher Chis Chrs Cirt Copt
+Cpmn Cprt Cyrl Cyrs Deva Diak Dogr Dsrt Dupl Egyd Egyh Egyp Elba Elym Ethi
+Gara Geok Geor Glag Gong Gonm Goth Gran Grek Gujr Gukh Guru Hanb Hang Hani
+Hano Hans Hant Hatr Hebr Hira Hluw Hmng Hmnp Hrkt Hung Inds Ital Jamo Java
+Jpan Jurc Kali Kana Kawi Khar Khmr Khoj Kitl Kits Knda Kore Kpel Krai Kthi
+Lana Laoo Latf Latg Latn Leke Lepc Limb Lina Linb Lisu Loma Lyci Lydi Mahj
+Maka Mand Mani Marc Maya Medf Mend Merc Mero Mlym Modi Mong Moon Mroo Mtei
+Mult Mymr Nagm Nand Narb Nbat Newa Nkdb Nkgb Nkoo Nshu Ogam Olck Onao Orkh
+Orya Osge Osma Ougr Palm Pauc Pcun Pelm Perm Phag Phli Phlp Phlv Phnx Piqd
+Plrd Prti Psin Ranj Rjng Rohg Roro Runr Samr Sara Sarb Saur Sgnw Shaw Shrd
+Shui Sidd Sidt Sind Sinh Sogd Sogo Sora Soyo Sund Sunu Sylo Syrc Syre Syrj
+Syrn Tagb Takr Tale Talu Taml Tang Tavt Tayo Telu Teng Tfng Tglg Thaa Thai
+Tibt Tirh Tnsa Todr Tols Toto Tutg Ugar Vaii Visp Vith Wara Wcho Wole Xpeo
+Xsux Yezi Yiii Zanb Zinh Zmth Zsye Zsym Zxxx Zyyy Zzzz
+""".split())
+
+REGIONS = set("""
+AC AD AE AF AG AI AL AM AO AQ AR AS AT AU AW AX AZ BA BB BD BE BF BG BH BI
+BJ BL BM BN BO BQ BR BS BT BU BV BW BY BZ CA CC CD CF CG CH CI CK CL CM CN
+CO CP CR CS CU CV CW CX CY CZ DD DE DG DJ DK DM DO DZ EA EC EE EG EH ER ES
+ET EU EZ FI FJ FK FM FO FR FX GA GB GD GE GF GG GH GI GL GM GN GP GQ GR GS
+GT GU GW GY HK HM HN HR HT HU IC ID IE IL IM IN IO IQ IR IS IT JE JM JO JP
+KE KG KH KI KM KN KP KR KW KY KZ LA LB LC LI LK LR LS LT LU LV LY MA MC MD
+ME MF MG MH MK ML MM MN MO MP MQ MR MS MT MU MV MW MX MY MZ NA NC NE NF NG
+NI NL NO NP NR NT NU NZ OM PA PE PF PG PH PK PL PM PN PR PS PT PW PY QA RE
+RO RS RU RW SA SB SC SD SE SG SH SI SJ SK SL SM SN SO SR SS ST SU SV SX SY
+SZ TA TC TD TF TG TH TJ TK TL TM TN TO TP TR TT TV TW TZ UA UG UM UN US UY
+UZ VA VC VE VG VI VN VU WF WS YD YE YT YU ZA ZM ZR ZW
+001 002 003 005 009 011 013 014 015 017 018 019 021 029 030 034 035 039 053
+054 057 061 142 143 145 150 151 154 155 202 419
+""".split())
+
+VARIANTS = set("""
+1606nict 1694acad 1901 1959acad 1994 1996 abl1943 akhmimic akuapem alalc97
+aluku anpezo ao1990 aranes arkaika arevela arevmda asante auvern baku1926
+balanka barla basiceng bauddha bciav bcizbl biscayan biske blasl bohairic
+bohoric boont bornholm cisaup colb1945 cornu creiss dajnko ekavsk emodeng
+fascia fodom fonipa fonkirsh fonnapa fonupa fonxsamp gallo gascon gherd
+grclass grital grmistr hanoi hepburn heploc hognorsk hsistemo huett ijekavsk
+itihasa ivanchov jauer jyutping kkcor kociewie kscor laukika leidentr lemosin
+lengadoc lipaw ltg1929 ltg2007 luna1918 lycopol mdcegyp mdctrans mesokem
+metelko monoton ndyuka nedis newfound nicard njiva nulik osojs oxendict
+pahawh2 pahawh3 pahawh4 pamaka peano pehoeji petr1708 pinyin polyton provenc
+puter rigik rozaj rumgr saigon scotland scouse simple solba sotav spanglis
+surmiran sursilv sutsilv synnejyl tailo tarask tongyong tunumiit uccor
+ucrcor ulster unifon vaidika valbadia valencia vallader vecdruka viennese
+vivaraup wadegile xsistemo
+""".split())
+
+GRANDFATHERED = set("""
+art-lojban cel-gaulish en-gb-oed i-ami i-bnn i-default i-enochian i-hak
+i-klingon i-lux i-mingo i-navajo i-pwn i-tao i-tay i-tsu no-bok no-nyn
+sgn-be-fr sgn-be-nl sgn-ch-de zh-guoyu zh-hakka zh-min zh-min-nan zh-xiang
+""".split())
+
+LanguageTag = collections.namedtuple(
+    "LanguageTag", ("language", "extlang", "script", "region", "variants",
+                    "extensions", "privateuse"))
+"""namedtuple: The subtags of a language tag, the extended languages, the
+variants, the extensions and the private use subtags are tuples. The subtags
+are in their conventional case e.g. ``zh-Hant-TW``."""
+
+
+def _alnum(subtag, minimum, maximum):
+    return minimum <= len(subtag) <= maximum and subtag.isalnum() and subtag.isascii()
+
+
+def _alpha(subtag, minimum, maximum):
+    return minimum <= len(subtag) <= maximum and subtag.isalpha() and subtag.isascii()
+
+
+@functools.lru_cache(maxsize=4096)
+def parse(tag):
+    """Parse a BCP47 language tag in its subtags.
+
+    Only the structure of the tag is checked, use validate for checking the
+    subtags against the registry. The results are cached.
+
+    Args:
+        tag (str): The language tag e.g. de-DE.
+
+    Raises:
+        ValueError: If the tag is not well formed.
+
+    Returns:
+        LanguageTag: The subtags of the tag.
+    """
+    if not isinstance(tag, str):
+        raise ValueError("A language tag must be a string not %r." % (tag,))
+    subtags = tag.lower().split("-")
+    if tag.lower() in GRANDFATHERED:
+        return LanguageTag(tag.lower(), (), None, None, (), (), ())
+    if not all(subtags):
+        raise ValueError("Empty subtag in %r." % tag)
+    privateuse = ()
+    if "x" in subtags:
+        position = subtags.index("x")
+        privateuse = tuple(subtags[position + 1:])
+        subtags = subtags[:position]
+        if not privateuse or not all(_alnum(s, 1, 8) for s in privateuse):
+            raise ValueError("Malformed private use subtags in %r." % tag)
+        if not subtags:
+            return LanguageTag(None, (), None, None, (), (), privateuse)
+    subtags.reverse()
+    language = subtags.pop()
+    if not _alpha(language, 2, 8):
+        raise ValueError("Malformed language subtag %r in %r." % (language, tag))
+    extlang = []
+    while len(language) <= 3 and subtags and len(extlang) < 3 and _alpha(subtags[-1], 3, 3):
+        extlang.append(subtags.pop())
+    script = None
+    if subtags and _alpha(subtags[-1], 4, 4):
+        script = subtags.pop().title()
+    region = None
+    if subtags and (_alpha(subtags[-1], 2, 2) or
+                    (len(subtags[-1]) == 3 and subtags[-1].isdigit())):
+        region = subtags.pop().upper()
+    variants = []
+    while subtags and (_alnum(subtags[-1], 5, 8) or
+                       (len(subtags[-1]) == 4 and subtags[-1][0].isdigit() and
+                        _alnum(subtags[-1], 4, 4))):
+        variant = subtags.pop()
+        if variant in variants:
+            raise ValueError("Repeated variant subtag %r in %r." % (variant, tag))
+        variants.append(variant)
+    extensions = []
+    while subtags:
+        singleton = subtags.pop()
+        if not _alnum(singleton, 1, 1):
+            raise ValueError("Malformed subtag %r in %r." % (singleton, tag))
+        if any(extension[0] == singleton for extension in extensions):
+            raise ValueError("Repeated extension %r in %r." % (singleton, tag))
+        extension = [singleton]
+        while subtags and _alnum(subtags[-1], 2, 8):
+            extension.append(subtags.pop())
+        if len(extension) == 1:
+            raise ValueError("Empty extension %r in %r." % (singleton, tag))
+        extensions.append("-".join(extension))
+    return LanguageTag(language, tuple(extlang), script, region,
+                       tuple(variants), tuple(extensions), privateuse)
+
+
+def validate(tag, languages=None):
+    """Check that a BCP47 language tag is well formed and its subtags are in
+    the registry.
+
+    Args:
+        tag (str): The language tag e.g. de-DE.
+        languages (set[str], optional): The accepted primary and extended
+            language subtags. Defaults to LANGUAGES.
+
+    Raises:
+        ValueError: If the tag is not well formed or a subtag is unknown.
+
+    Returns:
+        LanguageTag: The subtags of the tag.
+    """
+    parsed = parse(tag)
+    if parsed.language is None or parsed.language in GRANDFATHERED:
+        return parsed
+    if languages is None:
+        languages = LANGUAGES
+    for subtag in (parsed.language,) + parsed.extlang:
+        if subtag not in languages and not _private_language(subtag):
+            raise ValueError("Unknown language subtag %r in %r." % (subtag, tag))
+    if parsed.script is not None and parsed.script not in SCRIPTS \
+            and not "Qaaa" <= parsed.script <= "Qabx":
+        raise ValueError("Unknown script subtag %r in %r." % (parsed.script, tag))
+    if parsed.region is not None and parsed.region not in REGIONS \
+            and not _private_region(parsed.region):
+        raise ValueError("Unknown region subtag %r in %r." % (parsed.region, tag))
+    for variant in parsed.variants:
+        if variant not in VARIANTS:
+            raise ValueError("Unknown variant subtag %r in %r." % (variant, tag))
+    return parsed
+
+
+def _private_language(language):
+    return len(language) == 3 and "qaa" <= language <= "qtz"
+
+
+def _private_region(region):
+    return region in ("AA", "ZZ") or "QM" <= region <= "QZ" or "XA" <= region <= "XZ"
+
+
+def is_valid(tag, languages=None):
+    """Return True if the BCP47 language tag is valid, see validate.
+
+    Args:
+        tag (str): The language tag e.g. de-DE.
+        languages (set[str], optional): The accepted primary and extended
+            language subtags. Defaults to LANGUAGES.
+
+    Returns:
+        bool: True if the tag is valid.
+    """
+    try:
+        validate(tag, languages)
+    except ValueError:
+        return False
+    return True
@@ -0,0 +1,340 @@
+"""
+Benchmarks of the phases of the life of a IIIF object: building it,
+validating it, serializing it (json/orjson, compact/indented) and reading it
+back with read_API3_json.
+
+Each scenario is run on manifests of several sizes and the results report the
+operations per second, the cost per canvas, the peak of the memory allocated
+and of the memory retained by the result, e.g. the manifest built (measured
+with tracemalloc) and the import time of the package. Run it with:
+
+python -m IIIFpres.bench
+python -m IIIFpres.bench --sizes 100 1000 --output results.json
+python -m IIIFpres.bench --scenarios build read --format csv --output results.csv
+python -m IIIFpres.bench --scenarios build --sizes 10000 100000 --repeat 1
+
+The results of different releases can be compared phase by phase.
+"""
+import argparse
+import csv
+import datetime
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from . import __version__
+from . import iiifpapi3
+from .utilities import read_API3_json
+
+DEFAULT_SIZES = (10, 100, 1000)
+FIELDS = ('scenario', 'size', 'repeat', 'best_sec', 'median_sec', 'ops_per_sec',
+          'usec_per_canvas', 'peak_memory_kb', 'retained_memory_kb')
+
+
+def build_manifest(ncanvases):
+    """Build a manifest similar to the one of the Simple Manifest - Book
+    recipe with ncanvases canvases, each with an image and a service.
+
+    Args:
+        ncanvases (int): The number of canvases.
+
+    Returns:
+        Manifest: The manifest.
+    """
+    baseurl = "https://example.org/iiif/book1/"
+    manifest = iiifpapi3.Manifest()
+    manifest.set_id(baseurl + "manifest")
+    manifest.add_label("en", "Book 1")
+    manifest.add_metadata(label="Author", value="Anne Author", language_l="en")
+    manifest.add_summary(language="en", text="Book 1, written by Anne Author.")
+    manifest.add_behavior("paged")
+    manifest.set_rights("http://creativecommons.org/licenses/by/4.0/")
+    for idx in range(1, ncanvases + 1):
+        canvas = manifest.add_canvas_to_items()
+        canvas.set_id(baseurl + "canvas/p%s" % idx)
+        canvas.set_height(1000)
+        canvas.set_width(750)
+        canvas.add_label("none", "p. %s" % idx)
+        annopage = canvas.add_annotationpage_to_items()
+        annopage.set_id(baseurl + "page/p%s/1" % idx)
+        annotation = annopage.add_annotation_to_items(target=canvas.id)
+        annotation.set_id(baseurl + "annotation/p%s-image" % idx)
+        annotation.set_motivation("painting")
+        annotation.body.set_id(baseurl + "page%s/full/max/0/default.jpg" % idx)
+        annotation.body.set_type("Image")
+        annotation.body.set_format("image/jpeg")
+        annotation.body.set_width(1500)
+        annotation.body.set_height(2000)
+        service = annotation.body.add_service()
+        service.set_id(baseurl + "page%s" % idx)
+        service.set_type("ImageService3")
+        service.set_profile("level2")
+    return manifest
+
+
+def build_manifest_from_columns(ncanvases):
+    """Build the same manifest of build_manifest with
+    Manifest.add_canvases_from_columns.
+
+    Args:
+        ncanvases (int): The number of canvases.
+
+    Returns:
+        Manifest: The manifest.
+    """
+    baseurl = "https://example.org/iiif/book1/"
+    manifest = iiifpapi3.Manifest()
+    manifest.set_id(baseurl + "manifest")
+    manifest.add_label("en", "Book 1")
+    manifest.add_metadata(label="Author", value="Anne Author", language_l="en")
+    manifest.add_summary(language="en", text="Book 1, written by Anne Author.")
+    manifest.add_behavior("paged")
+    manifest.set_rights("http://creativecommons.org/licenses/by/4.0/")
+    idxs = range(1, ncanvases + 1)
+    manifest.add_canvases_from_columns(
+        ids=[baseurl + "canvas/p%s" % idx for idx in idxs],
+        heights=1000,
+        widths=750,
+        labels=["p. %s" % idx for idx in idxs],
+        service_ids=[baseurl + "page%s" % idx for idx in idxs],
+        body_heights=2000,
+        body_widths=1500,
+        page_ids=[baseurl + "page/p%s/1" % idx for idx in idxs],
+        annotation_ids=[baseurl + "annotation/p%s-image" % idx for idx in idxs])
+    return manifest
+
+
+def build_manifest_compact(ncanvases):
+    """Build the manifest of `build_manifest` with the compact objects, see
+    iiifpapi3.configure."""
+    with iiifpapi3.configure(compact_objects=True):
+        return build_manifest(ncanvases)
+
+
+def _serialize(backend, compact):
+    def setup(size):
+        return build_manifest(size)
+
+    def run(manifest):
+        previous = iiifpapi3.get_json_backend()
+        iiifpapi3.set_json_backend(backend)
+        try:
+            return manifest.json_dumps(compact=compact)
+        finally:
+            iiifpapi3.set_json_backend(previous)
+    return setup, run, backend
+
+
+def _read_setup(size):
+    fd, path = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(fd, "w") as f:
+        f.write(build_manifest(size).json_dumps())
+    return path
+
+
+# name: (setup(size) -> argument, run(argument), required module or None)
+SCENARIOS = {
+    'build': (lambda size: size, build_manifest, None),
+    'build-compact': (lambda size: size, build_manifest_compact, None),
+    'build-columns': (lambda size: size, build_manifest_from_columns, None),
+    'validate': (build_manifest, lambda manifest: manifest.inspect(quiet=True), None),
+    'serialize-json-indent': _serialize("json", False),
+    'serialize-json-compact': _serialize("json", True),
+    'serialize-orjson-indent': _serialize("orjson", False),
+    'serialize-orjson-compact': _serialize("orjson", True),
+    'read': (_read_setup, read_API3_json, None),
+    }
+
+
+def import_time(repeat=5):
+    """Measure the time for importing IIIFpres.iiifpapi3 in a new interpreter.
+
+    Args:
+        repeat (int, optional): The number of interpreters. Defaults to 5.
+
+    Returns:
+        float: The best time in seconds.
+    """
+    code = ("import time; start = time.perf_counter(); "
+            "import IIIFpres.iiifpapi3; print(time.perf_counter() - start)")
+    env = dict(os.environ)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, (root, env.get('PYTHONPATH'))))
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                             stdout=subprocess.PIPE, universal_newlines=True)
+        times.append(float(out.stdout))
+    return min(times)
+
+
+def run_scenario(name, size, min_time=0.5, repeat=None):
+    """Run a scenario on a manifest with size canvases.
+
+    The scenario is repeated until min_time seconds are elapsed (at least 3
+    times) or repeat times, a last run is traced with tracemalloc measuring
+    the peak of memory and the memory still allocated by its result.
+
+    Args:
+        name (str): The name of the scenario, one of SCENARIOS.
+        size (int): The number of canvases.
+        min_time (float, optional): The minimum time spent in the scenario.
+            Defaults to 0.5.
+        repeat (int, optional): The exact number of runs. Defaults to None.
+
+    Returns:
+        dict: The results with the keys in FIELDS.
+    """
+    setup, run, _ = SCENARIOS[name]
+    arg = setup(size)
+    try:
+        times = []
+        elapsed = 0
+        while (len(times) < repeat if repeat else
+               len(times) < 3 or elapsed < min_time):
+            gc.collect()
+            start = time.perf_counter()
+            run(arg)
+            times.append(time.perf_counter() - start)
+            elapsed += times[-1]
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = run(arg)
+            retained, peak = tracemalloc.get_traced_memory()
+            del result
+        finally:
+            tracemalloc.stop()
+    finally:
+        if name == 'read':
+            os.remove(arg)
+    best = min(times)
+    return {'scenario': name,
+            'size': size,
+            'repeat': len(times),
+            'best_sec': best,
+            'median_sec': statistics.median(times),
+            'ops_per_sec': 1 / best,
+            'usec_per_canvas': best / size * 1e6,
+            'peak_memory_kb': peak / 1024,
+            'retained_memory_kb': retained / 1024}
+
+
+def available_scenarios():
+    """Return the scenarios whose required module is installed."""
+    res = []
+    for name, (_, _, module) in SCENARIOS.items():
+        if module is None or iiifpapi3._JSON_BACKENDS[module].available():
+            res.append(name)
+    return res
+
+
+def run(scenarios=None, sizes=DEFAULT_SIZES, min_time=0.5, repeat=None,
+        verbose=False):
+    """Run the benchmarks.
+
+    Args:
+        scenarios (list, optional): The names of the scenarios. Defaults to
+            all the available ones.
+        sizes (list, optional): The number of canvases of the manifests.
+            Defaults to DEFAULT_SIZES.
+        min_time (float, optional): The minimum time spent in each
+            scenario. Defaults to 0.5.
+        repeat (int, optional): The exact number of runs. Defaults to None.
+        verbose (bool, optional): Print the results while running.
+            Defaults to False.
+
+    Returns:
+        dict: The machine infos and the results.
+    """
+    if scenarios is None:
+        scenarios = available_scenarios()
+    for name in scenarios:
+        assert name in SCENARIOS, "%s is not a valid scenario, use one of %s" % (
+            name, list(SCENARIOS))
+    res = {'version': __version__,
+           'date': datetime.datetime.now().isoformat(),
+           'python_version': platform.python_version(),
+           'implementation': platform.python_implementation(),
+           'machine': platform.machine(),
+           'processor': platform.processor(),
+           'system': platform.platform(),
+           'optimized': not __debug__,
+           'json_backend': iiifpapi3.get_json_backend(),
+           'import_time_sec': import_time(),
+           'results': []}
+    if verbose:
+        print("pyIIIFpres %s, Python %s, import time %.1f ms" % (
+            __version__, res['python_version'], res['import_time_sec'] * 1e3))
+        print("%-26s %7s %12s %14s %12s %12s" % (
+            "scenario", "size", "ops/sec", "usec/canvas", "peak KiB",
+            "kept KiB"))
+    for name in scenarios:
+        for size in sizes:
+            result = run_scenario(name, size, min_time=min_time, repeat=repeat)
+            res['results'].append(result)
+            if verbose:
+                print("%-26s %7s %12.2f %14.2f %12.1f %12.1f" % (
+                    name, size, result['ops_per_sec'],
+                    result['usec_per_canvas'], result['peak_memory_kb'],
+                    result['retained_memory_kb']))
+    return res
+
+
+def write_results(res, path, format="json"):
+    """Write the results of run in a JSON file or append them to a CSV.
+
+    Args:
+        res (dict): The output of run.
+        path (str): The path of the file.
+        format (str, optional): "json" or "csv". Defaults to "json".
+    """
+    assert format in ("json", "csv"), "format must be json or csv."
+    if format == "json":
+        with open(path, "w") as f:
+            json.dump(res, f, indent=2)
+        return
+    infos = {k: v for k, v in res.items() if k != 'results'}
+    header = list(FIELDS) + list(infos)
+    newfile = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, "a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=header)
+        if newfile:
+            writer.writeheader()
+        for result in res['results']:
+            writer.writerow(dict(result, **infos))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m IIIFpres.bench",
+        description="Benchmark building, validating, serializing and reading"
+                    " IIIF manifests.")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS),
+                        help="the scenarios to run (default: all available)")
+    parser.add_argument("--sizes", nargs="+", type=int,
+                        default=list(DEFAULT_SIZES),
+                        help="the number of canvases of the manifests")
+    parser.add_argument("--min-time", type=float, default=0.5,
+                        help="minimum seconds spent in each scenario")
+    parser.add_argument("--repeat", type=int,
+                        help="run each scenario exactly this number of times")
+    parser.add_argument("--output", help="write the results to this file")
+    parser.add_argument("--format", choices=("json", "csv"), default="json",
+                        help="format of the output file (csv appends)")
+    args = parser.parse_args(argv)
+    res = run(scenarios=args.scenarios, sizes=args.sizes,
+              min_time=args.min_time, repeat=args.repeat, verbose=True)
+    if args.output:
+        write_results(res, args.output, format=args.format)
+    return res
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,21 @@
 from ..iiifpapi3 import _ImmutableType
 from ..iiifpapi3 import Recommended, Required
-from ..iiifpapi3 import LANGUAGES
+from ..iiifpapi3 import _check_language, _checks_enabled
 from ..iiifpapi3 import check_ID, unused
 
 
 class Feature(_ImmutableType):
+    _requirements = {
+        "id": Required(),
+        "geometry": Recommended(),
+        "properties": Recommended(),
+    }
+
     def __init__(self):
-        self.id = Required()
+        self.id = self._requirements["id"]
         self.type = "Feature"
-        self.geometry = Recommended()
-        self.properties = Recommended()
+        self.geometry = self._requirements["geometry"]
+        self.properties = self._requirements["properties"]
 
     def set_id(self, objid=None, extendbase_url=None):
         """Set the ID of the object
@@ -42,9 +48,8 @@ class Feature(_ImmutableType):
             self.properties = {}
         if language is None:
             language = "none"
-        assert language in LANGUAGES or language == "none", \
-            "Language must be a valid BCP47 language tag or none."\
-            "Please read https://git.io/JoQty."
+        if _checks_enabled():
+            _check_language(language)
         self.properties['label'] = {language: [text]}
 
     def set_summary(self, language, text):
@@ -59,9 +64,8 @@ class Feature(_ImmutableType):
         """
         if unused(self.properties):
             self.properties = {}
-        assert language in LANGUAGES or language == "none", \
-            "Language must be a valid BCP47 language tag or none."\
-            "Please read https://git.io/JoQty."
+        if _checks_enabled():
+            _check_language(language)
         self.properties['summary'] = {language: [text]}
 
     def set_geometry_as_point(self, longitude, latitude):
@@ -81,9 +85,13 @@ class Feature(_ImmutableType):
 
 
 class navPlace(object):
+    _requirements = {
+        "features": Required("A NavPlace must have a list one feature"),
+    }
+
     def __init__(self):
         self.type = "FeatureCollection"
-        self.features = Required("A NavPlace must have a list one feature")
+        self.features = self._requirements["features"]
 
     def add_feature(self, feature=None):
         if unused(self.features):
@@ -0,0 +1,484 @@
+"""
+A columnar representation of the manifests with many image canvases.
+
+A ManifestFrame stores the canvases of a manifest as columns: the
+dimensions in typed arrays, the repeated strings (formats, languages, types
+and profiles) in string tables and the IDs and labels in lists, without a
+Python object per canvas. It can be converted to and from a Manifest and
+serialized directly from the columns, while sorting and filtering the
+canvases only reorder the columns.
+
+Example:
+    >>> from IIIFpres import iiifpapi3
+    >>> from IIIFpres.frame import ManifestFrame
+    >>> manifest = iiifpapi3.Manifest()
+    >>> manifest.set_id("https://example.org/iiif/book1/manifest")
+    >>> manifest.add_label("en", "Book 1")
+    >>> pages = range(1, 100001)
+    >>> frame = ManifestFrame.from_columns(
+    ...     ids=["https://example.org/iiif/book1/canvas/p%s" % p for p in pages],
+    ...     heights=1000,
+    ...     widths=750,
+    ...     labels=["p. %s" % p for p in pages],
+    ...     service_ids=["https://example.org/iiif/book1/page%s" % p for p in pages],
+    ...     manifest=manifest)
+    >>> frame = frame.filter([w > 500 for w in frame.widths])
+    >>> frame.json_save("manifest.json")
+    >>> manifest = frame.to_manifest()
+"""
+import array
+import copy
+import itertools
+from . import iiifpapi3
+
+COLUMNS = ("ids", "heights", "widths", "labels", "languages", "service_ids",
+           "body_ids", "formats", "body_heights", "body_widths", "page_ids",
+           "annotation_ids", "body_types", "service_types", "service_profiles")
+"""tuple[str]: The columns of a ManifestFrame, in the order of the arguments
+of Manifest.add_canvases_from_columns."""
+
+_ARRAYS = ("heights", "widths", "body_heights", "body_widths")
+_TABLES = ("languages", "formats", "body_types", "service_types",
+           "service_profiles")
+
+
+class StringTable(object):
+    """HELPER CLASS
+
+    A column of strings with few distinct values (e.g. the formats), stored
+    as an array of codes of a table of the distinct values.
+    """
+
+    def __init__(self, values=()):
+        self.table = []
+        self._codes_of = {}
+        self.codes = array.array("I")
+        self.extend(values)
+
+    def _code(self, value):
+        code = self._codes_of.get(value)
+        if code is None:
+            code = self._codes_of[value] = len(self.table)
+            self.table.append(value)
+        return code
+
+    def extend(self, values):
+        self.codes.extend(map(self._code, values))
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        return self.table[self.codes[index]]
+
+    def __iter__(self):
+        return map(self.table.__getitem__, self.codes)
+
+    def tolist(self):
+        return list(self)
+
+    def take(self, indices):
+        """Return a new StringTable with the values at indices."""
+        res = StringTable()
+        res.table = self.table
+        res._codes_of = self._codes_of
+        res.codes = array.array("I", map(self.codes.__getitem__, indices))
+        return res
+
+    def __repr__(self):
+        return "StringTable(%s values, %s distinct)" % (len(self), len(self.table))
+
+
+def _dimension(value):
+    return value.__class__ is int and value > 0
+
+
+def _one(value):
+    """Return the only element of a list, or None."""
+    if value.__class__ is list and len(value) == 1:
+        return value[0]
+    return None
+
+
+_CANVAS_KEYS = ({"id", "type", "height", "width", "items"},
+                {"id", "type", "label", "height", "width", "items"})
+_BODY_KEYS = ({"id", "type", "format", "height", "width"},
+              {"id", "type", "format", "height", "width", "service"})
+# the properties of an extension are caught comparing the keys
+_CANVAS_CLASSES = (iiifpapi3.Canvas, iiifpapi3.Canvas.Extensible)
+
+
+def _members(value):
+    """Return the members of a JSON object, an IIIF object or a dict, or
+    None for any other value."""
+    if value.__class__ is dict:
+        return value
+    if isinstance(value, iiifpapi3._CoreAttributes):
+        return iiifpapi3._serializable_attributes(value)
+    return None
+
+
+def _image_row(canvas):
+    """Return the values of the columns of a Canvas whose JSON is the one
+    of the canvases built by Manifest.add_canvases_from_columns, or None for
+    any other canvas.
+    """
+    if canvas.__class__ not in _CANVAS_CLASSES:
+        return None
+    try:
+        return _image_row_members(_members(canvas))
+    except ValueError:
+        # a Required attribute is missing
+        return None
+
+
+def _image_row_members(obj):
+    if obj.keys() not in _CANVAS_KEYS or obj["type"] != "Canvas":
+        return None
+    page = _members(_one(obj["items"]))
+    if not (page is not None and page.keys() == {"id", "type", "items"}
+            and page["type"] == "AnnotationPage"):
+        return None
+    annotation = _members(_one(page["items"]))
+    if not (annotation is not None
+            and annotation.keys() == {"id", "type", "target", "motivation", "body"}
+            and annotation["type"] == "Annotation"
+            and annotation["motivation"] == "painting"
+            and annotation["target"] == obj["id"]):
+        return None
+    body = _members(annotation["body"])
+    if not (body is not None and body.keys() in _BODY_KEYS):
+        return None
+    if "service" in body:
+        srv = _members(_one(body["service"]))
+        if not (srv is not None and srv.keys() == {"id", "type", "profile"}):
+            return None
+        srv = (srv["id"], srv["type"], srv["profile"])
+    else:
+        srv = (None, "ImageService3", "level2")
+    if "label" in obj:
+        label = obj["label"]
+        if not (label.__class__ is dict and len(label) == 1):
+            return None
+        ((language, label),) = label.items()
+        label = _one(label)
+        if label.__class__ is not str:
+            return None
+    else:
+        label, language = None, "none"
+    row = (obj["id"], obj["height"], obj["width"], label, language, srv[0],
+           body["id"], body["format"], body["height"], body["width"],
+           page["id"], annotation["id"], body["type"], srv[1], srv[2])
+    if not (all(row[i].__class__ is str for i in (0, 4, 6, 7, 10, 11, 12, 13, 14))
+            and all(_dimension(row[i]) for i in (1, 2, 8, 9))
+            and (srv[0] is None or srv[0].__class__ is str)):
+        return None
+    return row
+
+
+class ManifestFrame(object):
+    """A Manifest whose canvases are stored as columns.
+
+    The canvases built as Manifest.add_canvases_from_columns does (an image
+    with an optional image service painted on the canvas) are stored in the
+    columns, any other canvas is kept as an object in `objects` with its ID
+    and dimensions in the columns for sorting and filtering. The other
+    properties of the manifest are kept in `manifest`, a Manifest without
+    items.
+
+    The columns are validated when the frame is built, they are attributes
+    named as COLUMNS: `heights`, `widths`, `body_heights` and `body_widths`
+    are arrays of unsigned integers, `languages`, `formats`, `body_types`,
+    `service_types` and `service_profiles` are StringTables and the others
+    are lists.
+
+    Args:
+        manifest (Manifest, optional): The manifest holding the properties
+            other than items. Defaults to None (a new Manifest).
+    """
+
+    def __init__(self, manifest=None):
+        if manifest is None:
+            manifest = iiifpapi3.Manifest()
+        self.manifest = manifest
+        self.objects = {}
+        for name in COLUMNS:
+            if name in _ARRAYS:
+                setattr(self, name, array.array("L"))
+            elif name in _TABLES:
+                setattr(self, name, StringTable())
+            else:
+                setattr(self, name, [])
+
+    @classmethod
+    def from_columns(cls, ids, heights, widths, labels=None, service_ids=None,
+                     body_ids=None, formats="image/jpeg", body_heights=None,
+                     body_widths=None, page_ids=None, annotation_ids=None,
+                     languages="none", body_types="Image",
+                     service_types="ImageService3", service_profiles="level2",
+                     manifest=None):
+        """Build a frame from the columns of the canvases, with the arguments
+        and the validation of Manifest.add_canvases_from_columns.
+
+        Args:
+            manifest (Manifest, optional): The manifest holding the properties
+                other than items, it is copied. Defaults to None.
+
+        Returns:
+            ManifestFrame: The frame.
+        """
+        columns = iiifpapi3._image_canvas_columns(
+            ids, heights, widths, labels=labels, service_ids=service_ids,
+            body_ids=body_ids, formats=formats, body_heights=body_heights,
+            body_widths=body_widths, page_ids=page_ids,
+            annotation_ids=annotation_ids, languages=languages,
+            body_types=body_types, service_types=service_types,
+            service_profiles=service_profiles)
+        frame = cls(_header(manifest) if manifest is not None else None)
+        frame._extend(columns)
+        return frame
+
+    @classmethod
+    def from_manifest(cls, manifest):
+        """Build a frame from a Manifest, which is not modified.
+
+        Args:
+            manifest (Manifest): The manifest.
+
+        Returns:
+            ManifestFrame: The frame.
+        """
+        frame = cls(_header(manifest))
+        items = manifest.items
+        if iiifpapi3.unused(items):
+            return frame
+        rows = []
+        with iiifpapi3._gc_paused():
+            for index, canvas in enumerate(items):
+                row = _image_row(canvas)
+                if row is None:
+                    frame.objects[index] = copy.deepcopy(canvas)
+                    height = getattr(canvas, "height", None)
+                    width = getattr(canvas, "width", None)
+                    row = (getattr(canvas, "id", None),
+                           height if _dimension(height) else 0,
+                           width if _dimension(width) else 0,
+                           None, "none", None, None, "", 0, 0, None, None,
+                           "", "", "")
+                rows.append(row)
+        frame._extend(dict(zip(COLUMNS, zip(*rows))) if rows else
+                      {name: () for name in COLUMNS})
+        return frame
+
+    def _extend(self, columns):
+        for name in COLUMNS:
+            getattr(self, name).extend(columns[name])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __repr__(self):
+        return "ManifestFrame(%s canvases, %s objects)" % (len(self), len(self.objects))
+
+    def _columns(self, indices=None):
+        """Return the columns of the rows at indices (default all the rows
+        stored in the columns) as lists."""
+        if indices is None:
+            indices = [i for i in range(len(self)) if i not in self.objects]
+        res = {}
+        for name in COLUMNS:
+            column = getattr(self, name)
+            res[name] = [column[i] for i in indices]
+        return res
+
+    def take(self, indices):
+        """Return a new frame with the canvases at indices, in that order.
+
+        The new frame shares the `manifest` with this one.
+
+        Args:
+            indices (list): The indices of the canvases.
+
+        Returns:
+            ManifestFrame: The new frame.
+        """
+        indices = list(indices)
+        frame = self.__class__(self.manifest)
+        for name in COLUMNS:
+            column = getattr(self, name)
+            if name in _ARRAYS:
+                value = array.array(column.typecode, map(column.__getitem__, indices))
+            elif name in _TABLES:
+                value = column.take(indices)
+            else:
+                value = list(map(column.__getitem__, indices))
+            setattr(frame, name, value)
+        if self.objects:
+            frame.objects = {n: self.objects[i] for n, i in enumerate(indices)
+                             if i in self.objects}
+        return frame
+
+    def filter(self, mask):
+        """Return a new frame with the canvases whose value in mask is true.
+
+        Example:
+            >>> frame.filter([h > 1000 for h in frame.heights])
+
+        Args:
+            mask (list): A boolean for each canvas.
+
+        Returns:
+            ManifestFrame: The new frame.
+        """
+        return self.take(itertools.compress(range(len(self)), mask))
+
+    def sort(self, by="ids", reverse=False, key=None):
+        """Return a new frame with the canvases sorted by one or more columns.
+
+        Example:
+            >>> frame.sort(by=("heights", "ids"), reverse=True)
+
+        Args:
+            by (str, tuple, optional): The name of the column or a tuple of
+                names. Defaults to "ids".
+            reverse (bool, optional): Sort in descending order. Defaults to
+                False.
+            key (function, optional): A function applied to the values (a
+                tuple of values when `by` is a tuple). Defaults to None, in
+                which case the missing values (None) are placed last, or
+                first when `reverse` is True.
+
+        Returns:
+            ManifestFrame: The new frame.
+        """
+        if key is None:
+            key = _none_last
+        if isinstance(by, str):
+            column = getattr(self, by)
+
+            def getter(index):
+                return key(column[index])
+        else:
+            for name in by:
+                assert name in COLUMNS, "%s is not a column." % name
+            columns = [getattr(self, name) for name in by]
+            if key is _none_last:
+                def getter(index):
+                    return tuple(_none_last(column[index]) for column in columns)
+            else:
+                def getter(index):
+                    return key(tuple(column[index] for column in columns))
+        return self.take(sorted(range(len(self)), key=getter, reverse=reverse))
+
+    def to_manifest(self):
+        """Build the Manifest of the frame.
+
+        Returns:
+            Manifest: A new Manifest equal to the one the frame was built
+            from.
+        """
+        manifest = copy.deepcopy(self.manifest)
+        manifest._fragment = None
+        canvases = iiifpapi3._image_canvases(**self._columns())
+        if self.objects:
+            canvases = iter(canvases)
+            canvases = [copy.deepcopy(self.objects[i]) if i in self.objects
+                        else next(canvases) for i in range(len(self))]
+        if canvases:
+            manifest.items = canvases
+        return manifest
+
+    def _rows(self):
+        """The canvases as JSON-ready dicts, in the order of
+        Manifest.add_canvases_from_columns."""
+        objects = self.objects
+        for index, (cid, height, width, label, language, sid, bid, fmt,
+                    bheight, bwidth, pid, aid, btype, stype, sprofile) in \
+                enumerate(zip(*(getattr(self, name) for name in COLUMNS))):
+            if index in objects:
+                yield objects[index]
+                continue
+            body = {"id": bid, "type": btype, "format": fmt,
+                    "height": bheight, "width": bwidth}
+            if sid is not None:
+                body["service"] = [{"id": sid, "type": stype, "profile": sprofile}]
+            canvas = {"id": cid, "type": "Canvas"}
+            if label is not None:
+                canvas["label"] = {language: [label]}
+            canvas["height"] = height
+            canvas["width"] = width
+            canvas["items"] = [{"id": pid,
+                                "type": "AnnotationPage",
+                                "items": [{"id": aid,
+                                           "type": "Annotation",
+                                           "motivation": "painting",
+                                           "body": body,
+                                           "target": cid}]}]
+            yield canvas
+
+    def json_dumps(self, dumps_errors=False, ensure_ascii=False, sort_keys=False,
+                   context=None, compact=False):
+        """Dumps the manifest in JSON format, the canvases are serialized
+        from the columns without building their objects. The output is the
+        same of `to_manifest().json_dumps()`.
+
+        Args:
+            dumps_errors (bool, optional): Show the missing Required and
+                Recommended fields, this builds the Manifest. Defaults to
+                False.
+            ensure_ascii (bool, optional): Ensure ASCI are used.
+                Defaults to False.
+            sort_keys (bool, optional): Sort the keys. Defaults to False.
+            context (str,list, optional): Add additional context. Defaults to
+                None.
+            compact (bool, optional): If True the JSON is written without
+                indentation and with minimal separators. Defaults to False.
+
+        Returns:
+            str: The JSON object as a string.
+        """
+        if dumps_errors:
+            manifest = self.to_manifest()
+        else:
+            manifest = copy.copy(self.manifest)
+            manifest._fragment = None
+            if len(self):
+                with iiifpapi3._gc_paused():
+                    manifest.items = list(self._rows())
+        return manifest.json_dumps(
+            dumps_errors=dumps_errors, ensure_ascii=ensure_ascii,
+            sort_keys=sort_keys, context=context, compact=compact)
+
+    def json_save(self, filename, save_errors=False, ensure_ascii=False,
+                  context=None, compact=False):
+        """Save the manifest in JSON format, see `json_dumps`.
+
+        Args:
+            filename (str): The filename.
+            save_errors (bool, optional): If True also the errors will be
+                dumped. Defaults to False.
+            ensure_ascii (bool, optional): If True only ASCI character will be
+                used. Defaults to False.
+            context (str,list, optional): Add additional contexts to the JSON.
+                Defaults to None.
+            compact (bool, optional): If True the JSON is written without
+                indentation and with minimal separators. Defaults to False.
+        """
+        res = self.json_dumps(dumps_errors=save_errors, ensure_ascii=ensure_ascii,
+                              context=context, compact=compact)
+        with open(filename, "w") as f:
+            f.write(res)
+
+
+def _none_last(value):
+    """Sort key placing None after the other values."""
+    return (value is None, value)
+
+
+def _header(manifest):
+    """Return a copy of the manifest without its items."""
+    # The memo replaces the items with the placeholder while copying.
+    memo = {id(manifest.items): manifest._requirements["items"]}
+    header = copy.deepcopy(manifest, memo)
+    header._fragment = None
+    return header
@@ -42,9 +42,17 @@ Attributes:
 
     BEHAVIOURS (list[str]): A list of accepted behaviours.
 
-Warning:
-    only language subtags are checked not variants or composite strings.
-    You can manually add a language if you need to use subtags:
+    PARENT_LINKS (bool): If True the add_* methods store in each object
+        added a weak reference to the object containing it, see
+        `_CoreAttributes.path`. Defaults to False.
+
+    VALIDATION_LEVELS (tuple[str]): The validation levels accepted by
+        `configure`.
+
+Note:
+    The tags not in LANGUAGES (e.g. de-DE) are parsed and their subtags are
+    checked with IIIFpres.BCP47_validator. You can manually add a language
+    tag that is not in the registry:
 
 Example:
     >>> from IIIFpres import iiifpapi3,BCP47lang
@@ -61,12 +69,24 @@ Todo:
     https://www.iana.org/assignments/language-subtag-registry/language-subtag-registry
 """
 from . import visualization_html
+from . import BCP47_validator
 from .BCP47_tags_list import lang_tags
 from .dictmediatype import mediatypedict
+from .mediatype_registry import MediaTypeRegistry
+import abc
 import json
 import warnings
+import contextlib
 import copy
+import functools
+import gc
+import importlib.util
+import operator
 import re
+import sys
+import threading
+import types
+import weakref
 global BASE_URL
 BASE_URL = "https://"
 global LANGUAGES
@@ -96,6 +116,10 @@ BEHAVIOURS = ["auto-advance",
               "no-nav",
               "hidden"]
 
+PARENT_LINKS = False
+
+VALIDATION_LEVELS = ("strict", "fast", "off")
+
 
 class Required(object):
     """HELPER CLASS
@@ -135,6 +159,18 @@ class Recommended(object):
         return 'Recommended attribute:%s' % self.Recommended
 
 
+class ValidationError(AssertionError):
+    """Raised when a value breaks a rule of the IIIF specification, by the
+    set_* and add_* methods or while `_CoreAttributes.validate` checks the
+    whole object.
+
+    Note:
+        It is a subclass of AssertionError, raised by the previous versions,
+        but unlike the assertions it is raised also when Python runs with the
+        -O flag.
+    """
+
+
 # Note: we use None for OPTIONAL with the meaning of
 # https://tools.ietf.org/html/rfc2119
 
@@ -149,16 +185,110 @@ def unused(attr):
         return False
 
 
-# For performance optimization we can reduce the instantiation of Classes
-if not __debug__:
-    def Recommended(msg=None):
-        return None
+class _Settings(threading.local):
+    """HELPER CLASS
+
+    The settings of the current thread, see `configure`. The new threads
+    start with the default settings.
+    """
+    validation = "strict"
+    track_required = True
+    compact_objects = False
+
+
+_SETTINGS = _Settings()
+
+
+class _Configuration(object):
+    """HELPER CLASS
+
+    The settings replaced by `configure`. Used as a context manager it
+    restores them on exit, so that the settings apply only to the code in
+    the with block.
+    """
+
+    def __init__(self, validation, track_required, compact_objects):
+        self.validation = validation
+        self.track_required = track_required
+        self.compact_objects = compact_objects
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        _SETTINGS.validation = self.validation
+        _SETTINGS.track_required = self.track_required
+        _SETTINGS.compact_objects = self.compact_objects
+        return False
+
+    def __repr__(self):
+        return ("_Configuration(validation=%r, track_required=%r, "
+                "compact_objects=%r)" % (
+                    self.validation, self.track_required, self.compact_objects))
+
+
+def configure(validation=None, track_required=None, compact_objects=None):
+    """Set how the IIIF objects are checked in the current thread.
 
-    def Required(msg=None):
-        return None
+    The settings apply immediately to the current thread only, hence a
+    service can build manifests with the fast settings while another thread
+    checks them strictly. Used as a context manager the previous settings are
+    restored at the end of the with block.
 
-    def unused(attr):
-        return True if attr is None else False
+    Example:
+        >>> with iiifpapi3.configure(validation="off", track_required=False):
+        ...     manifest = build_manifest()
+        >>> manifest.validate()["invalid"]
+        0
+
+    Args:
+        validation (str, optional): "strict" the set_* and add_* methods
+            check their values, "fast" they check only the dimensions, the
+            types, the viewing directions, the behaviors and the rights
+            skipping the IDs, the languages, the media types and the dates,
+            "off" they only store the values. The whole object can be checked
+            later with `_CoreAttributes.validate`. None keeps the current
+            level. Defaults to None.
+        track_required (bool, optional): If False the missing Required fields
+            are omitted by the serializers instead of raising ValueError,
+            `inspect` and `validate` still report them. None keeps the current
+            value. Defaults to None.
+        compact_objects (bool, optional): If True the Canvases, the
+            AnnotationPages, the Annotations, the bodies and the services
+            created are compact: their properties are stored in __slots__
+            without an instance __dict__, hence the properties not defined by
+            the specification (e.g. of an extension) can't be set on them.
+            None keeps the current value. Defaults to None.
+
+    Raises:
+        ValueError: If the validation level is not in VALIDATION_LEVELS.
+
+    Returns:
+        _Configuration: The previous settings.
+    """
+    if validation is not None and validation not in VALIDATION_LEVELS:
+        raise ValueError("Validation must be one of %s not %r." % (
+            list(VALIDATION_LEVELS), validation))
+    previous = _Configuration(_SETTINGS.validation, _SETTINGS.track_required,
+                              _SETTINGS.compact_objects)
+    if validation is not None:
+        _SETTINGS.validation = validation
+    if track_required is not None:
+        _SETTINGS.track_required = bool(track_required)
+    if compact_objects is not None:
+        _SETTINGS.compact_objects = bool(compact_objects)
+    return previous
+
+
+def get_configuration():
+    """Return the settings of the current thread, see `configure`.
+
+    Returns:
+        dict: The "validation" level, "track_required" and "compact_objects".
+    """
+    return {"validation": _SETTINGS.validation,
+            "track_required": _SETTINGS.track_required,
+            "compact_objects": _SETTINGS.compact_objects}
 
 
 def serializable(attr):
@@ -175,6 +305,1198 @@ def serializable(attr):
         return True
 
 
+def _floatstr(o):
+    """Represent a float as the json module does (NaN and Infinity included).
+    """
+    if o != o:
+        return 'NaN'
+    if o == float('inf'):
+        return 'Infinity'
+    if o == -float('inf'):
+        return '-Infinity'
+    return float.__repr__(o)
+
+
+def _key_to_str(key):
+    """Convert a dictionary key to str as the json module does."""
+    if isinstance(key, str):
+        return key
+    if isinstance(key, float):
+        return _floatstr(key)
+    if key is True:
+        return 'true'
+    if key is False:
+        return 'false'
+    if key is None:
+        return 'null'
+    if isinstance(key, int):
+        return int.__repr__(key)
+    raise TypeError(f'keys must be str, int, float, bool or None, '
+                    f'not {key.__class__.__name__}')
+
+
+def _encode_key(key, encode_string):
+    """Encode a dictionary key as the json module does."""
+    return encode_string(_key_to_str(key))
+
+
+# class: (fields, getter, has_dict) of the slotted classes, see _CoreAttributes
+_SLOTTED = {}
+# (class, keys): the keys of the instance __dict__ in the order of the JSON,
+# None if they are already in that order
+_ORDERED = {}
+
+
+def _json_order(cls, keys):
+    """Return the keys of an instance __dict__ of cls in the order of the JSON:
+    first the fields of the class, then the other attributes in the order
+    they were set. None if the keys are already in this order."""
+    fields = cls._fields
+    ordered = tuple(k for k in fields if k in keys)
+    ordered += tuple(k for k in keys if k not in fields)
+    return None if ordered == keys else ordered
+
+
+def _attributes(obj):
+    """Return the attributes of an IIIF object as a dict in the order they
+    are serialized.
+
+    The slotted classes (Canvas, AnnotationPage, Annotation, bodypainting and
+    service) keep the attributes in __slots__, followed by those of the
+    instance __dict__ if any, for them a new dict is built.
+    """
+    slotted = _SLOTTED.get(obj.__class__)
+    if slotted is None:
+        return dict(_attribute_items(obj))
+    fields, getter, has_dict = slotted
+    try:
+        res = dict(zip(fields, getter(obj)))
+    except AttributeError:
+        # an attribute was deleted
+        res = {k: getattr(obj, k) for k in fields if hasattr(obj, k)}
+    if has_dict:
+        res.update(obj.__dict__)
+    return res
+
+
+def _attribute_items(obj):
+    """Return the (name, value) pairs of the attributes of an IIIF object in
+    the order they are serialized, without building a dict for the compact
+    objects."""
+    cls = obj.__class__
+    slotted = _SLOTTED.get(cls)
+    if slotted is None:
+        attributes = obj.__dict__
+        if not hasattr(cls, "_fields"):
+            return attributes.items()
+        keys = tuple(attributes)
+        try:
+            ordered = _ORDERED[cls, keys]
+        except KeyError:
+            ordered = _ORDERED[cls, keys] = _json_order(cls, keys)
+        if ordered is None:
+            return attributes.items()
+        return [(k, attributes[k]) for k in ordered]
+    fields, getter, has_dict = slotted
+    try:
+        values = getter(obj)
+    except AttributeError:
+        # an attribute was deleted
+        return _attributes(obj).items()
+    if has_dict:
+        # the properties not defined by the specification follow the slots
+        extra = obj.__dict__
+        if extra:
+            return list(zip(fields, values)) + list(extra.items())
+    return zip(fields, values)
+
+
+def _raise_required(value):
+    """Raise the ValueError of a Required attribute (used in expressions)."""
+    raise ValueError(value)
+
+
+def _iter_members(obj, dumps_errors=False, sort_keys=False,
+                  track_required=True):
+    """Yield the (key, value) pairs of an IIIF object to be serialized.
+
+    Args:
+        obj (object): The IIIF object.
+        dumps_errors (bool, optional): Yield also Required and Recommended
+            attributes. Defaults to False.
+        sort_keys (bool, optional): Sort the keys. Defaults to False.
+        track_required (bool, optional): If False the Required attributes
+            are skipped instead of raising ValueError. Defaults to True.
+
+    Raises:
+        ValueError: If dumps_errors and track_required are False and a
+            Required attribute is found.
+    """
+    if sort_keys:
+        items = sorted(_attribute_items(obj), key=lambda i: i[0])
+    else:
+        items = _attribute_items(obj)
+    if dumps_errors:
+        for item in items:
+            if item[1] is not None:
+                yield item
+    else:
+        for item in items:
+            value = item[1]
+            if value is None:
+                continue
+            cls = value.__class__
+            if cls is Recommended:
+                continue
+            if cls is Required:
+                if track_required:
+                    raise ValueError(value)
+                continue
+            yield item
+
+
+class _SerializationPlan(object):
+    """HELPER CLASS
+
+    The serialization plan of an IIIF class. It is built once per class
+    the first time one of its instances is serialized and it stores the
+    attributes of the class in the order they are emitted together with
+    their JSON encoded keys, so that the keys are not encoded again for
+    every instance.
+
+    Args:
+        cls (class): The IIIF class.
+        fields (tuple): The attribute names in the order they are emitted.
+    """
+
+    def __init__(self, cls, fields):
+        self.cls = cls
+        self.fields = fields
+        self.keys = {}
+
+    def key(self, name, ensure_ascii, key_separator=": "):
+        """Return the encoded key followed by the key separator.
+
+        Attributes added to a single instance (e.g. by an extension) are
+        encoded the first time they are found and added to the plan.
+        """
+        keys = self.keys_for(ensure_ascii, key_separator)
+        try:
+            return keys[name]
+        except KeyError:
+            if ensure_ascii:
+                encoded = json.encoder.encode_basestring_ascii(name)
+            else:
+                encoded = json.encoder.encode_basestring(name)
+            keys[name] = encoded = encoded + key_separator
+            return encoded
+
+    def keys_for(self, ensure_ascii, key_separator=": "):
+        """Return the dictionary of the encoded keys for the given options,
+        encoding the fields of the plan the first time it is requested."""
+        try:
+            return self.keys[ensure_ascii, key_separator]
+        except KeyError:
+            self.keys[ensure_ascii, key_separator] = {}
+            for field in self.fields:
+                self.key(field, ensure_ascii, key_separator)
+            return self.keys[ensure_ascii, key_separator]
+
+
+_PLANS = {}
+_OMITTED = frozenset((type(None), Recommended, Required))
+
+
+def _serializable_attributes(obj):
+    """Return the attributes of an IIIF object that must be serialized.
+
+    Used as `default` by the serializers (e.g. orjson) that need a mapping for
+    each object. The attributes are filtered comparing the class of the values
+    with the omitted classes instead of calling `serializable` on each of them.
+    """
+    if _SETTINGS.track_required:
+        # the class of the omitted values is checked again only for raising
+        # on the Required ones
+        return {k: v for k, v in _attribute_items(obj)
+                if v.__class__ not in _OMITTED
+                or v.__class__ is Required and _raise_required(v)}
+    return {k: v for k, v in _attribute_items(obj)
+            if v.__class__ not in _OMITTED}
+
+
+def _attributes_with_errors(obj):
+    """Return the attributes of an IIIF object including Required and
+    Recommended."""
+    return {k: v for k, v in _attribute_items(obj) if v is not None}
+
+
+def _missing_fields(obj):
+    """Walk the IIIF object collecting the Required and Recommended fields.
+
+    No JSON is produced: only the nested IIIF objects, dicts and lists are
+    visited, the scalar values are skipped.
+
+    Args:
+        obj (object): The IIIF object.
+
+    Returns:
+        dict: The lists of the missing "Required" and "Recommended" fields,
+        as {"path": ..., "description": ...} dicts, and their counts.
+    """
+    report = {"Required": [], "Recommended": []}
+
+    def walk(value, path):
+        if isinstance(value, list):
+            items = enumerate(value)
+        elif isinstance(value, dict):
+            items = value.items()
+        elif value.__class__ in _SLOTTED or hasattr(value, "__dict__"):
+            items = _attribute_items(value)
+        else:
+            return
+        for key, item in items:
+            cls = item.__class__
+            if cls in _JSON_SCALARS:
+                continue
+            if key.__class__ is int:
+                itempath = "%s[%d]" % (path, key)
+            else:
+                itempath = "%s.%s" % (path, key)
+            if cls is Required or cls is Recommended:
+                name = cls.__name__
+                report[name].append({"path": itempath,
+                                     "description": getattr(item, name)})
+            else:
+                walk(item, itempath)
+
+    walk(obj, "$")
+    report["missing_required"] = len(report["Required"])
+    report["missing_recommended"] = len(report["Recommended"])
+    return report
+
+
+def _invalid_fields(obj):
+    """Walk the IIIF object checking its fields with the rules of the set_*
+    and add_* methods, see _FIELD_RULES.
+
+    Args:
+        obj (object): The IIIF object.
+
+    Returns:
+        list: The invalid fields as {"path": ..., "description": ...} dicts.
+    """
+    invalid = []
+
+    def walk(value, path):
+        if isinstance(value, list):
+            items = enumerate(value)
+        elif isinstance(value, dict):
+            items = value.items()
+        elif value.__class__ in _SLOTTED or hasattr(value, "__dict__"):
+            items = _attribute_items(value)
+        else:
+            return
+        for key, item in items:
+            if key.__class__ is int:
+                itempath = "%s[%d]" % (path, key)
+            else:
+                itempath = "%s.%s" % (path, key)
+                rule = _FIELD_RULES.get(key)
+                if rule is not None and not unused(item):
+                    try:
+                        rule(value, item)
+                    except ValidationError as e:
+                        invalid.append({"path": itempath, "description": str(e)})
+            if item.__class__ not in _JSON_SCALARS:
+                walk(item, itempath)
+
+    walk(obj, "$")
+    return invalid
+
+
+def _id_rule(holder, value):
+    # AnnotationCollections accept IDs that are not HTTP(S)
+    if isinstance(holder, _CoreAttributes) and not isinstance(holder, AnnotationCollection):
+        _check_id(holder, value)
+
+
+def _source_rule(holder, value):
+    if isinstance(holder, SpecificResource) and isinstance(value, str):
+        _check_id(holder, value)
+
+
+def _dimension_rule(holder, value):
+    if isinstance(holder, _HeightWidth):
+        _check_positive_integer(value)
+
+
+def _format_rule(holder, value):
+    if isinstance(holder, _Format):
+        check_format(value)
+    elif isinstance(holder, bodycommenting):
+        _check_text_format(value)
+
+
+def _type_rule(holder, value):
+    if isinstance(holder, _MutableType):
+        _check_type(value)
+
+
+def _language_rule(holder, value):
+    for language in value if isinstance(value, list) else [value]:
+        _check_language(language)
+
+
+def _language_map_rule(holder, value):
+    if isinstance(value, dict):
+        for language in value:
+            _check_language(language)
+
+
+def _label_rule(holder, value):
+    if isinstance(value, dict):
+        if isinstance(holder, _CoreAttributes):
+            _check_language_map(value)
+        else:
+            _language_map_rule(holder, value)
+
+
+def _behavior_rule(holder, value):
+    if isinstance(holder, _CoreAttributes):
+        behaviors = []
+        for behavior in value:
+            _check_behavior(holder, behaviors, behavior)
+            behaviors.append(behavior)
+
+
+def _string_rule(check):
+    def rule(holder, value):
+        if isinstance(value, str):
+            check(value)
+    return rule
+
+
+# The rules applied by validate to the fields with these names, each rule
+# checks the value with the same function used by the set_* or add_* method.
+_FIELD_RULES = {
+    "id": _id_rule,
+    "source": _source_rule,
+    "height": _dimension_rule,
+    "width": _dimension_rule,
+    "format": _format_rule,
+    "type": _type_rule,
+    "language": _language_rule,
+    "label": _label_rule,
+    "summary": _language_map_rule,
+    "value": _language_map_rule,
+    "behavior": _behavior_rule,
+    "viewingDirection": _string_rule(lambda value: _check_viewingDirection(value)),
+    "rights": _string_rule(lambda value: _check_rights(value)),
+    "navDate": _string_rule(lambda value: _check_navDate(value)),
+}
+
+
+def _get_plan(obj):
+    """Return the serialization plan of the class of obj building it if
+    it is the first instance serialized."""
+    cls = obj.__class__
+    plan = _PLANS.get(cls)
+    if plan is None:
+        plan = _PLANS[cls] = _SerializationPlan(cls, tuple(_attributes(obj)))
+    return plan
+
+
+class _Fragment(object):
+    """HELPER CLASS
+
+    The JSON of an IIIF object produced by `_JSONStreamEncoder` in incremental
+    mode. The parts are the strings of the object followed by the strings of
+    the fragments of its children (not copied but referenced). The children
+    are the (object, fragment) pairs used for checking that the fragment is
+    still valid.
+
+    Args:
+        key (tuple): The serialization options and the indentation level.
+        parts (tuple): The strings composing the JSON of the object.
+        children (tuple): The (object, fragment) pairs of the children.
+    """
+    __slots__ = ("key", "parts", "children")
+
+    def __init__(self, key, parts, children):
+        self.key = key
+        self.parts = parts
+        self.children = children
+
+    def is_valid(self):
+        """Check that the children objects have not been modified since the
+        fragment was encoded."""
+        stack = list(self.children)
+        while stack:
+            child, fragment = stack.pop()
+            if getattr(child, "_fragment", None) is not fragment:
+                return False
+            stack.extend(fragment.children)
+        return True
+
+
+def _merge_parts(parts):
+    """Return the strings of a list of strings and fragments joining the
+    consecutive strings."""
+    merged = []
+    strings = []
+    for part in parts:
+        if part.__class__ is str:
+            strings.append(part)
+        else:
+            if strings:
+                merged.append("".join(strings))
+                strings = []
+            merged.extend(part.parts)
+    if strings:
+        merged.append("".join(strings))
+    return merged
+
+
+class _JSONStreamEncoder(object):
+    """HELPER CLASS
+
+    Walks a tree of IIIF objects and writes its JSON representation in
+    chunks using a `write` callable (e.g. the write method of a file object).
+    The attributes of the IIIF objects are emitted following the
+    `_SerializationPlan` of their class, without building an intermediate
+    dictionary for each object.
+
+    Args:
+        write (callable): A function accepting a string.
+        dumps_errors (bool, optional): Dumps Required and Recommended fields.
+            Defaults to False.
+        ensure_ascii (bool, optional): Escape non ASCII characters.
+            Defaults to False.
+        sort_keys (bool, optional): Sort the keys. Defaults to False.
+        indent (int, optional): The indentation, if None the JSON is written
+            without whitespaces. Defaults to 2.
+        chunk_size (int, optional): Number of pieces buffered before calling
+            `write`. Defaults to 2048.
+        incremental (bool, optional): Reuse the fragments cached in the IIIF
+            objects by the previous incremental serialization, encoding only
+            the objects modified in the meanwhile. Defaults to False.
+        workers (int, optional): If greater than 1 the items of the serialized
+            object (e.g. the canvases of a Manifest) are encoded in chunks
+            using a pool of `workers` processes. Defaults to None.
+        track_required (bool, optional): If False the missing Required fields
+            are omitted instead of raising ValueError. Defaults to the
+            setting of the current thread, see `configure`.
+    """
+
+    def __init__(self, write=None, dumps_errors=False, ensure_ascii=False,
+                 sort_keys=False, indent=2, chunk_size=2048,
+                 incremental=False, workers=None, track_required=None):
+        self.write = write
+        self.dumps_errors = dumps_errors
+        if track_required is None:
+            track_required = _SETTINGS.track_required
+        self.track_required = track_required
+        self.ensure_ascii = ensure_ascii
+        self.sort_keys = sort_keys
+        self.indent = indent
+        self.chunk_size = chunk_size
+        self.key_separator = ": " if indent is not None else ":"
+        if ensure_ascii:
+            self.encode_string = json.encoder.encode_basestring_ascii
+        else:
+            self.encode_string = json.encoder.encode_basestring
+        self.incremental = incremental
+        self.workers = workers
+        # the list encoded using the pool of processes
+        self._parallel = None
+        self._newlines = []
+        self._keys = {}
+        self._buffer = []
+        # [children, cacheable] of the objects being encoded incrementally
+        self._frames = []
+
+    def encode(self, obj, context=None):
+        """Write `obj` adding the `@context` key as first key if provided.
+
+        Args:
+            obj (object): The IIIF object to be serialized.
+            context (str,list, optional): The JSON-LD context. Defaults to None.
+        """
+        self._set_parallel(obj)
+        self._write_object(obj, 0, context)
+        self.flush()
+
+    def dumps(self, obj, context=None):
+        """Return `obj` as a JSON string instead of writing it.
+
+        Args:
+            obj (object): The IIIF object to be serialized.
+            context (str,list, optional): The JSON-LD context. Defaults to None.
+
+        Returns:
+            str: The JSON object as a string.
+        """
+        self._set_parallel(obj)
+        self._write_object(obj, 0, context)
+        return self._join()
+
+    def _set_parallel(self, obj):
+        if self.workers is not None and self.workers > 1:
+            items = getattr(obj, "items", None)
+            if items.__class__ is list and len(items) > 1:
+                self._parallel = items
+
+    def flush(self):
+        """Write the buffered chunks."""
+        if self._buffer:
+            self.write(self._join())
+
+    def _join(self):
+        buffer = self._buffer
+        if self.incremental:
+            res = "".join(_merge_parts(buffer))
+        else:
+            res = "".join(buffer)
+        del buffer[:]
+        return res
+
+    def _newline(self, level):
+        if self.indent is None:
+            return ""
+        newlines = self._newlines
+        while len(newlines) <= level:
+            newlines.append("\n" + " " * (self.indent * len(newlines)))
+        return newlines[level]
+
+    def _write_object(self, obj, level, context=None):
+        if self.incremental and context is None:
+            if isinstance(obj, _CoreAttributes):
+                self._write_fragment(obj, level)
+                return
+            if self._frames and obj.__class__ not in _OMITTED:
+                # changes of the other objects (e.g. languagemap) are not
+                # tracked hence the object containing them can not be cached
+                self._frames[-1][1] = False
+        self._write_members(obj, level, context)
+
+    def _write_fragment(self, obj, level):
+        """Write the cached fragment of obj if still valid otherwise encode
+        obj and cache its fragment."""
+        frames = self._frames
+        key = (self.dumps_errors, self.track_required, self.ensure_ascii,
+               self.sort_keys, self.indent, level)
+        fragment = getattr(obj, "_fragment", None)
+        if fragment is None or fragment.key != key or not fragment.is_valid():
+            buffer = self._buffer
+            start = len(buffer)
+            frames.append([[], True])
+            self._write_members(obj, level)
+            children, cacheable = frames.pop()
+            if not cacheable:
+                obj._fragment = None
+                if frames:
+                    frames[-1][1] = False
+                return
+            fragment = _Fragment(
+                key, tuple(_merge_parts(buffer[start:])), tuple(children))
+            del buffer[start:]
+            obj._fragment = fragment
+        self._buffer.append(fragment)
+        if frames:
+            frames[-1][0].append((obj, fragment))
+
+    def _write_members(self, obj, level, context=None):
+        append = self._buffer.append
+        plan = _PLANS.get(obj.__class__) or _get_plan(obj)
+        key_separator = self.key_separator
+        keys = plan.keys_for(self.ensure_ascii, key_separator)
+        newline = self._newline(level + 1)
+        separator = "{" + newline
+        if context is not None:
+            append(separator)
+            append('"@context"' + key_separator)
+            self._write_value(context, level + 1)
+            separator = "," + newline
+        write_value = self._write_value
+        for name, value in _iter_members(
+                obj, self.dumps_errors, self.sort_keys, self.track_required):
+            append(separator)
+            try:
+                append(keys[name])
+            except KeyError:
+                append(plan.key(name, self.ensure_ascii, key_separator))
+            write_value(value, level + 1)
+            separator = "," + newline
+        if separator[0] == "{":
+            append("{}")
+        else:
+            append(self._newline(level))
+            append("}")
+        if self.write is not None and not self._frames and \
+                len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def _write_value(self, value, level):
+        append = self._buffer.append
+        cls = value.__class__
+        if cls is str:
+            append(self.encode_string(value))
+        elif value is None:
+            append('null')
+        elif value is True:
+            append('true')
+        elif value is False:
+            append('false')
+        elif cls is list or cls is tuple:
+            self._write_list(value, level)
+        elif cls is dict:
+            self._write_dict(value, level)
+        elif cls is int:
+            append(int.__repr__(value))
+        elif cls is float:
+            append(_floatstr(value))
+        elif isinstance(value, str):
+            append(self.encode_string(value))
+        elif isinstance(value, int):
+            append(int.__repr__(value))
+        elif isinstance(value, float):
+            append(_floatstr(value))
+        elif isinstance(value, dict):
+            self._write_dict(value, level)
+        elif isinstance(value, (list, tuple)):
+            self._write_list(value, level)
+        else:
+            self._write_object(value, level)
+
+    def _write_dict(self, dct, level):
+        append = self._buffer.append
+        if not dct:
+            append("{}")
+            return
+        keys = self._keys
+        encode_string = self.encode_string
+        newline = self._newline(level + 1)
+        separator = "{" + newline
+        items = dct.items()
+        if self.sort_keys:
+            items = sorted(items, key=lambda i: i[0])
+        for name, value in items:
+            append(separator)
+            try:
+                append(keys[name])
+            except (KeyError, TypeError):
+                encoded = _encode_key(name, encode_string) + self.key_separator
+                if isinstance(name, str):
+                    keys[name] = encoded
+                append(encoded)
+            self._write_value(value, level + 1)
+            separator = "," + newline
+        append(self._newline(level))
+        append("}")
+
+    def _write_list(self, values, level):
+        append = self._buffer.append
+        if not values:
+            append("[]")
+            return
+        if values is self._parallel:
+            self._write_list_parallel(values, level)
+            return
+        newline = self._newline(level + 1)
+        separator = "[" + newline
+        write_value = self._write_value
+        for value in values:
+            append(separator)
+            write_value(value, level + 1)
+            separator = "," + newline
+        append(self._newline(level))
+        append("]")
+
+    def _write_list_parallel(self, values, level):
+        """Write a list encoding its values in chunks with a process pool.
+        The chunks are joined in order hence the output is the same of
+        `_write_list`.
+
+        Where processes can be forked the workers read the values from the
+        memory inherited from this process, otherwise the chunks are pickled.
+        """
+        global _FORKED_VALUES
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        chunksize = -(-len(values) // (self.workers * 4))
+        bounds = [(i, i + chunksize) for i in range(0, len(values), chunksize)]
+        options = {
+            "dumps_errors": self.dumps_errors,
+            "track_required": self.track_required,
+            "ensure_ascii": self.ensure_ascii,
+            "sort_keys": self.sort_keys,
+            "indent": self.indent}
+        options = [options] * len(bounds)
+        levels = [level + 1] * len(bounds)
+        if "fork" in multiprocessing.get_all_start_methods():
+            _FORKED_VALUES = values
+            context = multiprocessing.get_context("fork")
+            chunks = bounds
+        else:
+            context = None
+            chunks = [values[start:stop] for start, stop in bounds]
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers,
+                                     mp_context=context) as executor:
+                encoded = list(executor.map(
+                    _encode_chunk, chunks, options, levels))
+        finally:
+            _FORKED_VALUES = None
+        newline = self._newline(level + 1)
+        append = self._buffer.append
+        append("[" + newline)
+        append(("," + newline).join(encoded))
+        append(self._newline(level))
+        append("]")
+
+
+# the list encoded by the forked worker processes
+_FORKED_VALUES = None
+
+
+def _encode_chunk(values, options, level):
+    """Encode a chunk of the values of a list, used by the worker processes.
+
+    Args:
+        values (list, tuple): The values or the (start, stop) bounds of the
+            chunk of `_FORKED_VALUES`.
+        options (dict): The options of the `_JSONStreamEncoder`.
+        level (int): The indentation level of the values.
+
+    Returns:
+        str: The encoded values separated by commas.
+    """
+    if values.__class__ is tuple:
+        values = _FORKED_VALUES[values[0]:values[1]]
+    encoder = _JSONStreamEncoder(**options)
+    separator = "," + encoder._newline(level)
+    for index, value in enumerate(values):
+        if index:
+            encoder._buffer.append(separator)
+        encoder._write_value(value, level)
+    return encoder._join()
+
+
+_JSON_SCALARS = frozenset((str, int, float, bool, type(None)))
+
+
+def _is_plain(value, dicts=True):
+    """Check if value is made only of JSON types (str keys, lists, no IIIF
+    objects) and hence can be returned as it is by `_to_dict`.
+
+    If dicts is False, values containing a dictionary are not plain (their
+    keys might need sorting)."""
+    cls = value.__class__
+    if cls in _JSON_SCALARS:
+        return True
+    if cls is list:
+        return all(_is_plain(v, dicts) for v in value)
+    if cls is dict and dicts:
+        return all(k.__class__ is str and _is_plain(v)
+                   for k, v in value.items())
+    return False
+
+
+def _to_dict(obj, dumps_errors=False, sort_keys=False, shared=False,
+             context=None, track_required=True):
+    """Convert a tree of IIIF objects to the dict that json.loads would
+    return parsing its JSON serialization.
+
+    Args:
+        obj (object): The IIIF object.
+        dumps_errors (bool, optional): Include Required and Recommended
+            attributes. Defaults to False.
+        sort_keys (bool, optional): Sort the keys. Defaults to False.
+        shared (bool, optional): Return the lists and dictionaries made only
+            of JSON types (e.g. language maps) without copying them. These are
+            shared with the IIIF objects and must not be modified.
+            Defaults to False.
+        context (str,list, optional): The `@context`, added as first key.
+            Defaults to None.
+        track_required (bool, optional): If False the Required attributes
+            are skipped instead of raising ValueError. Defaults to True.
+
+    Returns:
+        dict: The JSON-ready dictionary.
+    """
+    def convert(value):
+        cls = value.__class__
+        if cls in _JSON_SCALARS:
+            return value
+        if cls is list or cls is tuple:
+            if shared and cls is list and _is_plain(value, not sort_keys):
+                return value
+            return [convert(v) for v in value]
+        if cls is dict:
+            if shared and not sort_keys and _is_plain(value):
+                return value
+            return convert_dict(value)
+        if isinstance(value, str):
+            return str(value)
+        if isinstance(value, bool):
+            return bool(value)
+        if isinstance(value, int):
+            return int(value)
+        if isinstance(value, float):
+            return float(value)
+        if isinstance(value, dict):
+            return convert_dict(value)
+        if isinstance(value, (list, tuple)):
+            return [convert(v) for v in value]
+        return {k: convert(v)
+                for k, v in _iter_members(
+                    value, dumps_errors, sort_keys, track_required)}
+
+    def convert_dict(dct):
+        items = dct.items()
+        if sort_keys:
+            items = sorted(items, key=lambda i: i[0])
+        return {_key_to_str(k): convert(v) for k, v in items}
+
+    res = {}
+    if context is not None:
+        res["@context"] = convert(context)
+    for k, v in _iter_members(obj, dumps_errors, sort_keys, track_required):
+        res[k] = convert(v)
+    return res
+
+
+def _write_sidecars(filename, data, sidecars):
+    """Write precompressed copies of data next to filename.
+
+    Args:
+        filename (str): The name of the uncompressed file.
+        data (bytes): The content of the file.
+        sidecars (str, list): The compressions: "gz" and/or "br".
+    """
+    if isinstance(sidecars, str):
+        sidecars = (sidecars,)
+    for extension in sidecars:
+        extension = extension.lstrip(".")
+        if extension == "gz":
+            import gzip
+            compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        elif extension == "br":
+            import brotli
+            compressed = brotli.compress(data)
+        else:
+            raise ValueError(
+                "Sidecars can be 'gz' or 'br' it was %s." % extension)
+        with open(".".join((filename, extension)), 'wb') as f:
+            f.write(compressed)
+
+
+class _JSONBackend(abc.ABC):
+    """HELPER CLASS
+
+    A JSON encoder used by `json_dumps`. The backends declare the name of the
+    module they need and the options they support, when an option is not
+    supported `json_dumps` falls back to the `json` backend.
+
+    A backend has a method
+    `dumps(obj, dumps_errors, ensure_ascii, sort_keys, indent, context)`
+    returning the JSON of obj as str or UTF-8 bytes, with `context` as first
+    key, and raising ValueError if a Required field is found and
+    dumps_errors is False.
+    """
+    module = None
+    ensure_ascii = True
+    sort_keys = True
+
+    def available(self):
+        """Check if the module needed by the backend is installed."""
+        if self.module is None:
+            return True
+        return importlib.util.find_spec(self.module) is not None
+
+
+class _StdlibBackend(_JSONBackend):
+    """HELPER CLASS
+
+    The plan based encoder of this module, it uses the string escaping of the
+    json module of the standard library and supports all the options.
+    """
+
+    def dumps(self, obj, dumps_errors, ensure_ascii, sort_keys, indent, context,
+              incremental=False, workers=None):
+        encoder = _JSONStreamEncoder(
+            dumps_errors=dumps_errors,
+            ensure_ascii=ensure_ascii,
+            sort_keys=sort_keys,
+            indent=indent,
+            incremental=incremental,
+            workers=workers)
+        return encoder.dumps(obj, context=context)
+
+
+class _HookBackend(_JSONBackend):
+    """HELPER CLASS
+
+    A backend using a JSON library that calls a `default` hook for the
+    objects it can not encode (the IIIF objects). The @context is the first
+    key of the mapping encoded by the library and a missing Required field
+    raises ValueError as with the json backend, instead of the error of the
+    library.
+    """
+
+    def dumps(self, obj, dumps_errors, ensure_ascii, sort_keys, indent, context):
+        """Return the JSON of obj as str or UTF-8 bytes.
+
+        Args:
+            obj (object): The IIIF object.
+            dumps_errors (bool): Include Required and Recommended fields.
+            ensure_ascii (bool): Escape non ASCII characters.
+            sort_keys (bool): Sort the keys.
+            indent (int): 2 or None for the compact JSON.
+            context (str,list): The @context, to be written as first key.
+
+        Raises:
+            ValueError: If dumps_errors is False and a Required field is
+                found.
+        """
+        default = _attributes_with_errors if dumps_errors else _serializable_attributes
+        try:
+            attributes = default(obj)
+            if context is not None:
+                # @context is the first key of the root mapping
+                attributes = {"@context": context, **attributes}
+            res = self.encode(attributes, default, ensure_ascii, sort_keys, indent)
+        except (TypeError, ValueError):
+            if not dumps_errors:
+                # the libraries wrap the errors of the hook (e.g. orjson
+                # raises TypeError), the json backend raises the ValueError
+                # of the Required field
+                _JSON_BACKENDS["json"].dumps(obj, False, False, False, None, None)
+            raise
+        return res
+
+    @abc.abstractmethod
+    def encode(self, attributes, default, ensure_ascii, sort_keys, indent):
+        """Return the JSON of the attributes of the root object.
+
+        Args:
+            attributes (dict): The attributes of the root object.
+            default (callable): The hook returning the attributes of the
+                nested IIIF objects.
+            ensure_ascii (bool): Escape non ASCII characters.
+            sort_keys (bool): Sort the keys.
+            indent (int): 2 or None for the compact JSON.
+
+        Returns:
+            str, bytes: The JSON object.
+        """
+
+
+class _OrjsonBackend(_HookBackend):
+    """HELPER CLASS for orjson (https://github.com/ijl/orjson)."""
+    module = "orjson"
+    ensure_ascii = False
+
+    def encode(self, attributes, default, ensure_ascii, sort_keys, indent):
+        import orjson
+        option = orjson.OPT_NON_STR_KEYS
+        if indent is not None:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(attributes, default=default, option=option)
+
+
+class _MsgspecBackend(_HookBackend):
+    """HELPER CLASS for msgspec (https://github.com/jcrist/msgspec)."""
+    module = "msgspec"
+    ensure_ascii = False
+
+    def encode(self, attributes, default, ensure_ascii, sort_keys, indent):
+        import msgspec
+        encoder = msgspec.json.Encoder(
+            enc_hook=default, order="sorted" if sort_keys else None)
+        res = encoder.encode(attributes)
+        if indent is not None:
+            res = msgspec.json.format(res, indent=indent)
+        return res
+
+
+class _RapidjsonBackend(_HookBackend):
+    """HELPER CLASS for python-rapidjson
+    (https://github.com/python-rapidjson/python-rapidjson)."""
+    module = "rapidjson"
+
+    def encode(self, attributes, default, ensure_ascii, sort_keys, indent):
+        import rapidjson
+        return rapidjson.dumps(
+            attributes,
+            default=default,
+            ensure_ascii=ensure_ascii,
+            sort_keys=sort_keys,
+            indent=indent)
+
+
+class _UjsonBackend(_HookBackend):
+    """HELPER CLASS for ujson (https://github.com/ultrajson/ultrajson)."""
+    module = "ujson"
+    # with sort_keys ujson drops the output of default for nested objects
+    sort_keys = False
+
+    def encode(self, attributes, default, ensure_ascii, sort_keys, indent):
+        import ujson
+        if indent is None:
+            # ujson writes a compact JSON with indent=0
+            indent = 0
+        return ujson.dumps(
+            attributes,
+            default=default,
+            ensure_ascii=ensure_ascii,
+            sort_keys=sort_keys,
+            indent=indent,
+            escape_forward_slashes=False)
+
+
+_JSON_BACKENDS = {
+    "json": _StdlibBackend(),
+    "orjson": _OrjsonBackend(),
+    "msgspec": _MsgspecBackend(),
+    "rapidjson": _RapidjsonBackend(),
+    "ujson": _UjsonBackend()}
+# the backends tried by "auto" from the fastest
+_AUTO_BACKENDS = ("orjson", "msgspec", "rapidjson", "json")
+
+
+def register_json_backend(name, backend):
+    """Register a JSON backend that can be selected with `set_json_backend`.
+
+    Args:
+        name (str): The name of the backend.
+        backend (object): An object with a method
+            `dumps(obj, dumps_errors, ensure_ascii, sort_keys, indent, context)`
+            returning the JSON as str or UTF-8 bytes and the boolean attributes
+            `ensure_ascii` and `sort_keys` telling if the options are supported.
+            The attributes of the IIIF objects can be obtained for instance
+            using `iiifpapi3._serializable_attributes` as default hook.
+    """
+    _JSON_BACKENDS[name] = backend
+
+
+def set_json_backend(name="auto"):
+    """Set the JSON encoder used by `json_dumps`, `json_save` and `inspect`.
+
+    The json backend is used until another one is selected. The output of
+    all the backends is the same JSON, with the @context as first key, only
+    the notation of some floats can differ (e.g. 1e16 and 1e+16). The
+    options not supported by a backend (e.g. ensure_ascii with orjson) are
+    handled by the `json` backend.
+
+    Args:
+        name (str, optional): "json", "orjson", "msgspec", "rapidjson",
+            "ujson" or the name of a registered backend. "auto" selects the
+            fastest backend installed among orjson, msgspec, rapidjson and
+            json. Defaults to "auto".
+
+    Returns:
+        str: The name of the selected backend.
+    """
+    global _JSON_BACKEND
+    if name == "auto":
+        name = next(i for i in _AUTO_BACKENDS if _JSON_BACKENDS[i].available())
+    if name not in _JSON_BACKENDS:
+        raise ValueError("%s is not a registered JSON backend." % name)
+    if not getattr(_JSON_BACKENDS[name], "available", lambda: True)():
+        raise ImportError("The JSON backend %s is not installed." % name)
+    _JSON_BACKEND = name
+    return name
+
+
+def get_json_backend():
+    """Return the name of the JSON encoder used by `json_dumps`."""
+    return _JSON_BACKEND
+
+
+_JSON_BACKEND = "json"
+
+
+def _is_frozen(value):
+    """Check if value is made only of immutable JSON values (scalars and
+    tuples)."""
+    cls = value.__class__
+    if cls in _JSON_SCALARS:
+        return True
+    return cls is tuple and all(_is_frozen(v) for v in value)
+
+
+def intern_shared(obj):
+    """Share the identical immutable parts of an IIIF object.
+
+    The strings are interned and the numbers and tuples with the same
+    content (e.g. the same format, profile or type repeated in every
+    canvas of a manifest read from a file) are replaced by a single
+    instance, so that the memory used by the repeated values grows with the
+    distinct content instead of with the number of canvases. The JSON
+    produced is the same.
+
+    Note:
+        Only immutable values are shared. The IIIF objects, the dicts and
+        the lists (e.g. a service or a requiredStatement repeated in every
+        canvas) stay distinct in each position, so that modifying one of
+        them afterwards doesn't modify the others.
+
+    Args:
+        obj (IIIF object): The object, e.g. a Manifest or a Collection, it is
+            modified in place.
+
+    Returns:
+        int: The number of values replaced by a shared one.
+
+    Example:
+        >>> manifest = read_API3_json("manifest.json")
+        >>> iiifpapi3.intern_shared(manifest)
+    """
+    canonical = {}
+    replaced = 0
+
+    def share(value):
+        nonlocal replaced
+        cls = value.__class__
+        if cls is str:
+            shared = sys.intern(value)
+            if shared is not value:
+                replaced += 1
+            return shared
+        if cls is int:
+            key = (cls, value)
+        elif cls is float:
+            # 0.0 == -0.0, the representation tells them apart
+            key = (cls, float.__repr__(value))
+        elif cls is tuple:
+            value = tuple(share(v) for v in value)
+            if not _is_frozen(value):
+                return value
+            key = (cls, tuple(map(id, value)))
+        elif cls is list:
+            return [share(v) for v in value]
+        elif cls is dict:
+            return {share(k): share(v) for k, v in value.items()}
+        elif isinstance(value, _CoreAttributes):
+            for k, v in [(k, share(v)) for k, v in _attribute_items(value)]:
+                setattr(value, k, v)
+            return value
+        else:
+            return value
+        shared = canonical.setdefault(key, value)
+        if shared is not value:
+            replaced += 1
+        return shared
+
+    share(obj)
+    # share is a recursive closure, free the table without waiting the gc
+    canonical.clear()
+    return replaced
+
+
 def add_to(selfx, destination, classx, obj, acceptedclasses=None, target=None):
     """Helper function used for adding IIIF object to to IIIF lists.
 
@@ -193,34 +1515,129 @@ def add_to(selfx, destination, classx, obj, acceptedclasses=None, target=None):
     Returns:
         IIIF object: A reference to an instance of the IIIF object.
     """
-    # if the argument is none we create a list.
-    if unused(selfx.__dict__[destination]):
-        selfx.__dict__[destination] = []
+    selfx.invalidate()
+    # if the argument is none we create a list, the optional properties are
+    # read from the class until they are set.
+    values = getattr(selfx, destination)
+    if unused(values):
+        values = []
+        setattr(selfx, destination, values)
     # if we are not providing a IIIF Object we create one.
     if obj is None and target is None:
-        obj = classx()
-        selfx.__dict__[destination].append(obj)
-        return obj
+        obj = created = classx()
+        values.append(obj)
     elif obj is None:
         # used for annotation.
-        obj = classx(target=target)
-        selfx.__dict__[destination].append(obj)
-        return obj
+        obj = created = classx(target=target)
+        values.append(obj)
     # otherwise we check that the object that we provide has the right type.
     else:
         if acceptedclasses is None:
             acceptedclasses = classx
         if isinstance(obj, acceptedclasses):
-            selfx.__dict__[destination].append(obj)
+            values.append(obj)
         else:
             obj_name = obj.__class__.__name__
             class_name = selfx.__class__.__name__
             raise ValueError("%s object cannot be added to %s." %
                              (obj_name, class_name))
+        created = None
+    if isinstance(obj, _CoreAttributes):
+        if PARENT_LINKS:
+            obj._parent = (weakref.ref(selfx), destination)
+        index = getattr(selfx, "_index", None)
+        if index is not None:
+            index.add(obj, selfx, destination)
+    return created
+
+
+def _set_child(holder, attribute, obj):
+    """Set obj as the value of an attribute replacing the previous object,
+    keeping the id index and the parent links up to date as add_to does."""
+    index = getattr(holder, "_index", None)
+    old = getattr(holder, attribute)
+    if index is not None and isinstance(old, _CoreAttributes) and \
+            old in index.parents:
+        index.discard(old)
+    setattr(holder, attribute, obj)
+    if isinstance(obj, _CoreAttributes):
+        if PARENT_LINKS:
+            obj._parent = (weakref.ref(holder), attribute)
+        if index is not None:
+            index.add(obj, holder, attribute)
+
+
+class URIDiagnostic(object):
+    """HELPER CLASS
+
+    A problem found in a URI by uri_errors or validate_uris.
+
+    Attributes:
+        uri (str): The URI.
+        position (int): The position of the problem in the URI.
+        reason (str): "character" for a character that must be encoded,
+            "scheme" if the URI does not start with http or https and
+            "fragment" for the fragment of a Canvas ID.
+        character (str): The invalid character or None.
+        index (int): The index of the URI in the list passed to
+            validate_uris or None.
+    """
+    __slots__ = ("uri", "position", "reason", "character", "index")
+
+    def __init__(self, uri, position, reason, character=None, index=None):
+        self.uri = uri
+        self.position = position
+        self.reason = reason
+        self.character = character
+        self.index = index
+
+    def __eq__(self, other):
+        return (isinstance(other, URIDiagnostic) and
+                all(getattr(self, a) == getattr(other, a) for a in self.__slots__))
+
+    def __repr__(self):
+        return "URIDiagnostic(%s)" % ", ".join(
+            "%s=%r" % (a, getattr(self, a)) for a in self.__slots__)
+
+    def __str__(self):
+        if self.reason == "scheme":
+            return "ID must start with http or https, it was %r" % (self.uri,)
+        if self.reason == "fragment":
+            return "URI of the canvas must not contain a fragment: #"
+        character = "a space" if self.character == " " else self.character
+        return "I found: %s here. \n%s\n%s^" % (
+            character, self.uri, " " * self.position)
+
+
+def _invalid_uri_patterns():
+    """Return the compiled patterns of INVALID_URI_CHARACTERS with and
+    without the colon, built again when INVALID_URI_CHARACTERS is
+    reassigned."""
+    global _INVALID_URI_PATTERNS
+    characters, patterns = _INVALID_URI_PATTERNS
+    if characters is not INVALID_URI_CHARACTERS:
+        patterns = tuple(
+            re.compile("[%s]" % re.escape(chars)) if chars else re.compile("(?!)")
+            for chars in (INVALID_URI_CHARACTERS,
+                          INVALID_URI_CHARACTERS.replace(":", "")))
+        _INVALID_URI_PATTERNS = (INVALID_URI_CHARACTERS, patterns)
+    return patterns
+
+
+_INVALID_URI_PATTERNS = (None, None)
+
+
+def _scheme_end(URI):
+    if URI.startswith("https:/"):
+        return 7
+    if URI.startswith("http:/"):
+        return 6
+    return 0
 
 
 def check_valid_URI(URI):
-    """Check if it is a valid URI.
+    """Check if it is a valid URI: apart from the scheme it must not contain
+    INVALID_URI_CHARACTERS, use uri_errors for finding them.
 
     Args:
         URI (str): The URI to check.
@@ -228,17 +1645,69 @@ def check_valid_URI(URI):
     Returns:
         Bool: True if it is valid.
     """
-    isvalid = True
-    URI = URI.replace("https:/", "", 1)
-    URI = URI.replace("http:/", "", 1)
-    for indx, carat in enumerate(URI):
-        if carat in INVALID_URI_CHARACTERS:
-            if carat == " ":
-                carat = "a space"
-            arrow = " "*(indx) + "^"
-            isvalid = False
-            print("I found: %s here. \n%s\n%s" % (carat, URI, arrow))
-    return isvalid
+    return _invalid_uri_patterns()[0].search(URI, _scheme_end(URI)) is None
+
+
+def uri_errors(URI):
+    """Return the characters of a URI that must be encoded.
+
+    Args:
+        URI (str): The URI to check.
+
+    Example:
+        >>> print(iiifpapi3.uri_errors("https://example.org/a b")[0])
+        I found: a space here.
+        https://example.org/a b
+                             ^
+
+    Returns:
+        list[URIDiagnostic]: The invalid characters, empty if the URI is
+        valid.
+    """
+    return [URIDiagnostic(URI, match.start(), "character", match.group())
+            for match in _invalid_uri_patterns()[0].finditer(URI, _scheme_end(URI))]
+
+
+_starts_with_scheme = operator.methodcaller("startswith", ("http:/", "https:/"))
+
+
+def validate_uris(uris, canvas=False):
+    """Check many IDs at once, e.g. before a bulk ingest.
+
+    The IDs must start with http or https and must not contain
+    INVALID_URI_CHARACTERS. The valid lists are checked in a single pass on
+    the concatenated IDs, the IDs are checked one by one only for finding
+    the problems.
+
+    Args:
+        uris (list[str]): The IDs.
+        canvas (bool, optional): The IDs are the IDs of Canvases and must
+            not contain a fragment. Defaults to False.
+
+    Returns:
+        list[URIDiagnostic]: The problems found, with the index of the ID in
+        the list, empty if all the IDs are valid.
+    """
+    uris = list(uris)
+    if set(map(type, uris)) <= {str}:
+        joined = "".join(uris)
+        # the colon is accepted only in the scheme
+        if (_invalid_uri_patterns()[1].search(joined) is None
+                and joined.count(":") == len(uris)
+                and all(map(_starts_with_scheme, uris))
+                and not (canvas and "#" in joined)):
+            return []
+    errors = []
+    for index, uri in enumerate(uris):
+        if not isinstance(uri, str) or not uri.startswith("http"):
+            errors.append(URIDiagnostic(uri, 0, "scheme", index=index))
+            continue
+        if canvas and "#" in uri:
+            errors.append(URIDiagnostic(uri, uri.index("#"), "fragment", "#", index))
+        for error in uri_errors(uri):
+            error.index = index
+            errors.append(error)
+    return errors
 
 
 def check_ID(self, extendbase_url, objid):
@@ -255,20 +1724,497 @@ def check_ID(self, extendbase_url, objid):
         if objid:
             raise ValueError(
                 "Set id using extendbase_url or objid not both.")
-        # this prevents the case the user forget the slash; in case the user
-        # really wants to join the string: objid = iiifpapi3.BASE_URL + myid
-        assert BASE_URL.endswith("/") or extendbase_url.startswith("/"), \
-            "Add / to extandbase_url or BASE_URL"
-        joined = "".join((BASE_URL, extendbase_url))
-        assert joined.startswith("http"), "ID must start with http or https"
-        assert check_valid_URI(joined), "Special characters must be encoded"
-        return joined
+        if _basic_checks_enabled():
+            # this prevents the case the user forget the slash; in case the user
+            # really wants to join the string: objid = iiifpapi3.BASE_URL + myid
+            if not (BASE_URL.endswith("/") or extendbase_url.startswith("/")):
+                raise ValidationError("Add / to extandbase_url or BASE_URL")
+        objid = "".join((BASE_URL, extendbase_url))
+    if _checks_enabled():
+        _check_id(self, objid)
+    return objid
+
+
+def _check_id(obj, objid):
+    """Check that the ID of obj is an HTTP(S) URI without special
+    characters and, for the Canvases, without a fragment."""
+    if not objid.startswith("http"):
+        raise ValidationError("ID must start with http or https")
+    if obj.type == 'Canvas':
+        if "#" in objid:
+            raise ValidationError("URI of the canvas must not contain a fragment: #")
+    if not check_valid_URI(objid):
+        raise ValidationError("Special characters must be encoded. %s" % (
+            uri_errors(objid)[0]))
+
+
+def _checks_enabled():
+    """Return True if the set_* and add_* methods must check all their
+    values, see `configure`."""
+    return _SETTINGS.validation == "strict"
+
+
+def _basic_checks_enabled():
+    """Return True if the set_* and add_* methods must check at least the
+    values checked in constant time (e.g. the dimensions and the types), see
+    `configure`."""
+    return _SETTINGS.validation != "off"
+
+
+def check_format(format):
+    """Check that the format is a valid media type e.g. image/jpeg.
+
+    Args:
+        format (str): The media type.
+    """
+    if "/" not in format:
+        raise ValidationError("Format should be in the form type/format e.g. image/jpeg")
+    if not format.split("/")[0].isalpha():
+        raise ValidationError("Format should be in the form type/format e.g. image/jpeg")
+    if format == 'image/jpg':
+        raise ValidationError("Correct media type for jpeg should be image/jpeg not image/jpg")
+    if format == 'image/tif':
+        raise ValidationError("Correct media type  for tiff should be image/tiff")
+    if format not in _media_types():
+        raise ValidationError("Not a IANA valid media type.")
+
+
+def _media_types():
+    """Return the MediaTypeRegistry of MEDIATYPES, built again when
+    MEDIATYPES is reassigned or the number of media types changes (e.g. a
+    media type is appended)."""
+    global _MEDIA_TYPES
+    mediatypes, length, registry = _MEDIA_TYPES
+    current = sum(len(values) for values in MEDIATYPES.values())
+    if mediatypes is not MEDIATYPES or length != current:
+        registry = MediaTypeRegistry(MEDIATYPES)
+        _MEDIA_TYPES = (MEDIATYPES, current, registry)
+    return registry
+
+
+_MEDIA_TYPES = (None, 0, None)
+
+
+def format_from_extension(path):
+    """Return the media type of a file from its extension e.g. image/jpeg for
+    page1.jpg, see IIIFpres.mediatype_registry.EXTENSIONS.
+
+    Args:
+        path (str): The file name, the path or the URL of the file.
+
+    Returns:
+        str: The media type or None if the extension is unknown.
+    """
+    return _media_types().from_extension(path)
+
+
+def _language_set():
+    """Return LANGUAGES as a set, built again when LANGUAGES is reassigned or
+    its length changes (e.g. a tag is appended)."""
+    global _LANGUAGE_SET
+    languages, length, language_set = _LANGUAGE_SET
+    if languages is not LANGUAGES or length != len(LANGUAGES):
+        language_set = frozenset(LANGUAGES)
+        _LANGUAGE_SET = (LANGUAGES, len(LANGUAGES), language_set)
+    return language_set
+
+
+_LANGUAGE_SET = (None, 0, frozenset())
+
+
+def is_valid_language(language):
+    """Check that the language is none or a valid BCP47 language tag.
+
+    The tags in LANGUAGES are accepted as they are, the other tags are parsed
+    with IIIFpres.BCP47_validator and their language subtag must be in
+    LANGUAGES e.g. de-DE.
+
+    Args:
+        language (str): The language tag.
+
+    Returns:
+        bool: True if the language is valid.
+    """
+    if language == "none":
+        return True
+    languages = _language_set()
+    return language in languages or BCP47_validator.is_valid(language, languages)
+
+
+def _check_language(language):
+    if not is_valid_language(language):
+        raise ValidationError(
+            "Language must be a valid BCP47 language tag or none. "
+            "Please read https://git.io/JoQty.")
+
+
+def _check_language_map(languagemap):
+    """Check the languages and the strings of a language map e.g.
+    {"en": ["Page 1"]}."""
+    for language, texts in languagemap.items():
+        _check_language(language)
+        _check_texts(texts)
+
+
+def _check_texts(text):
+    if not isinstance(text, (str, list)):
+        raise ValidationError("text can be a string or a list of strings")
+    if isinstance(text, list):
+        for i in text:
+            if not isinstance(i, str):
+                raise ValidationError("list in labels can contain only strings")
+
+
+def _column(name, values, length):
+    """Return a column of values as a list.
+
+    Args:
+        name (str): The name of the column used in the error messages.
+        values: A sequence, an array (e.g. NumPy or pandas) or a single value
+            (str, int or None) repeated for all the rows.
+        length (int): The number of rows.
+
+    Returns:
+        list: The values.
+    """
+    if values is None or isinstance(values, (str, int)):
+        return [values] * length
+    tolist = getattr(values, "tolist", None)
+    values = tolist() if tolist is not None else list(values)
+    if len(values) != length:
+        raise ValidationError("%s has %s values but there are %s canvases." % (
+            name, len(values), length))
+    return values
+
+
+def _check_column_ids(name, ids, canvas=False):
+    """Check a column of IDs as check_ID does, see validate_uris.
+
+    Args:
+        name (str): The name of the column used in the error messages.
+        ids (list): The IDs.
+        canvas (bool, optional): The IDs are the IDs of Canvases and must
+            not contain a fragment. Defaults to False.
+    """
+    if not _checks_enabled():
+        return
+    errors = validate_uris(ids, canvas=canvas)
+    if errors:
+        raise ValidationError("%s: %s" % (name, errors[0]))
+
+
+def _check_column_dimensions(name, values):
+    """Check that a column contains positive integers, comparing its minimum
+    once instead of checking every value.
+
+    Args:
+        name (str): The name of the column used in the error messages.
+        values (list): The values, int or str of digits.
+
+    Returns:
+        list: The values as int.
+    """
+    if values and set(map(type, values)) == {int} and min(values) > 0:
+        return values
+    if not _basic_checks_enabled():
+        return [int(value) if str(value).isdigit() else value for value in values]
+    res = []
+    for value in values:
+        if not (str(value).isdigit() and int(value) > 0):
+            raise ValidationError("%s must be positive integers. It was %s" % (name, value))
+        res.append(int(value))
+    return res
+
+
+@contextlib.contextmanager
+def _gc_paused():
+    """Disable the garbage collector while building many objects that are
+    not cyclic, otherwise it would only walk the growing tree again and
+    again."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _image_canvas_columns(ids, heights, widths, labels=None,
+                          service_ids=None, body_ids=None,
+                          formats="image/jpeg", body_heights=None,
+                          body_widths=None, page_ids=None,
+                          annotation_ids=None, languages="none",
+                          body_types="Image", service_types="ImageService3",
+                          service_profiles="level2"):
+    """Validate the columns of Manifest.add_canvases_from_columns, a None
+    service ID skips the service of that row.
+
+    Returns:
+        dict: The columns as lists of the same length, with the default
+        values filled in.
+    """
+    ids = _column("ids", ids, len(ids))
+    n = len(ids)
+    _check_column_ids("ids", ids, canvas=True)
+    heights = _check_column_dimensions("heights", _column("heights", heights, n))
+    widths = _check_column_dimensions("widths", _column("widths", widths, n))
+    if body_heights is None:
+        body_heights = heights
+    else:
+        body_heights = _check_column_dimensions(
+            "body_heights", _column("body_heights", body_heights, n))
+    if body_widths is None:
+        body_widths = widths
+    else:
+        body_widths = _check_column_dimensions(
+            "body_widths", _column("body_widths", body_widths, n))
+    labels = _column("labels", labels, n)
+    languages = _column("languages", languages, n)
+    if _checks_enabled():
+        for language in set(languages):
+            _check_language(language)
+    service_ids = _column("service_ids", service_ids, n)
+    _check_column_ids("service_ids", [i for i in service_ids if i is not None])
+    if body_ids is None:
+        if None in service_ids:
+            raise ValidationError("Provide the body_ids or the service_ids.")
+        body_ids = [sid + "/full/max/0/default.jpg" for sid in service_ids]
+    else:
+        body_ids = _column("body_ids", body_ids, n)
+    _check_column_ids("body_ids", body_ids)
+    formats = _column("formats", formats, n)
+    if _checks_enabled():
+        for fmt in set(formats):
+            check_format(fmt)
+    if page_ids is None:
+        page_ids = [cid + "/page/1" for cid in ids]
+    else:
+        page_ids = _column("page_ids", page_ids, n)
+        _check_column_ids("page_ids", page_ids)
+    if annotation_ids is None:
+        annotation_ids = [pid + "/annotation/1" for pid in page_ids]
     else:
-        assert objid.startswith("http"), "ID must start with http or https"
-        if self.type == 'Canvas':
-            assert "#" not in (objid), "URI of the canvas must not contain a fragment: #"
-        assert check_valid_URI(objid), "Special characters must be encoded"
-        return objid
+        annotation_ids = _column("annotation_ids", annotation_ids, n)
+        _check_column_ids("annotation_ids", annotation_ids)
+    return {"ids": ids,
+            "heights": heights,
+            "widths": widths,
+            "labels": labels,
+            "languages": languages,
+            "service_ids": service_ids,
+            "body_ids": body_ids,
+            "formats": formats,
+            "body_heights": body_heights,
+            "body_widths": body_widths,
+            "page_ids": page_ids,
+            "annotation_ids": annotation_ids,
+            "body_types": _column("body_types", body_types, n),
+            "service_types": _column("service_types", service_types, n),
+            "service_profiles": _column("service_profiles", service_profiles, n)}
+
+
+def _image_canvases(ids, heights, widths, labels, languages, service_ids,
+                    body_ids, formats, body_heights, body_widths, page_ids,
+                    annotation_ids, body_types, service_types,
+                    service_profiles):
+    """Build the Canvases of the columns returned by _image_canvas_columns
+    without calling their set_* and add_* methods.
+
+    Returns:
+        list: The Canvases.
+    """
+    canvases = []
+    with _gc_paused():
+        for (cid, height, width, label, language, sid, bid, fmt, bheight,
+             bwidth, pid, aid, btype, stype, sprofile) in zip(
+                ids, heights, widths, labels, languages, service_ids,
+                body_ids, formats, body_heights, body_widths, page_ids,
+                annotation_ids, body_types, service_types, service_profiles):
+            body = bodypainting()
+            body.id = bid
+            body.type = btype
+            body.format = fmt
+            body.height = bheight
+            body.width = bwidth
+            if sid is not None:
+                srv = service()
+                srv.id = sid
+                srv.type = stype
+                srv.profile = sprofile
+                body.service = [srv]
+            annotation = Annotation(target=cid)
+            annotation.id = aid
+            annotation.motivation = "painting"
+            annotation.body = body
+            page = AnnotationPage()
+            page.id = pid
+            page.items = [annotation]
+            canvas = Canvas()
+            canvas.id = cid
+            if label is not None:
+                canvas.label = {language: [label]}
+            canvas.height = height
+            canvas.width = width
+            canvas.items = [page]
+            canvases.append(canvas)
+    return canvases
+
+
+def _invalidating(method):
+    """Wrap a method so that the cached JSON fragment of the object is
+    discarded when the method is called."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._fragment = None
+        return method(self, *args, **kwargs)
+    wrapper._invalidating = True
+    return wrapper
+
+
+def _wrap_mutators(cls):
+    """Wrap the set_* and add_* methods of an IIIF class using `_invalidating`.
+    """
+    for name in dir(cls):
+        if name.startswith(("set_", "add_")):
+            method = getattr(cls, name)
+            if callable(method) and not hasattr(method, "_invalidating"):
+                setattr(cls, name, _invalidating(method))
+
+
+def _iter_objects(obj, holder=None, attribute=None):
+    """Yield the IIIF objects of a tree in the order of the JSON, with the
+    object holding them and the name of the attribute (a list or a single
+    object) that contains them.
+
+    Yields:
+        tuple: (object, holder, attribute), the root has no holder.
+    """
+    yield obj, holder, attribute
+    for name, value in _attribute_items(obj):
+        if value.__class__ is list:
+            for item in value:
+                if isinstance(item, _CoreAttributes):
+                    yield from _iter_objects(item, obj, name)
+        elif isinstance(value, _CoreAttributes):
+            yield from _iter_objects(value, obj, name)
+
+
+# Canvases in a Range and the items of a Collection are references to
+# resources embedded elsewhere and can repeat their IDs.
+_EMBEDDED_TYPES = ("Canvas", "AnnotationPage", "Annotation", "Range")
+
+
+class _IdIndex(object):
+    """HELPER CLASS
+
+    The index of the IDs of the IIIF objects in a tree, see
+    Manifest.enable_id_index. Each object of the tree points to the index in
+    its `_index` slot, so that set_id and add_to keep it up to date.
+
+    Args:
+        root (IIIF object): The root of the tree, e.g. a Manifest.
+        attach (bool, optional): Point the objects to the index. A detached
+            index leaves the `_index` slots untouched, e.g. the temporary
+            index of a Manifest whose objects belong to the index of its
+            Collection. Defaults to True.
+    """
+
+    def __init__(self, root, attach=True):
+        self.root = root
+        self.attach = attach
+        # ID -> objects with that ID, in the order they were added
+        self.ids = {}
+        # object -> (holder, attribute)
+        self.parents = {}
+        self.add(root, None, None)
+
+    def add(self, obj, holder, attribute):
+        """Add an object and the objects it contains to the index."""
+        for item, itemholder, itemattribute in _iter_objects(obj, holder, attribute):
+            if item in self.parents:
+                # an object assigned to two positions
+                continue
+            if self.attach:
+                item._index = self
+            self.parents[item] = (itemholder, itemattribute)
+            objid = item.id
+            if objid.__class__ is str:
+                self.ids.setdefault(objid, []).append(item)
+
+    def discard(self, obj):
+        """Remove an object and the objects it contains from the index."""
+        for item, _, _ in _iter_objects(obj):
+            if item not in self.parents:
+                continue
+            del self.parents[item]
+            del item._index
+            same = self.ids.get(item.id) if item.id.__class__ is str else None
+            if same is not None:
+                same[:] = [i for i in same if i is not item]
+                if not same:
+                    del self.ids[item.id]
+
+    def rename(self, obj, old, new):
+        """Move an object of the index from the ID old to new."""
+        same = self.ids.get(old) if old.__class__ is str else None
+        if same is not None:
+            same[:] = [i for i in same if i is not obj]
+            if not same:
+                del self.ids[old]
+        if new.__class__ is str:
+            self.ids.setdefault(new, []).append(obj)
+
+    def duplicates(self):
+        """Return the IDs used by more than one embedded resource."""
+        res = {}
+        for objid, objs in self.ids.items():
+            if len(objs) < 2:
+                continue
+            embedded = [o for o in objs if o.type in _EMBEDDED_TYPES and
+                        not _is_reference(o, self.parents[o][0])]
+            if len(embedded) > 1:
+                res[objid] = embedded
+        return res
+
+
+def _is_reference(obj, holder):
+    return (holder is not None and (holder.type == "Collection" or
+            (holder.type == "Range" and obj.type == "Canvas")))
+
+
+def _remove_objects(entries):
+    """Remove the objects from the lists or the attributes that contain them.
+
+    Args:
+        entries (list): (object, holder, attribute) tuples.
+
+    Returns:
+        int: The number of objects removed.
+    """
+    groups = {}
+    for obj, holder, attribute in entries:
+        if holder is None:
+            continue
+        key = (id(holder), attribute)
+        if key not in groups:
+            groups[key] = (holder, attribute, set())
+        groups[key][2].add(id(obj))
+    removed = 0
+    for holder, attribute, objs in groups.values():
+        value = getattr(holder, attribute)
+        if value.__class__ is list:
+            kept = [i for i in value if id(i) not in objs]
+            removed += len(value) - len(kept)
+            value[:] = kept
+        elif id(value) in objs:
+            if attribute in holder._requirements:
+                setattr(holder, attribute, holder._requirements[attribute])
+            else:
+                setattr(holder, attribute, None)
+            removed += 1
+        holder.invalidate()
+    return removed
 
 
 # Let's group all the common arguments across the different types of collection
@@ -283,15 +2229,197 @@ class _CoreAttributes(object):
     The core attributes are: ID, Type, Label
 
     ID an type attributes are required. The other might vary.
+
+    The objects keep the JSON fragment produced by the last incremental
+    serialization (see `json_dumps`), the fragment is discarded as soon as
+    one of the set_* or add_* methods of the object is called.
+
+    The classes found once per canvas (Canvas, AnnotationPage, Annotation,
+    bodypainting and service) declare their IIIF properties in __slots__.
+    Their instances are created from the `Extensible` subclass, which adds an
+    instance __dict__ for the properties not defined by the specification
+    (e.g. of an extension), unless the compact objects are enabled with
+    `configure(compact_objects=True)`: then the instances have no __dict__.
+
+    In the other classes the optional properties are class attributes holding
+    their default value (None): they are stored in the instance only once
+    they are set, so that the unset ones take no memory and are not visited
+    by the serializers. These classes list their properties in `_fields`, in
+    the order of the JSON, which the serializers follow whatever the order
+    the properties were set in.
+
+    The Required and Recommended properties are declared once per class in
+    `_requirements`, mapping the name of the property to a Required or
+    Recommended instance shared by all the objects of the class. The
+    declarations of the base classes are inherited and can be overridden.
+    When the ID is not declared, a Required ID mentioning the name of the
+    class is created for each class.
     """
+    # the fragment, the id index and the link to the parent are stored in
+    # slots so that they are never serialized, the subclasses not declaring
+    # __slots__ have an instance __dict__.
+    __slots__ = ("_fragment", "_index", "_parent", "__weakref__")
+
+    _requirements = {}
+
+    _fields = ("id", "type", "label")
+
+    # These might be suggested or may be used if needed.
+    label = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _wrap_mutators(cls)
+        requirements = {}
+        for base in reversed(cls.__mro__):
+            requirements.update(base.__dict__.get("_requirements", ()))
+        cls._requirements = requirements
+        if "id" in requirements:
+            cls._id_requirement = requirements["id"]
+        else:
+            cls._id_requirement = Required(
+                "A %s must have the ID property." % cls.__name__)
+        fields = []
+        for base in reversed(cls.__mro__):
+            if base is not _CoreAttributes:
+                for name in base.__dict__.get("__slots__", ()):
+                    # the slots hidden by a subclass are not serialized
+                    if isinstance(getattr(cls, name, None),
+                                  types.MemberDescriptorType):
+                        fields.append(name)
+        if fields:
+            # the slots are declared in the order of the JSON
+            cls._fields = tuple(fields)
+            _SLOTTED[cls] = (tuple(fields),
+                             operator.attrgetter(*fields),
+                             cls.__dictoffset__ != 0)
+            if "__slots__" in cls.__dict__ and not cls.__dictoffset__:
+                cls.Extensible = type(cls.__name__, (cls,), {
+                    "__module__": cls.__module__,
+                    "__qualname__": cls.__qualname__ + ".Extensible",
+                    "__doc__": cls.__doc__})
+
+    def __new__(cls, *args, **kwargs):
+        if cls is _CoreAttributes or not _SETTINGS.compact_objects:
+            # the slotted classes have no __dict__ for the other attributes
+            cls = cls.__dict__.get("Extensible", cls)
+        return object.__new__(cls)
+
+    def __reduce_ex__(self, protocol):
+        # the copies keep the class of the original, compact or not, whatever
+        # the settings
+        return (object.__new__, (self.__class__,), self.__getstate__())
+
+    def __getstate__(self):
+        # the copies (copy.copy, copy.deepcopy) don't belong to the id index
+        # of the original and don't share its fragment
+        slotted = _SLOTTED.get(self.__class__)
+        if slotted is None:
+            return self.__dict__
+        fields, getter, has_dict = slotted
+        state = {k: getattr(self, k) for k in fields if hasattr(self, k)}
+        return (self.__dict__ if has_dict else None, state)
+
+    def link_parents(self):
+        """Store in each object contained in this one a weak reference to
+        the object containing it, as the add_* methods do when
+        iiifpapi3.PARENT_LINKS is True, e.g. after reading a JSON file or
+        after assigning objects directly to the attributes.
+        """
+        for obj, holder, attribute in _iter_objects(self):
+            if holder is not None:
+                obj._parent = (weakref.ref(holder), attribute)
+
+    def get_parent(self):
+        """Return the object containing this one, or None if the object has
+        no parent link (see `link_parents`)."""
+        link = getattr(self, "_parent", None)
+        return None if link is None else link[0]()
+
+    def get_root(self):
+        """Return the outermost object reachable following the parent
+        links (e.g. the Manifest of an Annotation)."""
+        obj = self
+        parent = obj.get_parent()
+        while parent is not None:
+            obj = parent
+            parent = obj.get_parent()
+        return obj
+
+    def path(self):
+        """Return the JSON path of the object following the parent links,
+        e.g. "$.items[3].items[0].items[0]" for the Annotation of the fourth
+        Canvas of a Manifest. The cost is proportional to the depth of the
+        object, not to the size of the tree.
+
+        The path starts from the outermost object linked (see
+        `link_parents` and iiifpapi3.PARENT_LINKS).
+
+        Raises:
+            ValueError: If an object of the path was removed from its
+                parent or its parent was deleted.
+
+        Returns:
+            str: The path.
+        """
+        parts = []
+        obj = self
+        link = getattr(obj, "_parent", None)
+        while link is not None:
+            holder, attribute = link[0](), link[1]
+            if holder is None:
+                raise ValueError("The parent of %r was deleted." % obj)
+            value = getattr(holder, attribute, None)
+            if value is obj:
+                parts.append(".%s" % attribute)
+            else:
+                try:
+                    parts.append(".%s[%d]" % (attribute, value.index(obj)))
+                except (AttributeError, ValueError):
+                    raise ValueError("%r is not in the %s of %r anymore." % (
+                        obj, attribute, holder))
+            obj = holder
+            link = getattr(obj, "_parent", None)
+        return "$" + "".join(reversed(parts))
+
+    def detach(self):
+        """Remove the object from the object containing it, using the parent
+        link instead of searching it in the tree.
+
+        Raises:
+            ValueError: If the object has no parent link.
+        """
+        parent = self.get_parent()
+        if parent is None:
+            raise ValueError("%r has no parent link." % self)
+        _remove_objects([(self, parent, self._parent[1])])
+        index = getattr(self, "_index", None)
+        if index is not None:
+            index.discard(self)
+        del self._parent
+
+    def _reindex_id(self, old):
+        """Update the id index the object belongs to, if any, after its ID
+        changed from old."""
+        index = getattr(self, "_index", None)
+        if index is not None:
+            index.rename(self, old, self.id)
+
+    def invalidate(self):
+        """Discard the cached JSON fragment of the object.
+
+        The set_* and add_* methods call it automatically (they copy the
+        lists and dicts they store, so that these are not shared with other
+        objects), it must be called only after modifying directly the
+        attributes of the object (e.g. `canvas.label["en"].append("Page")` or
+        `canvas.id = newid`). After modifying a list or a dict assigned
+        directly to several objects it must be called on each of them.
+        """
+        self._fragment = None
 
     def __init__(self):
-        self.id = Required(
-            "A %s must have the ID property." %
-            self.__class__.__name__)
+        self.id = self._id_requirement
         self.type = self.__class__.__name__
-        # These might be suggested or may be used if needed.
-        self.label = None
 
     def set_id(self, objid=None, extendbase_url=None):
         """Set the ID of the object
@@ -312,7 +2440,9 @@ class _CoreAttributes(object):
                 to be joined with the iiifpapi3.BASE_URL:
                 `id = iiifpapi3.BASE_URL + extendbase_url`. Defaults to None.
         """
+        old = self.id
         self.id = check_ID(self, extendbase_url, objid)
+        self._reindex_id(old)
 
     def add_label(self, language, text):
         """Add a label to the object.
@@ -337,17 +2467,14 @@ class _CoreAttributes(object):
             self.label = {}
         if language is None:
             language = "none"
-        assert language in LANGUAGES or language == "none", \
-            """Language must be a valid BCP47 language tag or none.
-            Please read https://git.io/JoQty. Please read https://git.io/JoQty."""
-        assert isinstance(text, (str, list)), "text can be a string or a list of strings"
-        if isinstance(text, list):
-            for i in text:
-                assert isinstance(i, str), "list in labels can contain only strings"
-        else:
+        if _checks_enabled():
+            _check_language(language)
+            _check_texts(text)
+        if not isinstance(text, list):
             text = [text]
         if language not in self.label:
-            self.label[language] = text
+            # copied so that the list is not shared with other objects
+            self.label[language] = list(text)
         else:
             # faster way to join lists
             self.label[language][0:0] = text
@@ -357,7 +2484,10 @@ class _CoreAttributes(object):
             dumps_errors=False,
             ensure_ascii=False,
             sort_keys=False,
-            context=None):
+            context=None,
+            compact=False,
+            incremental=False,
+            workers=None):
         """Dumps the content of the object in JSON format.
 
         Args:
@@ -369,90 +2499,87 @@ class _CoreAttributes(object):
             sort_keys (bool, optional): Sort the keys. Defaults to False.
             context (str,list, optional): Add additional context. Defaults to
                 None.
+            compact (bool, optional): If True the JSON is written without
+                indentation and with minimal separators. Defaults to False.
+            incremental (bool, optional): If True the JSON of each nested
+                object is cached and reused by the next incremental dump,
+                only the objects modified in the meanwhile (and the objects
+                containing them) are encoded again. Defaults to False.
+            workers (int, optional): If greater than 1 the items of the object
+                (e.g. the canvases of a Manifest or the manifests of a
+                Collection) are encoded in chunks on a pool of `workers`
+                processes. The output is the same, it pays off only for very
+                large objects. On platforms that do not fork the call must be
+                protected by `if __name__ == "__main__":`. Defaults to None.
 
         Returns:
             str: The JSON object as a string.
         """
         if context is None:
             context = CONTEXT
-
-        if not __debug__:
-            # in debug Required and Recommend are None hence we use a faster
-            # serializer
-            print("Debug False")
-            dumps_errors = True
-
-        def serializerwitherrors(obj):
-            return {k: v for k, v in obj.__dict__.items() if v is not None}
-
-        def serializer(obj):
-            return {k: v for k, v in obj.__dict__.items() if serializable(v)}
-        if dumps_errors:
-            res = json.dumps(
-                self,
-                default=serializerwitherrors,
-                indent=2,
-                ensure_ascii=ensure_ascii,
-                sort_keys=sort_keys)
-        else:
-            res = json.dumps(
-                self,
-                default=serializer,
-                indent=2,
-                ensure_ascii=ensure_ascii,
-                sort_keys=sort_keys)
-        # little hack for fixing context first 3 chrs "{\n"
-        res = "".join(('{\n  "@context": %s,\n ' % json.dumps(context), res[3:]))
+        indent = None if compact else 2
+        backend = _JSON_BACKENDS[_JSON_BACKEND]
+        if incremental or (workers is not None and workers > 1) or \
+                (ensure_ascii and not getattr(backend, "ensure_ascii", False)) or \
+                (sort_keys and not getattr(backend, "sort_keys", False)):
+            # only the json backend supports these options
+            backend = _JSON_BACKENDS["json"]
+        if backend is _JSON_BACKENDS["json"]:
+            return backend.dumps(
+                self, dumps_errors, ensure_ascii, sort_keys, indent, context,
+                incremental=incremental, workers=workers)
+        res = backend.dumps(
+            self, dumps_errors, ensure_ascii, sort_keys, indent, context)
+        if isinstance(res, bytes):
+            res = res.decode("utf-8")
         return res
 
-    def orjson_dumps(
+    def orjson_dumps(
+            self,
+            dumps_errors=False,
+            context=None,
+            compact=False):
+        """Dumps the content of the object in JSON format using orJSON library.
+
+        Args:
+            dumps_errors (bool, optional): If set true it shows any problem
+                found, directly on the JSON file with a Required or Recommended
+                tag.Defaults to False.
+            context (str,list, optional): Add additional context. Defaults to None.
+            compact (bool, optional): If True the JSON is written without
+                indentation. Defaults to False.
+
+        Returns:
+            str: The JSON object as a string.
+        """
+        return self.orjson_dumps_bytes(
+            dumps_errors=dumps_errors,
+            context=context,
+            compact=compact).decode("utf-8")
+
+    def orjson_dumps_bytes(
             self,
             dumps_errors=False,
-            context=None):
-        """Dumps the content of the object in JSON format using orJSON library.
+            context=None,
+            compact=False):
+        """Dumps the content of the object in JSON format using orJSON library
+        returning the UTF-8 encoded bytes produced by orJSON.
 
         Args:
             dumps_errors (bool, optional): If set true it shows any problem
                 found, directly on the JSON file with a Required or Recommended
                 tag.Defaults to False.
-            ensure_ascii (bool, optional): Ensure ASCI are used.
-                Defaults to False.
-            sort_keys (bool, optional): Sort the keys. Defaults to False.
             context (str,list, optional): Add additional context. Defaults to None.
+            compact (bool, optional): If True the JSON is written without
+                indentation. Defaults to False.
 
         Returns:
-            str: The JSON object as a string.
+            bytes: The JSON object as UTF-8 bytes.
         """
-        import orjson
         if context is None:
             context = CONTEXT
-
-        if not __debug__:
-            # in debug Required and Recommend are None hence we use a faster
-            # serializer
-            print("Debug False")
-            dumps_errors = True
-
-        def serializerwitherrors(obj):
-            return {k: v for k, v in obj.__dict__.items() if v is not None}
-
-        def serializer(obj):
-            return {k: v for k, v in obj.__dict__.items() if serializable(v)}
-
-        if dumps_errors:
-            res = orjson.dumps(
-                self,
-                default=serializerwitherrors,
-                option=orjson.OPT_INDENT_2)
-        else:
-            res = orjson.dumps(
-                self,
-                default=serializer,
-                option=orjson.OPT_INDENT_2)
-        # little hack for fixing context first 3 chrs "{\n"
-        res = "".join(('{\n  "@context": %s,\n ' % json.dumps(context),
-                      res[3:].decode("utf-8")))
-        return res
+        return _JSON_BACKENDS["orjson"].dumps(
+            self, dumps_errors, False, False, None if compact else 2, context)
 
     def to_json(
             self,
@@ -473,14 +2600,56 @@ class _CoreAttributes(object):
         Return:
             dict: a JSON dump of the object as dict.
         """
-        res = json.loads(self.json_dumps(
+        return self.to_dict(
             dumps_errors=dumps_errors,
-            ensure_ascii=ensure_ascii,
             sort_keys=sort_keys,
-            context=context))
-        return res
+            context=context)
+
+    def to_dict(
+            self,
+            dumps_errors=False,
+            sort_keys=False,
+            context=None,
+            shared=False):
+        """Return the object as a JSON-ready dict.
+
+        The dict is built walking the object, without dumping it to a string
+        and parsing it back, and it is equal to `json.loads(self.json_dumps())`.
+
+        Args:
+            dumps_errors (bool, optional): If True also the errors will be
+                included. Defaults to False.
+            sort_keys (bool, optional): Sort the keys. Defaults to False.
+            context (str,list, optional): Add additional contexts to the JSON.
+                Defaults to None.
+            shared (bool, optional): If True the language maps and the other
+                lists and dict made only of JSON values are not copied but
+                shared with the object. Use it only if the result is not
+                modified (e.g. when it is passed to a web framework to be
+                serialized). Defaults to False.
+        Return:
+            dict: the object as dict.
+        """
+        if context is None:
+            context = CONTEXT
+        return _to_dict(
+            self,
+            dumps_errors=dumps_errors,
+            sort_keys=sort_keys,
+            shared=shared,
+            context=context,
+            track_required=_SETTINGS.track_required)
 
-    def json_save(self, filename, save_errors=False, ensure_ascii=False, context=None):
+    def json_save(
+            self,
+            filename,
+            save_errors=False,
+            ensure_ascii=False,
+            context=None,
+            compact=False,
+            sidecars=None,
+            incremental=False,
+            workers=None):
         """Save the JSON object to file.
 
         Args:
@@ -491,13 +2660,89 @@ class _CoreAttributes(object):
                 used. Defaults to False.
             context (str,list, optional): Add additional contexts to the JSON.
                 Defaults to None.
+            compact (bool, optional): If True the JSON is written without
+                indentation and with minimal separators. Defaults to False.
+            sidecars (str, list, optional): Also write precompressed copies of
+                the file next to it, "gz" for filename.gz and "br" for
+                filename.br (requires brotli), e.g. to be served by nginx with
+                gzip_static and brotli_static. Defaults to None.
+            incremental (bool, optional): Reuse the JSON cached by the previous
+                incremental dump for the objects not modified, see `json_dumps`.
+                Defaults to False.
+            workers (int, optional): Encode the items of the object on a pool
+                of processes, see `json_dumps`. Defaults to None.
         """
-        with open(filename, 'w') as f:
-            f.write(self.json_dumps(
-                dumps_errors=save_errors, ensure_ascii=ensure_ascii, context=context))
+        res = self.json_dumps(
+            dumps_errors=save_errors,
+            ensure_ascii=ensure_ascii,
+            context=context,
+            compact=compact,
+            incremental=incremental,
+            workers=workers)
+        # written as the sidecars: UTF-8 without translating the newlines
+        with open(filename, 'w', encoding="utf-8", newline="\n") as f:
+            f.write(res)
+        if sidecars:
+            _write_sidecars(filename, res.encode("utf-8"), sidecars)
+
+    def orjson_save(self, filename, save_errors=False, context=None, compact=False):
+        """Save the JSON object to file, the UTF-8 bytes produced by orJSON
+        are written directly to the file opened in binary mode.
 
-    def orjson_save(self, filename, save_errors=False, context=None):
-        """Save the JSON object to file.
+        Args:
+            filename (str): The filename.
+            save_errors (bool, optional): If True also the errors will be
+                dumped. Defaults to False.
+            context (str,list, optional): Add additional contexts to the JSON.
+                Defaults to None.
+            compact (bool, optional): If True the JSON is written without
+                indentation. Defaults to False.
+        """
+        with open(filename, 'wb') as f:
+            f.write(self.orjson_dumps_bytes(
+                dumps_errors=save_errors, context=context, compact=compact))
+
+    def json_stream(
+            self,
+            fp,
+            dumps_errors=False,
+            ensure_ascii=False,
+            sort_keys=False,
+            context=None,
+            compact=False):
+        """Write the object in JSON format to a file object in chunks.
+
+        The output is the same of `json_dumps` but the JSON is never built as
+        a single string, hence the peak memory does not grow with the size
+        of the manifest.
+
+        Args:
+            fp (file object): Any object with a `write` method accepting str
+                (e.g. an open file, io.StringIO, a socket wrapper).
+            dumps_errors (bool, optional): If set true it shows any problem
+                found directly on the JSON file with a Required or Recommended
+                tag. Defaults to False.
+            ensure_ascii (bool, optional): Ensure ASCI are used.
+                Defaults to False.
+            sort_keys (bool, optional): Sort the keys. Defaults to False.
+            context (str,list, optional): Add additional context. Defaults to
+                None.
+            compact (bool, optional): If True the JSON is written without
+                indentation and with minimal separators. Defaults to False.
+        """
+        if context is None:
+            context = CONTEXT
+        encoder = _JSONStreamEncoder(
+            fp.write,
+            dumps_errors=dumps_errors,
+            ensure_ascii=ensure_ascii,
+            sort_keys=sort_keys,
+            indent=None if compact else 2)
+        encoder.encode(self, context=context)
+
+    def save_stream(self, filename, save_errors=False, ensure_ascii=False, context=None,
+                    compact=False):
+        """Save the JSON object to file writing it in chunks.
 
         Args:
             filename (str): The filename.
@@ -507,24 +2752,66 @@ class _CoreAttributes(object):
                 used. Defaults to False.
             context (str,list, optional): Add additional contexts to the JSON.
                 Defaults to None.
+            compact (bool, optional): If True the JSON is written without
+                indentation and with minimal separators. Defaults to False.
         """
         with open(filename, 'w') as f:
-            f.write(self.orjson_dumps(
-                dumps_errors=save_errors, context=context))
+            self.json_stream(
+                f, dumps_errors=save_errors, ensure_ascii=ensure_ascii, context=context,
+                compact=compact)
+
+    def inspect(self, quiet=False):
+        """Show the missing required and recomended fields with their JSON
+        paths (e.g. $.items[0].label).
+
+        The object is walked without producing the JSON, hence it can be used
+        for checking large objects before publishing them.
 
-    def inspect(self):
-        """Print the object in the derminal and show the missing required
-        and recomended fields.
+        Args:
+            quiet (bool, optional): Do not print anything and return the
+                report. Defaults to False.
 
         Returns:
-            bool: True.
+            bool: True, or if quiet is True a dict with the lists of the
+            missing "Required" and "Recommended" fields as
+            {"path": ..., "description": ...} dicts and their counts
+            "missing_required" and "missing_recommended".
         """
-        jdump = self.json_dumps(dumps_errors=True)
-        print(jdump)
-        print("Missing required field: %s." % jdump.count('"Required":'))
-        print("Missing recommended field: %s." % jdump.count('"Recommended":'))
+        report = _missing_fields(self)
+        if quiet:
+            return report
+        for kind in ("Required", "Recommended"):
+            for field in report[kind]:
+                print("%s %s: %s" % (kind, field["path"], field["description"]))
+        print("Missing required field: %s." % report["missing_required"])
+        print("Missing recommended field: %s." % report["missing_recommended"])
         return True
 
+    def validate(self):
+        """Check the whole object with the rules of the set_* and add_*
+        methods, e.g. after building it with the validation "off" or "fast",
+        see `configure`.
+
+        Note:
+            The rules raise ValidationError, hence the report is the same
+            when Python runs with the -O flag.
+
+        Example:
+            >>> iiifpapi3.configure(validation="off")
+            >>> canvas.set_height("tall")
+            >>> manifest.validate()["Invalid"]
+            [{'path': '$.items[0].height', 'description': 'Must be a digit. It was tall'}]
+
+        Returns:
+            dict: The report of inspect(quiet=True) with the list of the
+            "Invalid" fields, as {"path": ..., "description": ...} dicts, and
+            their count "invalid".
+        """
+        report = _missing_fields(self)
+        report["Invalid"] = _invalid_fields(self)
+        report["invalid"] = len(report["Invalid"])
+        return report
+
     def show_errors_in_browser(self, getHTML=False):
         """Opens a browser window showing the required and the reccomended
         attributes.
@@ -552,10 +2839,21 @@ class _CoreAttributes(object):
         return " id:".join((type_, id_))
 
 
+_wrap_mutators(_CoreAttributes)
+_CoreAttributes._id_requirement = Required(
+    "A _CoreAttributes must have the ID property.")
+_CoreAttributes.Extensible = type("_CoreAttributes", (_CoreAttributes,), {
+    "__module__": __name__,
+    "__qualname__": "_CoreAttributes.Extensible",
+    "__doc__": _CoreAttributes.__doc__})
+
+
 # Common helpers methods that will be used for constructing the IIIF objects.
 class _Format(object):
     """HELPER CLASS for setting the Format.
     """
+    __slots__ = ()
+
     def set_format(self, format):
         """Set the format of the resource.
 
@@ -569,18 +2867,25 @@ class _Format(object):
         Args:
             format (str): Usually  is the MIME e.g. image/jpeg.
         """
-
-        assert "/" in format, "Format should be in the form type/format e.g. image/jpeg"
-        assert format.split("/")[0].isalpha(), "Format should be in the form type/format e.g. image/jpeg"
-        assert not format == 'image/jpg', "Correct media type for jpeg should be image/jpeg not image/jpg"
-        assert not format == 'image/tif', "Correct media type  for tiff should be image/tiff"
-        assert any(format in sl for sl in MEDIATYPES.values()), "Not a IANA valid media type."
+        if _checks_enabled():
+            check_format(format)
         self.format = format
 
 
+def _check_positive_integer(value):
+    #  because we accept string and int it is easier to assume they are int
+    if not str(value).isdigit():
+        raise ValidationError("Must be a digit. It was %s" % value)
+    if not str(value).isnumeric():
+        raise ValidationError("Must be a positive integer")
+    if int(value) <= 0:
+        raise ValidationError("Must be a positive integer")
+
+
 class _HeightWidth(object):
     """HELPER CLASS for setting Height and Width.
     """
+    __slots__ = ()
 
     def _checkpositiveinteger(self, value):
         """Return the value if positive integer.
@@ -591,10 +2896,11 @@ class _HeightWidth(object):
         Returns:
             inputvalue (int): the value coerced to int.
         """
-        #  because we accept string and int it is easier to assume they are int
-        assert str(value).isdigit(), "Must be a digit. It was %s" % value
-        assert str(value).isnumeric(), "Must be a positive integer"
-        assert int(value) > 0, "Must be a positive integer"
+        if _basic_checks_enabled():
+            _check_positive_integer(value)
+        elif not str(value).isdigit():
+            # stored as it is, validate reports it
+            return value
         return int(value)
 
     def set_width(self, width):
@@ -640,6 +2946,8 @@ class _HeightWidth(object):
 class _Duration(object):
     """HELPER CLASS for setting Duration.
     """
+    __slots__ = ()
+
     def set_duration(self, duration):
         """Set the duration of the resource.
 
@@ -673,18 +2981,26 @@ class _ViewingDirection(object):
         Args:
             viewingDirection (str): The viewing direction.
         """
-        viewingDirections = ["left-to-right",
-                             "right-to-left",
-                             "bottom-to-top",
-                             "top-to-bottom"]
-        msg = "viewingDirection must be one of these values %s" % viewingDirections
-        assert viewingDirection in viewingDirections, msg
+        if _basic_checks_enabled():
+            _check_viewingDirection(viewingDirection)
         self.viewingDirection = viewingDirection
 
 
+def _check_viewingDirection(viewingDirection):
+    viewingDirections = ["left-to-right",
+                         "right-to-left",
+                         "bottom-to-top",
+                         "top-to-bottom"]
+    msg = "viewingDirection must be one of these values %s" % viewingDirections
+    if viewingDirection not in viewingDirections:
+        raise ValidationError(msg)
+
+
 class _MutableType(object):
     """HELPER CLASS In some IIIF objects the type can be changed.
     """
+    __slots__ = ()
+
     def set_type(self, mtype):
         """Set the type or class of the resource.
 
@@ -696,13 +3012,21 @@ class _MutableType(object):
         Args:
             mtype (str): the type of the object e.g. Image or Dataset.
         """
-        assert not mtype[0].isdigit(), "First letter should not be a digit"
+        if _basic_checks_enabled():
+            _check_type(mtype)
         self.type = mtype
 
 
+def _check_type(mtype):
+    if mtype[0].isdigit():
+        raise ValidationError("First letter should not be a digit")
+
+
 class _ImmutableType(object):
     """HELPER CLASS In some IIIF objects the type cannot be changed.
     """
+    __slots__ = ()
+
     def set_type(self, mtype=None):
         """In case of IIIF objects with predefined type this function won't
         change the type but will rise an error if you try to change it.
@@ -732,6 +3056,8 @@ class _ImmutableType(object):
 class _SeeAlso(object):
     """HELPER CLASS for adding SeeAlso objects.
     """
+    __slots__ = ()
+
     def add_seeAlso(self, seeAlsoobj=None):
         """Add a seeAlso object to the resource.
 
@@ -769,14 +3095,23 @@ class seeAlso(_MutableType, _CoreAttributes, _Format):
     representation, with distinct id and format properties.
     """
 
+    _requirements = {
+        "type": Required("SeeAlso type is required, e.g. dataset, Image"),
+        "label": Recommended("SeeAlso label is recommended."),
+        "format": Recommended("SeeAlso type is recommended e.g. text/xml"),
+        "profile": Recommended("Resources referenced by the seeAlso or"
+                               "service properties should have the profile"
+                               "property."),
+    }
+
+    _fields = ("id", "type", "label", "format", "profile")
+
     def __init__(self):
         super(seeAlso, self).__init__()
-        self.type = Required("SeeAlso type is required, e.g. dataset, Image")
-        self.label = Recommended("SeeAlso label is recommended.")
-        self.format = Recommended("SeeAlso type is recommended e.g. text/xml")
-        self.profile = Recommended("Resources referenced by the seeAlso or"
-                                   "service properties should have the profile"
-                                   "property.")
+        self.type = self._requirements["type"]
+        self.label = self._requirements["label"]
+        self.format = self._requirements["format"]
+        self.profile = self._requirements["profile"]
 
     def set_profile(self, profile):
         # TODO: add check
@@ -798,10 +3133,15 @@ class partOf(_MutableType, _CoreAttributes):
     Collection using partOf to aid in navigation.
     """
 
+    _requirements = {
+        "type": Required("Each partOf item must have a type"),
+        "label": Recommended("Each partOf item should have the label property."),
+    }
+
     def __init__(self):
         super(partOf, self).__init__()
-        self.type = Required("Each partOf item must have a type")
-        self.label = Recommended("Each partOf item should have the label property.")
+        self.type = self._requirements["type"]
+        self.label = self._requirements["label"]
 
 
 class supplementary(_ImmutableType, _CoreAttributes):
@@ -823,16 +3163,22 @@ class supplementary(_ImmutableType, _CoreAttributes):
     the Annotations that transcribe or translate, respectively.
     """
 
+    _requirements = {
+        "label": Recommended("An Annotation Collection should have the"
+                             "label property with at least one entry."),
+    }
+
     def __init__(self):
         super(supplementary, self).__init__()
         self.type = "AnnotationCollection"
-        self.label = Recommended("An Annotation Collection should have the"
-                                 "label property with at least one entry.")
+        self.label = self._requirements["label"]
 
 
 class _Service(object):
     """HELPER CLASS for adding services.
     """
+    __slots__ = ()
+
     def add_service(self, serviceobj=None):
         """Add a service to the resource.
 
@@ -876,15 +3222,21 @@ class service(_CoreAttributes, _HeightWidth, _Service):
     Clients may process service on any resource type, and should process the
     IIIF Image API service.
     """
+    __slots__ = ("id", "type", "label", "profile", "width", "height",
+                 "service", "sizes")
+
+    _requirements = {
+        "type": Required(
+            "Each object must have a type property."),
+        "profile": Recommended(
+            "Each object should have a profile property."),
+    }
 
     def __init__(self):
         super(service, self).__init__()
-        self.type = Required(
-            "Each object must have a type property."
-        )
-        self.profile = Recommended(
-            "Each object should have a profile property.")
-
+        self.type = self._requirements["type"]
+        self.label = None
+        self.profile = self._requirements["profile"]
         self.width = None
         self.height = None
         self.service = None
@@ -968,19 +3320,32 @@ class thumbnail(_MutableType, _CoreAttributes, _Format, _HeightWidth,
         >>> tmb.set_format("image/jpeg")
         >>> tmb.set_heightWidth(1234,1234)
     """
+    _requirements = {
+        "type": Required("A thumbnail must have a type, usually 'Image'."),
+        "format": Recommended("A thumbnail should have a format."),
+        "height": Recommended("Should have an height or a duration."),
+        "width": Recommended("Should have an width or a duration."),
+    }
+
+    service = None
+    duration = None
+
+    _fields = ("id", "type", "label", "service", "format", "height", "width",
+               "duration")
+
     def __init__(self):
         super(thumbnail, self).__init__()
-        self.service = None
-        self.type = Required("A thumbnail must have a type, usually 'Image'.")
-        self.format = Recommended("A thumbnail should have a format.")
-        self.height = Recommended("Should have an height or a duration.")
-        self.width = Recommended("Should have an width or a duration.")
-        self.duration = None
+        self.type = self._requirements["type"]
+        self.format = self._requirements["format"]
+        self.height = self._requirements["height"]
+        self.width = self._requirements["width"]
 
 
 class _Thumbnail(object):
     """HELPER CLASS for adding thumbnail.
     """
+    __slots__ = ()
+
     def add_thumbnail(self, thumbnailobj=None):
         """Add a thumbnail object to the resource.
 
@@ -1005,6 +3370,8 @@ class _Thumbnail(object):
 class _AddLanguage(object):
     """HELPER CLASS for adding languages.
     """
+    __slots__ = ()
+
     def add_language(self, language):
         """add a language to the language list of the resource.
 
@@ -1014,8 +3381,9 @@ class _AddLanguage(object):
             >>> manifest.add_language('en')
 
         Note:
-            pyIIIFpres accept only single tag, in case you need subtags you
-            need to add them to iiifpapi3.LANGUAGES::
+            Composite tags (e.g. de-DE) are checked with
+            IIIFpres.BCP47_validator, tags not in the registry can be added
+            to iiifpapi3.LANGUAGES::
 
             >>> from IIIFpres import iiifpapi3,BCP47lang
             >>> iiifpapi3.LANGUAGES.append("de-DE-u-co-phonebk")
@@ -1027,9 +3395,8 @@ class _AddLanguage(object):
         """
         if unused(self.language):
             self.language = []
-        assert language in LANGUAGES or language == "none", \
-            "Language must be a valid BCP47 language tag or none."\
-            "Please read https://git.io/JoQty."
+        if _checks_enabled():
+            _check_language(language)
         self.language.append(language)
 
 
@@ -1056,13 +3423,22 @@ class homepage(_MutableType, _CoreAttributes, _Format, _AddLanguage):
         >>> homp.add_language("en")
     """
 
+    _requirements = {
+        "label": Required("Homepage must have a label"),
+        "type": Required("Homepage must have a type."),
+        "format": Recommended(
+            "Hompage should have a format property e.g. Text."),
+    }
+
+    language = None
+
+    _fields = ("id", "type", "label", "language", "format")
+
     def __init__(self):
         super(homepage, self).__init__()
-        self.language = None
-        self.label = Required("Homepage must have a label")
-        self.type = Required("Homepage must have a type.")
-        self.format = Recommended(
-            "Hompage should have a format property e.g. Text.")
+        self.label = self._requirements["label"]
+        self.type = self._requirements["type"]
+        self.format = self._requirements["format"]
 
     def set_language(self, language):
         """ Deprecated method use `add_language` instead."""
@@ -1073,6 +3449,7 @@ class homepage(_MutableType, _CoreAttributes, _Format, _AddLanguage):
 class _Hompage(object):
     """HELPER CLASS for adding homepages.
     """
+    __slots__ = ()
 
     def add_homepage(self, homepageobj=None):
         """add an homepage object to the resource.
@@ -1129,20 +3506,29 @@ class provider(_ImmutableType, _CoreAttributes, _Hompage, _SeeAlso):
         >>> homp.set_id("https://digital.library.ucla.edu/")
     """
 
-    def __init__(self):
-        super(provider, self).__init__()
-        self.context = None
-        self.type = "Agent"
-        self.label = Required(
+    _requirements = {
+        "label": Required(
             "Agents must have the label property, and its value must be a"
-            "JSON object as described in the languages section.")
-        self.homepage = Recommended(
+            "JSON object as described in the languages section."),
+        "homepage": Recommended(
             "Agents should have the homepage property, and its value must be"
-            "an array of JSON objects as described in the homepage section.")
-        self.logo = Recommended(
+            "an array of JSON objects as described in the homepage section."),
+        "logo": Recommended(
             "Agents should have the logo property, and its value must be an"
-            "array of JSON objects as described in the logo section.")
-        self.seeAlso = None
+            "array of JSON objects as described in the logo section."),
+    }
+
+    context = None
+    seeAlso = None
+
+    _fields = ("id", "type", "label", "context", "homepage", "logo", "seeAlso")
+
+    def __init__(self):
+        super(provider, self).__init__()
+        self.type = "Agent"
+        self.label = self._requirements["label"]
+        self.homepage = self._requirements["homepage"]
+        self.logo = self._requirements["logo"]
 
     def add_logo(self, logoobj=None):
         """add a logo object to the resource
@@ -1191,14 +3577,21 @@ class logo(_ImmutableType, _CoreAttributes, _HeightWidth, _Format, _Service):
         >>> serv.set_id("https://UCLA-Library-Logo")
     """
 
+    _requirements = {
+        "format": Recommended(
+            "Logo should have a format attribute e.g. image/png"),
+        "service": Recommended(
+            "Logo should have service attribute,"
+            "you can add using srv = mylogo.add_service()"),
+    }
+
+    _fields = ("id", "type", "label", "format", "service")
+
     def __init__(self):
         super(logo, self).__init__()
         self.type = "Image"
-        self.format = Recommended(
-            "Logo should have a format attribute e.g. image/png")
-        self.service = Recommended(
-            "Logo should have service attribute,"
-            "you can add using srv = mylogo.add_service()")
+        self.format = self._requirements["format"]
+        self.service = self._requirements["service"]
 
     def add_label(self, language, text):
         """Label not permitted in logo."""
@@ -1231,12 +3624,20 @@ class rendering(_MutableType, _CoreAttributes, _Format):
         >>> rendering.set_format("application/pdf")
     """
 
+    _requirements = {
+        "format": Recommended(
+            "Rendering should have a format property e.g. application/pdf."),
+        "label": Required("Rendering object must have a label."),
+        "type": Required("Rendering should have a type"),
+    }
+
+    _fields = ("id", "type", "label", "format")
+
     def __init__(self):
         super(rendering, self).__init__()
-        self.format = Recommended(
-            "Rendering should have a format property e.g. application/pdf.")
-        self.label = Required("Rendering object must have a label.")
-        self.type = Required("Rendering should have a type")
+        self.format = self._requirements["format"]
+        self.label = self._requirements["label"]
+        self.type = self._requirements["type"]
 
 
 class _ServicesList(object):
@@ -1280,11 +3681,16 @@ class languagemap(object):
         >>> languagemap.add_value('hosted by imagineRio','en')
     """
 
+    _requirements = {
+        "label": Required(
+            "The metadata/requiredstatements must have at least a label"),
+        "value": Required(
+            "The metadata/requiredstatements must have at least a value"),
+    }
+
     def __init__(self):
-        self.label = Required(
-            "The metadata/requiredstatements must have at least a label")
-        self.value = Required(
-            "The metadata/requiredstatements must have at least a value")
+        self.label = self._requirements["label"]
+        self.value = self._requirements["value"]
 
     def add_value(self, value, language="none"):
         """Add the value of the language map.
@@ -1305,9 +3711,8 @@ class languagemap(object):
         # if any(['</' in i for i in value]):
         #    assert any([i.startswith('<') and i.endswith('>') for i in value]),\
         #        'if html must begin with < and end with >'
-        assert language in LANGUAGES or language == "none", \
-            "Language must be a valid BCP47 language tag or none."\
-            "Please read https://git.io/JoQty."
+        if _checks_enabled():
+            _check_language(language)
         self.value[language] = value
 
     def add_label(self, label, language="none"):
@@ -1329,9 +3734,8 @@ class languagemap(object):
             label = [label]
         # TODO: check that is not html
         # https://iiif.io/api/presentation/3.0/#45-html-markup-in-property-values
-        assert language in LANGUAGES or language == "none", \
-            "Language must be a valid BCP47 language tag or none." \
-            "Please read https://git.io/JoQty."
+        if _checks_enabled():
+            _check_language(language)
         self.label[language] = label
 
 
@@ -1339,6 +3743,117 @@ class languagemap(object):
 # COMMON ATTRIBUTES TO MAJOR CONTAINERS
 ##
 
+def _check_rights(rights):
+    licenceurls = ["http://creativecommons.org/licenses/",
+                   "http://creativecommons.org/publicdomain/mark/",
+                   "http://rightsstatements.org/vocab/"]
+    if not any([rights.startswith(i) for i in licenceurls]):
+        raise ValidationError("Must start with:%s" % str(licenceurls)[1:-1])
+
+
+def _check_behavior(obj, behaviors, behavior):
+    """Check that the behavior can be added to the behaviors of obj."""
+    # TODO: should we assert if behaviour disjoint with others?
+    if behavior not in BEHAVIOURS:
+        raise ValidationError(f"{behavior} is not valid. See https://git.io/Jo7r9.")
+    if behavior == "auto-advance":
+        if obj.type not in ["Collection", "Manifest", "Canvas", "Range"]:
+            raise ValidationError(f"{behavior} behavior is valid only for Collection, Manifest, Canvas, Range")
+        if obj.type == "Range":
+            #  TODO: Ranges that include or are Canvases with at least the duration dimension.
+            pass
+        if "no-auto-advance" in behaviors:
+            raise ValidationError("Conflicts with no-auto-advance")
+
+    elif behavior == "no-auto-advance":
+        if obj.type not in ["Collection", "Manifest", "Canvas", "Range"]:
+            raise ValidationError(f"{behavior} behavior is valid only for Collection, Manifest, Canvas, Range")
+        if "auto-advance" in behaviors:
+            raise ValidationError("Conflicts with auto-advance")
+
+    elif behavior == "repeat":
+        if obj.type not in ["Collection", "Manifest"]:
+            raise ValidationError(f"{behavior} behavior is valid only for Collection and Manifest")
+        # TODO: assert any([True for i in obj.items if i.type == "Canvas" and i.duration is not None]), "This behaviour should be used when canvas has duration property. Add it after the canvas definition."
+        if "no-repeat" in behaviors:
+            raise ValidationError("Conflicts with no-repeat")
+
+    elif behavior == "no-repeat":
+        if obj.type not in ["Collection", "Manifest"]:
+            raise ValidationError(f"{behavior} behavior is valid only for Collection and Manifest")
+        if "repeat" in behaviors:
+            raise ValidationError("Conflicts with repeat")
+
+    elif behavior == "unordered" or behavior == "individuals":
+        if obj.type not in ["Collection", "Manifest", "Range"]:
+            raise ValidationError(f"{behavior} behavior is valid only for Collection, Manifest,Range")
+        dsjntbhv = ("individuals", "continuous", "paged")
+        if any(x in dsjntbhv for x in behaviors):
+            raise ValidationError(f"Conflicts with one of: {dsjntbhv}")
+
+    elif behavior == "continuous":
+        if obj.type not in ["Collection", "Manifest", "Range"]:
+            raise ValidationError(f"{behavior} behavior is valid only for Collection, Manifest,Range")
+# TODO: assert any([True for i in obj.items if i.type == "Canvas" and i.height is not None]), "This behaviour should be used when canvas has duration property. Add it after the canvas definition."
+        dsjntbhv = ("individuals", "unordered", "paged")
+        if any(x in dsjntbhv for x in behaviors):
+            raise ValidationError(f"Conflicts with one of: {dsjntbhv}")
+
+    elif behavior == "paged":
+        if obj.type not in ["Collection", "Manifest", "Range"]:
+            raise ValidationError(f"{behavior} behavior is valid only for Collection, Manifest,Range")
+        dsjntbhv = ("individuals",
+                    "continuous",
+                    "facing-pages",
+                    "unordered",
+                    "non-paged")
+        if any(x in dsjntbhv for x in behaviors):
+            raise ValidationError(f"Conflicts with one of: {dsjntbhv}")
+
+    elif behavior == "facing-pages" or behavior == "non-paged":
+        if obj.type != "Canvas":
+            raise ValidationError(
+                f"{behavior} behavior is valid only on on Canvases, where the "
+                "Canvas has at least height and width dimensions.")
+        if obj.height is None:
+            raise ValidationError(f"with {behavior} behavior Canvas must have height property.")
+        if obj.width is None:
+            raise ValidationError(f"with {behavior} behavior Canvas must have width property.")
+        if behavior == "facing-pages":
+            dsjntbhv = ("paged", "non-paged")
+        else:
+            dsjntbhv = ("facing-pages", "paged")
+        if any(x in dsjntbhv for x in behaviors):
+            raise ValidationError(f"Conflicts with one of: {dsjntbhv}")
+
+    elif behavior == "multi-part" or behavior == "together":
+        if obj.type != "Collection":
+            raise ValidationError(f"{behavior} behavior is valid only on Collections.")
+        if behavior == "multi-part":
+            dsjntbhv = "together"
+        else:
+            dsjntbhv = "multi-part"
+        if dsjntbhv in behaviors:
+            raise ValidationError(f"Conflicts with {dsjntbhv}")
+
+    elif behavior in ["sequence", "thumbnail-nav", "no-nav"]:
+        if obj.type != "Range":
+            raise ValidationError(f"{behavior} behavior is valid only on Ranges.")
+# TODO: Valid only on Ranges, where the Range is referenced in the structures property of a Manifest
+        disjoint = [x for x in ["sequence", "thumbnail-nav", "no-nav"] if x != behavior]
+        if any(x in disjoint for x in behaviors):
+            raise ValidationError(f"Conflicts with one of: {disjoint}")
+
+    elif behavior == "hidden":
+        vc = ["Annotation",
+              "AnnotationCollection",
+              "AnnotationPage",
+              "SpecificResource",
+              "Choice"]
+        if obj.type not in vc:
+            raise ValidationError(f"{behavior} behavior is valid only on {vc}.")
+
+
 class _CommonAttributes(_CoreAttributes, _Thumbnail, _Service, _Hompage,
                         _SeeAlso):
     """HELPER CLASS
@@ -1348,14 +3863,35 @@ class _CommonAttributes(_CoreAttributes, _Thumbnail, _Service, _Hompage,
 
     ID an type attributes are required. The other might vary.
     """
-
-    def __init__(self):
-        super(_CommonAttributes, self).__init__()
+    __slots__ = ()
+
+    metadata = None
+    summary = None
+    requiredStatement = None
+    rights = None
+    # https://iiif.io/api/presentation/3.0/#thumbnail
+    thumbnail = None
+    behavior = None
+    seeAlso = None
+    service = None
+    homepage = None
+    rendering = None
+    partOf = None
+    provider = None
+
+    _fields = ("id", "type", "label", "metadata", "summary",
+               "requiredStatement", "rights", "thumbnail", "behavior",
+               "seeAlso", "service", "homepage", "rendering", "partOf",
+               "provider")
+
+    def _init_common_slots(self):
+        """Set the common properties of a compact class to their default,
+        the slots can't be read before they are assigned."""
+        self.label = None
         self.metadata = None
         self.summary = None
         self.requiredStatement = None
         self.rights = None
-        # https://iiif.io/api/presentation/3.0/#thumbnail
         self.thumbnail = None
         self.behavior = None
         self.seeAlso = None
@@ -1417,13 +3953,15 @@ class _CommonAttributes(_CoreAttributes, _Thumbnail, _Service, _Hompage,
 
         if not isinstance(value, list):
             value = [value]
-        assert language_l in LANGUAGES or language_l == "none", \
-            "Language must be a valid BCP47 language tag or none." \
-            "Please read https://git.io/JoQty."
+        if _checks_enabled():
+            _check_language(language_l)
 
         if entry is None:
             entry = {"label": {language_l: [label]},
-                     "value": {language_v: value}}
+                     "value": {language_v: list(value)}}
+        else:
+            # copied so that the entry is not shared with other objects
+            entry = copy.deepcopy(entry)
         self.metadata.append(entry)
 
     def add_summary(self, language, text):
@@ -1444,9 +3982,8 @@ class _CommonAttributes(_CoreAttributes, _Thumbnail, _Service, _Hompage,
         """
         if unused(self.summary):
             self.summary = {}
-        assert language in LANGUAGES or language == "none",\
-            "Language must be a valid BCP47 language tag or none."\
-            "Please read https://git.io/JoQty."
+        if _checks_enabled():
+            _check_language(language)
         self.summary[language] = [text]
 
     def set_requiredStatement(self, label=None, value=None, language_l=None,
@@ -1501,14 +4038,14 @@ class _CommonAttributes(_CoreAttributes, _Thumbnail, _Service, _Hompage,
                 language_l = "none"
             if language_v is None:
                 language_v = "none"
-            assert language_l in LANGUAGES or language_l == "none",\
-                "Language must be a valid BCP47 language tag or none. "\
-                "Please read https://git.io/JoQty."
-            assert language_v in LANGUAGES or language_v == "none",\
-                "Language must be a valid BCP47 language tag or none. "\
-                "Please read https://git.io/JoQty."
+            if _checks_enabled():
+                _check_language(language_l)
+                _check_language(language_v)
             entry = {"label": {language_l: [label]},
                      "value": {language_v: [value]}}
+        else:
+            # copied so that the entry is not shared with other objects
+            entry = copy.deepcopy(entry)
         self.requiredStatement = entry
 
     def set_rights(self, rights):
@@ -1527,11 +4064,8 @@ class _CommonAttributes(_CoreAttributes, _Thumbnail, _Service, _Hompage,
         Args:
             rights (str): an URL pointing to a licence.
         """
-        licenceurls = ["http://creativecommons.org/licenses/",
-                       "http://creativecommons.org/publicdomain/mark/",
-                       "http://rightsstatements.org/vocab/"]
-        assert any([rights.startswith(i) for i in licenceurls]
-                   ), "Must start with:%s" % str(licenceurls)[1:-1]
+        if _basic_checks_enabled():
+            _check_rights(rights)
         self.rights = rights
 
     def add_requiredStatement(self, label=None, value=None, language_l=None,
@@ -1563,103 +4097,11 @@ class _CommonAttributes(_CoreAttributes, _Thumbnail, _Service, _Hompage,
         Args:
             behavior (str): the behaviour to be added.
         """
-        # TODO: should we assert if behaviour disjoint with others?
-        assert behavior in BEHAVIOURS, f"{behavior} is not valid. See https://git.io/Jo7r9."
         # this might leave an empty list if user fail the assertion
         if unused(self.behavior):
             self.behavior = []
-        if behavior == "auto-advance":
-            assert self.type in ["Collection", "Manifest", "Canvas", "Range"],\
-                f"{behavior} behavior is valid only for Collection, Manifest, Canvas, Range"
-            if self.type == "Range":
-                #  TODO: Ranges that include or are Canvases with at least the duration dimension.
-                pass
-            assert "no-auto-advance" not in self.behavior,\
-                "Conflicts with no-auto-advance"
-
-        elif behavior == "no-auto-advance":
-            assert self.type in ["Collection", "Manifest", "Canvas", "Range"],\
-                f"{behavior} behavior is valid only for Collection, Manifest, Canvas, Range"
-            assert "auto-advance" not in self.behavior, "Conflicts with auto-advance"
-
-        elif behavior == "repeat":
-            assert self.type in ["Collection", "Manifest"],\
-                f"{behavior} behavior is valid only for Collection and Manifest"
-            # TODO: assert any([True for i in self.items if i.type == "Canvas" and i.duration is not None]), "This behaviour should be used when canvas has duration property. Add it after the canvas definition."
-            assert "no-repeat" not in self.behavior, "Conflicts with no-repeat"
-
-        elif behavior == "no-repeat":
-            assert self.type in ["Collection", "Manifest"],\
-                f"{behavior} behavior is valid only for Collection and Manifest"
-            assert "repeat" not in self.behavior, "Conflicts with repeat"
-
-        elif behavior == "unordered" or behavior == "individuals":
-            assert self.type in ["Collection", "Manifest", "Range"],\
-                f"{behavior} behavior is valid only for Collection, Manifest,Range"
-            dsjntbhv = ("individuals", "continuous", "paged")
-            assert not any(x in dsjntbhv for x in self.behavior),\
-                f"Conflicts with one of: {dsjntbhv}"
-
-        elif behavior == "continuous":
-            assert self.type in ["Collection", "Manifest", "Range"],\
-                f"{behavior} behavior is valid only for Collection, Manifest,Range"
-# TODO: assert any([True for i in self.items if i.type == "Canvas" and i.height is not None]), "This behaviour should be used when canvas has duration property. Add it after the canvas definition."
-            dsjntbhv = ("individuals", "unordered", "paged")
-            assert not any(x in dsjntbhv for x in self.behavior),\
-                f"Conflicts with one of: {dsjntbhv}"
-
-        elif behavior == "paged":
-            assert self.type in ["Collection", "Manifest", "Range"],\
-                f"{behavior} behavior is valid only for Collection, Manifest,Range"
-            dsjntbhv = ("individuals",
-                        "continuous",
-                        "facing-pages",
-                        "unordered",
-                        "non-paged")
-            assert not any(x in dsjntbhv for x in self.behavior),\
-                f"Conflicts with one of: {dsjntbhv}"
-
-        elif behavior == "facing-pages" or behavior == "non-paged":
-            assert self.type == "Canvas",\
-                f"{behavior} behavior is valid only on on Canvases, where the "\
-                "Canvas has at least height and width dimensions."
-            assert self.height is not None,\
-                f"with {behavior} behavior Canvas must have height property."
-            assert self.width is not None,\
-                f"with {behavior} behavior Canvas must have width property."
-            if behavior == "facing-pages":
-                dsjntbhv = ("paged", "non-paged")
-            else:
-                dsjntbhv = ("facing-pages", "paged")
-            assert not any(x in dsjntbhv for x in self.behavior),\
-                f"Conflicts with one of: {dsjntbhv}"
-
-        elif behavior == "multi-part" or behavior == "together":
-            assert self.type == "Collection",\
-                f"{behavior} behavior is valid only on Collections."
-            if behavior == "multi-part":
-                dsjntbhv = "together"
-            else:
-                dsjntbhv = "multi-part"
-            assert dsjntbhv not in self.behavior,\
-                f"Conflicts with {dsjntbhv}"
-
-        elif behavior in ["sequence", "thumbnail-nav", "no-nav"]:
-            assert self.type == "Range",\
-                f"{behavior} behavior is valid only on Ranges."
-# TODO: Valid only on Ranges, where the Range is referenced in the structures property of a Manifest
-            disjoint = ["sequence", "thumbnail-nav", "no-nav"]
-            assert not any(x in disjoint.remove(behavior) for x in self.behavior),\
-                f"Conflicts with one of: {disjoint}"
-
-        elif behavior == "hidden":
-            vc = ["Annotation",
-                  "AnnotationCollection",
-                  "AnnotationPage",
-                  "SpecificResource",
-                  "Choice"]
-            assert self.type in vc, f"{behavior} behavior is valid only on {vc}."
-
+        if _basic_checks_enabled():
+            _check_behavior(self, self.behavior, behavior)
         self.behavior.append(behavior)
 
     def add_partOf(self, partOfobj=None):
@@ -1763,13 +4205,17 @@ class Annotation(_CommonAttributes):
     object. Implementations should check the type of the resource and not
     assume that it is always content to be rendered.
     """
+    __slots__ = ("id", "type", "label", "metadata", "summary",
+                 "requiredStatement", "rights", "thumbnail", "behavior",
+                 "seeAlso", "service", "homepage", "rendering", "partOf",
+                 "provider", "motivation", "body", "target")
 
     def __init__(self, target=Required()):
         super(Annotation, self).__init__()
+        self._init_common_slots()
         self.motivation = None  # TODO: Check if this is required
         self.body = None  # TODO: Check if this is required
         self.target = target
-        self.metadata = None
 
     def set_motivation(self, motivation):
         """set the motivation of the annotation.
@@ -1808,9 +4254,9 @@ class Annotation(_CommonAttributes):
         if motivation not in motivations:
             warnings.warn("Motivation not in %s" % motivations)
         if motivation == "painting":
-            self.body = bodypainting()
+            _set_child(self, "body", bodypainting())
         if motivation == "commenting" or motivation == "tagging":
-            self.body = bodycommenting()
+            _set_child(self, "body", bodycommenting())
         self.motivation = motivation
 
     def add_motivation(self, motivation):
@@ -1905,11 +4351,21 @@ class AnnotationPage(_CommonAttributes):
     reference to an external page.
 
     """
+    __slots__ = ("id", "type", "label", "metadata", "summary",
+                 "requiredStatement", "rights", "thumbnail", "behavior",
+                 "seeAlso", "service", "homepage", "rendering", "partOf",
+                 "provider", "items")
+
+    _requirements = {
+        "items": Recommended(
+            "The annotation page should incude at least one item."),
+    }
+
     # TODO: AnnotationPage type MUST be AnnotationPage?
     def __init__(self):
         super(AnnotationPage, self).__init__()
-        self.items = Recommended(
-            "The annotation page should incude at least one item.")
+        self._init_common_slots()
+        self.items = self._requirements["items"]
 
     def add_item(self, item):
         """Add an item (Annotation) to the AnnotationPage.
@@ -1942,10 +4398,14 @@ class AnnotationCollection(_CommonAttributes):
     to the user’s preference.
 
     """
+    _requirements = {
+        "label": Recommended("An Annotation Collection should have the"
+                             "label property with at least one entry."),
+    }
+
     def __init__(self):
         super(AnnotationCollection, self).__init__()
-        self.label = Recommended("An Annotation Collection should have the"
-                                 "label property with at least one entry.")
+        self.label = self._requirements["label"]
 
     def set_id(self, objid, extendbase_url=None):
         """Set the ID of the object
@@ -1970,7 +4430,9 @@ class AnnotationCollection(_CommonAttributes):
             return super().set_id(objid=objid, extendbase_url=extendbase_url)
         except AssertionError:
             warnings.warn("%s is not an http, AnnotationCollections should use HTTP(S) URI")
+            old = self.id
             self.id = objid
+            self._reindex_id(old)
 
 
 class _AnnotationsList(object):
@@ -1978,6 +4440,8 @@ class _AnnotationsList(object):
     Some IIIF obejcts have a list of annotations. This list can contain
     only AnnotationPages.
     """
+    __slots__ = ()
+
     def add_annotationpage_to_annotations(self, annopageobj=None):
         """Add an AnnotationPage to the annotations list.
 
@@ -2008,6 +4472,7 @@ class _AnnotationsList(object):
 class _AddAnnoP2Items(object):
     """HELPER CLASS for adding annotationpage to items.
     """
+    __slots__ = ()
 
     def add_annotationpage_to_items(self, annotationpageobj=None, target=None):
         """Add an annotation page to the items list of the object.
@@ -2038,18 +4503,27 @@ class contentresources(_MutableType, _CommonAttributes, _HeightWidth,
     from within the Manifest or Collection.
     This includes images, video, audio, data, web pages or any other format.
     """
+    __slots__ = ("id", "type", "label", "annotations", "format", "profile")
+
+    _requirements = {
+        "type": Required("The type of the content resource must be "
+                         "included,and should be taken from the table"
+                         "listed under the definition of type."),
+        "format": Recommended("The format of the resource should be"
+                              "included and, if so, should be the media"
+                              "type that is returned when the resource is"
+                              "dereferenced."),
+        "profile": Recommended("The profile of the resource, if it has one,"
+                               "should also be included"),
+    }
+
     def __init__(self):
-        super(_CommonAttributes, self).__init__()
+        super(contentresources, self).__init__()
+        self.label = None
         self.annotations = None
-        self.type = Required("The type of the content resource must be "
-                             "included,and should be taken from the table"
-                             "listed under the definition of type.")
-        self.format = Recommended("The format of the resource should be"
-                                  "included and, if so, should be the media"
-                                  "type that is returned when the resource is"
-                                  "dereferenced.")
-        self.profile = Recommended("The profile of the resource, if it has one,"
-                                   "should also be included")
+        self.type = self._requirements["type"]
+        self.format = self._requirements["format"]
+        self.profile = self._requirements["profile"]
 
     def add_annotation(self, annotation=None):
         """Please use `add_annotationpage_to_annotations` instead."""
@@ -2075,7 +4549,8 @@ class bodycommenting(_ImmutableType):
         distinguishing text in XML from plain text.
 
         Note:
-            pyIIIFpres will check that the format is in `MEDIATYPES['text']`
+            pyIIIFpres will check that the format is a text media type of
+            `MEDIATYPES`.
             If you are confident with the format you are using set the format
             using `obj.format = ...` or run the script with -O flag.
             or append your format to the MEDIATYPES:
@@ -2084,7 +4559,8 @@ class bodycommenting(_ImmutableType):
         Args:
             format (str): Usually  is the MIME e.g. text/plain.
         """
-        assert format in MEDIATYPES['text'], "Not a valid MEDIATYPE for text"
+        if _checks_enabled():
+            _check_text_format(format)
         self.format = format
 
     def set_value(self, value):
@@ -2101,12 +4577,16 @@ class bodycommenting(_ImmutableType):
         Args:
             language (str): The language of the TextualBody value e.g. "en"
         """
-        assert language in LANGUAGES or language == "none",\
-            "Language must be a valid BCP47 language tag or none."\
-            "Please read https://git.io/JoQty."
+        if _checks_enabled():
+            _check_language(language)
         self.language = language
 
 
+def _check_text_format(format):
+    if _media_types().toplevel(format) != "text":
+        raise ValidationError("Not a valid MEDIATYPE for text")
+
+
 class bodypainting(contentresources, _Service, _AddLanguage):
     """Pseudo-IIIF resource
 
@@ -2114,12 +4594,17 @@ class bodypainting(contentresources, _Service, _AddLanguage):
     Manifest) is provided by the body property of Annotations with the painting
     motivation.
     """
+    __slots__ = ("height", "width", "duration", "service", "language", "items",
+                 "metadata", "summary", "requiredStatement", "rights",
+                 "thumbnail", "behavior", "seeAlso", "homepage", "rendering",
+                 "partOf", "provider")
+
     def __init__(self):
         super(bodypainting, self).__init__()
+        self._init_common_slots()
         self.height = None
         self.width = None
         self.duration = None
-        self.service = None
         self.language = None
         self.items = None
 
@@ -2171,11 +4656,15 @@ class _CMRCattributes(_CommonAttributes, _AnnotationsList, _ImmutableType):
 
     All these values are optional.
     """
-    def __init__(self):
-        super(_CMRCattributes, self).__init__()
-        self.placeholderCanvas = None
-        self.accompanyingCanvas = None
-        self.navDate = None
+    __slots__ = ()
+
+    annotations = None
+    placeholderCanvas = None
+    accompanyingCanvas = None
+    navDate = None
+
+    _fields = _CommonAttributes._fields + (
+        "placeholderCanvas", "accompanyingCanvas", "navDate")
 
     def _apcanvas(self, canvastype, canvas):
         """An helper method for setting placeholder and accompany Canvas.
@@ -2261,20 +4750,26 @@ class _CMRCattributes(_CommonAttributes, _AnnotationsList, _ImmutableType):
         Args:
             navDate (str): A date in UTC in the format "2010-01-01T00:00:00Z"
         """
-        # check using a modified regex from www.w3.org
-        # https://www.w3.org/TR/xmlschema11-2/#dateTime
-        r = (r"-?([1-9][0-9]{3,}|0[0-9]{3})"
-             r"-(0[1-9]|1[0-2])"
-             r"-(0[1-9]|[12][0-9]|3[01])"
-             r"T(([01][0-9]|2[0-3]):[0-5][0-9]:[0-5][0-9](\.[0-9]+)?|(24:00:00(\.0+)?))"
-             r"(Z|(\+|-)((0[0-9]|1[0-3]):[0-5][0-9]|14:00))")
-        assert re.match(r, navDate), "The value must be an XSD dateTime"\
-            "literal with a timezone. It was: %s" % navDate
-        if navDate[-1] != "Z":
-            warnings.warn(f"The value should be given in UTC with the Z was {navDate}")
+        if _checks_enabled():
+            _check_navDate(navDate)
         self.navDate = navDate
 
 
+def _check_navDate(navDate):
+    # check using a modified regex from www.w3.org
+    # https://www.w3.org/TR/xmlschema11-2/#dateTime
+    r = (r"-?([1-9][0-9]{3,}|0[0-9]{3})"
+         r"-(0[1-9]|1[0-2])"
+         r"-(0[1-9]|[12][0-9]|3[01])"
+         r"T(([01][0-9]|2[0-3]):[0-5][0-9]:[0-5][0-9](\.[0-9]+)?|(24:00:00(\.0+)?))"
+         r"(Z|(\+|-)((0[0-9]|1[0-3]):[0-5][0-9]|14:00))")
+    if not re.match(r, navDate):
+        raise ValidationError("The value must be an XSD dateTime"
+                              "literal with a timezone. It was: %s" % navDate)
+    if navDate[-1] != "Z":
+        warnings.warn(f"The value should be given in UTC with the Z was {navDate}")
+
+
 class Canvas(_CMRCattributes, _HeightWidth, _Duration, _AddAnnoP2Items):
     """IIIF resource
 
@@ -2285,18 +4780,33 @@ class Canvas(_CMRCattributes, _HeightWidth, _Duration, _AddAnnoP2Items):
     display. Canvases must be identified by a URI and it must be an HTTP(S)
     URI.
     """
+    __slots__ = ("id", "type", "label", "metadata", "summary",
+                 "requiredStatement", "rights", "thumbnail", "behavior",
+                 "seeAlso", "service", "homepage", "rendering", "partOf",
+                 "provider", "placeholderCanvas", "accompanyingCanvas",
+                 "navDate", "height", "width", "duration", "items",
+                 "annotations")
+
+    _requirements = {
+        "label": Recommended("A Canvas should have the label property with at least one entry."),
+        "height": Required("Must have an height or a duration."),
+        "width": Required("Must have an width or a duration."),
+        "items": Recommended(
+            "The canvas should contain at least one item."),
+    }
 
     def __init__(self):
         super(Canvas, self).__init__()
-        self.label = Recommended("A Canvas should have the label property with at least one entry.")
-        self.height = Required("Must have an height or a duration.")
-        self.width = Required("Must have an width or a duration.")
-        self.duration = None
-        self.items = Recommended(
-            "The canvas should contain at least one item.")
-        self.annotations = None
+        self._init_common_slots()
         self.placeholderCanvas = None
         self.accompanyingCanvas = None
+        self.navDate = None
+        self.label = self._requirements["label"]
+        self.height = self._requirements["height"]
+        self.width = self._requirements["width"]
+        self.duration = None
+        self.items = self._requirements["items"]
+        self.annotations = None
 
     def add_item(self, item):
         """Add an item (AnnotationPage) to the Canvas.
@@ -2337,12 +4847,24 @@ class start(_CoreAttributes):
         >>> manifest.start.set_type("Canvas")
         >>> manifest.start.set_id("0202-start-canvas/canvas/p2")
     """
+    _requirements = {
+        "type": Required("Start object must have a type."),
+        "profile": Recommended("Start object should have a profile."),
+        "source": Required(
+            "If you are not pointing to a Canvas please specify a source."),
+        "selector": Required(
+            "If you are not pointing to a Canvas please specify a selector"),
+    }
+
+    source = None
+    selector = None
+
+    _fields = ("id", "type", "label", "profile", "source", "selector")
+
     def __init__(self):
         super(start, self).__init__()
-        self.type = Required("Start object must have a type.")
-        self.profile = Recommended("Start object should have a profile.")
-        self.source = None
-        self.selector = None
+        self.type = self._requirements["type"]
+        self.profile = self._requirements["profile"]
 
     def set_type(self, mtype):
         """Set the type of the resource: Canvas or SpecificResource.
@@ -2352,11 +4874,9 @@ class start(_CoreAttributes):
                 SpecificResource.
         """
         if mtype != "Canvas" and self.source is None:
-            self.source = Required(
-                    "If you are not pointing to a Canvas please specify a source.")
+            self.source = self._requirements["source"]
         if mtype != "Canvas" and self.selector is None:
-            self.selector = Required(
-                    "If you are not pointing to a Canvas please specify a selector")
+            self.selector = self._requirements["selector"]
         self.type = mtype
 
     def set_source(self, source):
@@ -2367,7 +4887,7 @@ class start(_CoreAttributes):
 
 
 class _Start(object):
-    def set_start(self, startobj=None):
+    def set_start(self, startobj=None, as_reference=True):
         """This method set a start obejct at self.start.
         IIIF: A Canvas, or part of a Canvas, which the client should show on
         initialization for the resource that has the start property.
@@ -2380,22 +4900,157 @@ class _Start(object):
             `set_start` self assign start attribute to a iiifpapi3.start
             handler see example below on how to use it.
 
+        A Canvas passed as startobj is replaced by a reference to it (its id
+        and type) unless as_reference is False.
+
         Examples:
             manifest.set_start()
             manifest.start.set_type('Canvas')
             manifest.start.set_id("https://example.org/iiif/1/canvas/1")
 
+        Args:
+            startobj (start or Canvas, optional): The start object or the
+                Canvas to start with. Defaults to None.
+            as_reference (bool, optional): Replace a Canvas with a reference.
+                Defaults to True.
+
         Returns:
             start object: a reference to the start object to be used
         """
         if startobj is None:
             self.start = start()
+        elif as_reference and isinstance(startobj, Canvas):
+            if unused(startobj.id):
+                raise ValidationError("The Canvas must have an id to be referenced.")
+            self.start = start()
+            self.start.set_type("Canvas")
+            self.start.set_id(startobj.id)
         else:
             self.start = startobj
         return self.start
 
 
-class Manifest(_CMRCattributes, _ViewingDirection, _Start, _ServicesList):
+class _IdIndexed(object):
+    """HELPER CLASS
+
+    Lookup and removal of the objects of a Manifest or a Collection by
+    their ID. Without the index each call walks the whole object, once the
+    index is enabled with `enable_id_index` the lookups take constant time.
+
+    The index is kept up to date by the add_* methods (that use add_to),
+    set_id, Annotation.set_motivation and the remove_* methods of this
+    class. Objects assigned directly to an attribute (e.g.
+    `canvas.items = [page]`) or set with the other set_* methods are not
+    indexed until `reindex` is called. Only IIIF objects are indexed, not
+    dicts.
+    """
+
+    def enable_id_index(self):
+        """Build the index of the IDs of the objects, walking the object
+        once."""
+        if getattr(self, "_index", None) is not None:
+            self.disable_id_index()
+        _IdIndex(self)
+
+    def disable_id_index(self):
+        """Drop the index of the IDs."""
+        index = getattr(self, "_index", None)
+        if index is not None:
+            index.discard(index.root)
+
+    def reindex(self):
+        """Build the index of the IDs again, e.g. after modifying directly
+        the attributes of the objects."""
+        self.enable_id_index()
+
+    def _id_entries(self, ids):
+        """Return the (object, holder, attribute) of the objects with the
+        given IDs."""
+        index = getattr(self, "_index", None)
+        if index is not None and index.root is self:
+            return [(obj,) + index.parents[obj]
+                    for objid in ids for obj in index.ids.get(objid, ())]
+        ids = set(ids)
+        return [entry for entry in _iter_objects(self) if entry[0].id in ids]
+
+    def get_by_id(self, objid, default=None):
+        """Return the object with the given ID.
+
+        When more objects have the same ID (e.g. a Canvas and its reference
+        in a Range) the first added is returned.
+
+        Example:
+            >>> manifest.enable_id_index()
+            >>> canvas = manifest.get_by_id("https://example.org/iiif/book1/canvas/p1")
+
+        Args:
+            objid (str): The ID.
+            default (optional): The value returned if no object has the ID.
+                Defaults to None.
+
+        Returns:
+            IIIF object: The object.
+        """
+        entries = self._id_entries((objid,))
+        return entries[0][0] if entries else default
+
+    def get_all_by_id(self, objid):
+        """Return the list of the objects with the given ID."""
+        return [entry[0] for entry in self._id_entries((objid,))]
+
+    def contains_id(self, objid):
+        """Return True if an object has the given ID."""
+        return bool(self._id_entries((objid,)))
+
+    def duplicate_ids(self):
+        """Return the IDs used by more than one embedded Canvas,
+        AnnotationPage, Annotation or Range.
+
+        The Canvases referenced by the Ranges and the items of the
+        Collections are references, they are not counted.
+
+        Returns:
+            dict: The duplicated IDs mapped to the list of their objects.
+        """
+        index = getattr(self, "_index", None)
+        if index is None or index.root is not self:
+            index = _IdIndex(self, attach=False)
+        return index.duplicates()
+
+    def remove_by_id(self, objid):
+        """Remove the objects with the given ID and their content.
+
+        Args:
+            objid (str): The ID.
+
+        Returns:
+            int: The number of objects removed.
+        """
+        return self.remove_by_ids((objid,))
+
+    def remove_by_ids(self, ids):
+        """Remove the objects with the given IDs and their content, each list
+        containing them is filtered once.
+
+        Args:
+            ids (list): The IDs.
+
+        Returns:
+            int: The number of objects removed.
+        """
+        entries = self._id_entries(ids)
+        removed = _remove_objects(entries)
+        index = getattr(self, "_index", None)
+        if index is not None:
+            for obj, holder, _ in entries:
+                if holder is not None and obj in index.parents:
+                    index.discard(obj)
+        self.invalidate()
+        return removed
+
+
+class Manifest(_CMRCattributes, _ViewingDirection, _Start, _ServicesList,
+               _IdIndexed):
     """IIIF resource
 
     https://iiif.io/api/presentation/3.0/#52-manifest
@@ -2427,21 +5082,32 @@ class Manifest(_CMRCattributes, _ViewingDirection, _Start, _ServicesList):
         >>> canvas = manifest.add_canvas_to_items()
     """
 
+    _requirements = {
+        "label": Required("A Manifest must have the label property with at least one entry."),
+        "thumbnail": Recommended("A Manifest should have the thumbnail property with at least one item."),
+        "summary": Recommended("A Manifest should have the summary property with at least one entry."),
+        "metadata": Recommended("A Manifest should have the metadata property with at least one item."),
+        "items": Required("The Manifest must have an items property with at least one item"),
+        "provider": Recommended("A Manifest should have the provider property with at least one item."),
+    }
+
+    start = None
+    viewingDirection = None
+    services = None
+    structures = None
+
+    _fields = _CMRCattributes._fields + (
+        "start", "viewingDirection", "services", "items", "annotations",
+        "structures")
+
     def __init__(self):
         super(Manifest, self).__init__()
-        self.start = None
-        self.label = Required("A Manifest must have the label property with at least one entry.")
-        self.viewingDirection = None
-        self.services = None
-        self.service = None
-        self.thumbnail = Recommended("A Manifest should have the thumbnail property with at least one item.")
-        self.summary = Recommended("A Manifest should have the summary property with at least one entry.")
-        self.metadata = Recommended("A Manifest should have the metadata property with at least one item.")
-        self.items = Required("The Manifest must have an items property with at least one item")
-        self.annotations = None
-        self.provider = Recommended("A Manifest should have the provider property with at least one item.")
-        self.structures = None
-        self.placeholderCanvas = None
+        self.label = self._requirements["label"]
+        self.metadata = self._requirements["metadata"]
+        self.summary = self._requirements["summary"]
+        self.thumbnail = self._requirements["thumbnail"]
+        self.provider = self._requirements["provider"]
+        self.items = self._requirements["items"]
 
     def add_item(self, item):
         """Add an item (Canvas) to the Manifest.
@@ -2493,6 +5159,85 @@ class Manifest(_CMRCattributes, _ViewingDirection, _Start, _ServicesList):
         """
         return add_to(self, 'items', Canvas, canvasobj)
 
+    def add_canvases_from_columns(self, ids, heights, widths, labels=None,
+                                  service_ids=None, body_ids=None,
+                                  formats="image/jpeg", body_heights=None,
+                                  body_widths=None, page_ids=None,
+                                  annotation_ids=None, language="none",
+                                  body_type="Image",
+                                  service_type="ImageService3",
+                                  service_profile="level2"):
+        """Add many image Canvases to the items from columns of values.
+
+        Each row of the columns is a Canvas with an AnnotationPage
+        containing a painting Annotation, whose body is an image with an
+        image service. The columns can be lists, tuples or arrays (e.g.
+        NumPy arrays or pandas Series) of the same length, or single values
+        used for all the Canvases. Each column is validated at once (IDs,
+        positive integer dimensions and formats) and the objects are built
+        without calling their set_* and add_* methods.
+
+        Args:
+            ids (list): The IDs of the Canvases.
+            heights (list): The heights of the Canvases.
+            widths (list): The widths of the Canvases.
+            labels (list, optional): The labels of the Canvases, a None
+                value skips the label. Defaults to None.
+            service_ids (list, optional): The IDs of the image services, a
+                None value skips the service. Defaults to None (no service).
+            body_ids (list, optional): The IDs of the images. Defaults to
+                None: service_id + "/full/max/0/default.jpg".
+            formats (list, optional): The formats of the images. Defaults to
+                "image/jpeg".
+            body_heights (list, optional): The heights of the images.
+                Defaults to None: the heights of the Canvases.
+            body_widths (list, optional): The widths of the images. Defaults
+                to None: the widths of the Canvases.
+            page_ids (list, optional): The IDs of the AnnotationPages.
+                Defaults to None: canvas_id + "/page/1".
+            annotation_ids (list, optional): The IDs of the Annotations.
+                Defaults to None: canvas_id + "/page/1/annotation/1".
+            language (str, optional): The language of the labels, or a
+                column of languages. Defaults to "none".
+            body_type (str, optional): The type of the bodies, or a column.
+                Defaults to "Image".
+            service_type (str, optional): The type of the services, or a
+                column. Defaults to "ImageService3".
+            service_profile (str, optional): The profile of the services, or
+                a column. Defaults to "level2".
+
+        Example:
+            >>> manifest.add_canvases_from_columns(
+            ...     ids=["https://example.org/canvas/p1",
+            ...          "https://example.org/canvas/p2"],
+            ...     heights=[1000, 1000], widths=[750, 750],
+            ...     labels=["p. 1", "p. 2"],
+            ...     service_ids=["https://example.org/iiif/page1",
+            ...                  "https://example.org/iiif/page2"])
+
+        Returns:
+            list: The iiifpapi3.Canvas objects added.
+        """
+        columns = _image_canvas_columns(
+            ids, heights, widths, labels=labels, service_ids=service_ids,
+            body_ids=body_ids, formats=formats, body_heights=body_heights,
+            body_widths=body_widths, page_ids=page_ids,
+            annotation_ids=annotation_ids, languages=language,
+            body_types=body_type, service_types=service_type,
+            service_profiles=service_profile)
+        canvases = _image_canvases(**columns)
+        if unused(self.items):
+            self.items = []
+        self.items.extend(canvases)
+        index = getattr(self, "_index", None)
+        for canvas in canvases:
+            if PARENT_LINKS:
+                canvas._parent = (weakref.ref(self), "items")
+                canvas.link_parents()
+            if index is not None:
+                index.add(canvas, self, "items")
+        return canvases
+
     def add_structure(self, structure):
         """Add an already instatiated Range to structres without return.
 
@@ -2535,6 +5280,37 @@ class Manifest(_CMRCattributes, _ViewingDirection, _Start, _ServicesList):
         """
         return add_to(self, 'structures', Range, rangeobj)
 
+    def as_reference(self, *fields):
+        """Return a reference to the Manifest to be used in a Collection.
+
+        https://iiif.io/api/presentation/3.0/#51-collection
+
+        The reference carries only the id, type, label, thumbnail and navDate
+        of the Manifest plus the other fields named in the arguments. The
+        values are copied, so that the reference (and the JSON cached by an
+        incremental serialization of its Collection) doesn't change when the
+        Manifest is modified afterwards.
+
+        Args:
+            *fields (str): The names of the other attributes of the Manifest
+                to be added to the reference (e.g. "summary").
+
+        Example:
+            >>> ref = manifest.as_reference("summary")
+            >>> collection.add_manifest_to_items(ref)
+
+        Returns:
+            iiifpapi3.refManifest: the reference to the Manifest.
+        """
+        ref = refManifest()
+        ref.id = self.id
+        ref.label = self.label if unused(self.label) else copy.deepcopy(self.label)
+        for field in ("thumbnail", "navDate") + fields:
+            value = getattr(self, field)
+            if not unused(value):
+                setattr(ref, field, copy.deepcopy(value))
+        return ref
+
 
 class refManifest(_CoreAttributes, _Thumbnail):
     """pseudo-IIIF resource
@@ -2547,14 +5323,21 @@ class refManifest(_CoreAttributes, _Thumbnail):
     the id, type and label properties. They should have the thumbnail property.
 
     """
+    _requirements = {
+        "thumbnail": Recommended("A Manifest reference should have the thumbnail property with at least one item."),
+    }
+
+    navDate = None
+
+    _fields = ("id", "type", "label", "thumbnail", "navDate")
+
     def __init__(self):
         super(refManifest, self).__init__()
-        self.thumbnail = Recommended("A Manifest reference should have the thumbnail property with at least one item.")
+        self.thumbnail = self._requirements["thumbnail"]
         self.type = "Manifest"
-        self.navDate = None
 
 
-class Collection(_CMRCattributes, _ViewingDirection, _ServicesList):
+class Collection(_CMRCattributes, _ViewingDirection, _ServicesList, _IdIndexed):
     """IIIF resource
 
     https://iiif.io/api/presentation/3.0/#51-collection
@@ -2575,20 +5358,32 @@ class Collection(_CMRCattributes, _ViewingDirection, _ServicesList):
         >>> collection.add_manifest_to_items(manifest_1)
 
     """
+    _requirements = {
+        "thumbnail": Recommended("A Collection should have the thumbnail property with at least one item."),
+        "summary": Recommended("A Collection should have the summary"
+                               "property with at least one entry. Clients "
+                               "should render summary on a Collection."),
+        "provider": Recommended("A Collection should have the provider property with at least one item."),
+        "label": Required("A Collection must have the label property with at least one entry."),
+        "items": Required(
+            "A collection object must have at least one item!"),
+        "metadata": Recommended("A Collection should have the metadata property with at least one item."),
+    }
+
+    services = None
+    viewingDirection = None
+
+    _fields = _CMRCattributes._fields + (
+        "services", "annotations", "items", "viewingDirection")
+
     def __init__(self):
         super(Collection, self).__init__()
-        self.services = None
-        self.annotations = None
-        self.thumbnail = Recommended("A Collection should have the thumbnail property with at least one item.")
-        self.summary = Recommended("A Collection should have the summary"
-                                   "property with at least one entry. Clients "
-                                   "should render summary on a Collection.")
-        self.provider = Recommended("A Collection should have the provider property with at least one item.")
-        self.label = Required("A Collection must have the label property with at least one entry.")
-        self.items = Required(
-            "A collection object must have at least one item!")
-        self.metadata = Recommended("A Collection should have the metadata property with at least one item.")
-        self.viewingDirection = None
+        self.label = self._requirements["label"]
+        self.metadata = self._requirements["metadata"]
+        self.summary = self._requirements["summary"]
+        self.thumbnail = self._requirements["thumbnail"]
+        self.provider = self._requirements["provider"]
+        self.items = self._requirements["items"]
 
     def add_annotation(self, annotationobj):
         warnings.warn('Please use `add_annotationpage_to_annotations` instead.', DeprecationWarning)
@@ -2643,9 +5438,7 @@ class Collection(_CMRCattributes, _ViewingDirection, _ServicesList):
         """
         if isinstance(manifestobj, Manifest):
             # Adding a Manifest only the references and thumbnail are passed
-            newobj = copy.copy(manifestobj)
-            delattr(newobj, 'items')
-            manifestobj = newobj
+            manifestobj = manifestobj.as_reference()
         return add_to(self, 'items', refManifest, manifestobj, (Manifest, refManifest))
 
 
@@ -2670,20 +5463,28 @@ class Range(_CMRCattributes, _ViewingDirection, _Start):
         >>> r1.add_label('gez',"Tabiba Tabiban [ጠቢበ ጠቢባን]")
 
     """
+    _requirements = {
+        "items": Required("A range object must have at least one item!"),
+        "label": Recommended("A Range should have the label property with at least one entry"),
+    }
+
+    supplementary = None
+    viewingDirection = None
+    start = None
+
+    _fields = _CMRCattributes._fields + (
+        "annotations", "items", "supplementary", "viewingDirection", "start")
+
     def __init__(self):
         super(Range, self).__init__()
-        self.annotations = None
-        self.items = Required("A range object must have at least one item!")
-        self.supplementary = None
-        self.label = Recommended("A Range should have the label property with at least one entry")
-        self.viewingDirection = None
-        self.start = None
+        self.label = self._requirements["label"]
+        self.items = self._requirements["items"]
 
     def add_annotation(self, annotationobj=None):
         warnings.warn('Please use `add_annotationpage_to_annotations` instead.', DeprecationWarning)
         return add_to(self, 'annotations', AnnotationPage, annotationobj)
 
-    def add_item(self, item):
+    def add_item(self, item, as_reference=True):
         """Add an item (Range,Canvas,Specific Resource where the source is a
         Canvas) to the Range.
 
@@ -2697,10 +5498,19 @@ class Range(_CMRCattributes, _ViewingDirection, _Start):
         Each item must be a Range, a Canvas or a Specific Resource where the
         source is a Canvas.
 
+        A Canvas is added as a reference (its id and type) so that it is not
+        embedded a second time in the structures of the Manifest, see
+        iiifpapi3.Range.add_canvas_to_items.
+
         Args:
             item (Range,Canvas,SpecRes): The IIIF Object.
+            as_reference (bool, optional): Add a Canvas as a reference.
+                Defaults to True.
         """
-        add_to(self, 'items', Canvas, item, (Range, SpecificResource, Canvas))
+        if as_reference and isinstance(item, Canvas):
+            self.add_canvas_to_items(item)
+        else:
+            add_to(self, 'items', Canvas, item, (Range, SpecificResource, Canvas))
 
     def add_range_to_items(self, rangeobj=None):
         """Add a Range object to the items list.
@@ -2766,12 +5576,14 @@ class Range(_CMRCattributes, _ViewingDirection, _Start):
     def add_canvas_to_items(self, canvas_id):
         """Ad a reference to a Canvas to the items.
 
-        To do:
-            Might be useful to add canvasobj removing attributes.
-
         Args:
-            canvas_id (str): The ID of the Canvas.
+            canvas_id (str or iiifpapi3.Canvas): The ID of the Canvas or the
+                Canvas itself, only its id is used.
         """
+        if isinstance(canvas_id, Canvas):
+            if unused(canvas_id.id):
+                raise ValidationError("The Canvas must have an id to be referenced.")
+            canvas_id = canvas_id.id
         if unused(self.items):
             self.items = []
         entry = {"id": canvas_id,
@@ -2784,10 +5596,13 @@ class SpecificResource(_CommonAttributes):
 
     https://www.w3.org/TR/annotation-model/#specific-resources
     """
-    def __init__(self):
-        super(SpecificResource, self).__init__()
-        self.id = Recommended("An ID is recommended.")
-        self.source = None
+    _requirements = {
+        "id": Recommended("An ID is recommended."),
+    }
+
+    source = None
+
+    _fields = _CommonAttributes._fields + ("source",)
 
     def set_source(self, source, extendbase_url=None):
         """Set the source of the SpecificResource
@@ -2958,9 +5773,13 @@ class FragmentSelector(_ImmutableType):
     https://www.w3.org/TR/annotation-model/#fragment-selector
 
     """
+    _requirements = {
+        "value": Required("A fragment selector must have a value!"),
+    }
+
     def __init__(self):
         self.type = "FragmentSelector"
-        self.value = Required("A fragment selector must have a value!")
+        self.value = self._requirements["value"]
 
     def set_value(self, value):
         """Set the value of the FragmentSelector
@@ -0,0 +1,171 @@
+"""
+An index of the IANA media types for constant time lookups.
+
+The media types of IIIFpres.dictmediatype are stored in a dict keyed by their
+lower case form, so that a format is checked with a single lookup and the
+case of the type and subtype is ignored (as in RFC 6838). The types of the
+vendor and personal trees that are not registered are accepted if they end
+with a structured syntax suffix e.g. ``application/vnd.example.book+json``.
+
+Example:
+    >>> from IIIFpres.mediatype_registry import MediaTypeRegistry
+    >>> registry = MediaTypeRegistry()
+    >>> "Image/JPEG" in registry
+    True
+    >>> registry.lookup("image/jpeg")
+    'image/jpeg'
+    >>> registry.from_extension("page1.jp2")
+    'image/jp2'
+
+Attributes:
+    STRUCTURED_SUFFIXES (frozenset[str]): The structured syntax suffixes
+        accepted for the vendor and personal trees.
+
+    EXTENSIONS (dict[str, str]): The media types of the common file
+        extensions of the IIIF content resources.
+"""
+from .dictmediatype import mediatypedict
+
+STRUCTURED_SUFFIXES = frozenset((
+    "xml", "json", "ber", "cbor", "der", "fastinfoset", "wbxml", "zip",
+    "gzip", "cbor-seq", "json-seq", "sqlite3", "jwt", "yaml", "zstd"))
+
+_TREES = ("vnd.", "prs.", "x.")
+
+EXTENSIONS = {
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "jpe": "image/jpeg",
+    "jp2": "image/jp2",
+    "jpx": "image/jpx",
+    "jpf": "image/jpx",
+    "png": "image/png",
+    "gif": "image/gif",
+    "tif": "image/tiff",
+    "tiff": "image/tiff",
+    "svg": "image/svg+xml",
+    "bmp": "image/bmp",
+    "heic": "image/heic",
+    "avif": "image/avif",
+    "ico": "image/vnd.microsoft.icon",
+    "mp3": "audio/mpeg",
+    "m4a": "audio/mp4",
+    "aac": "audio/aac",
+    "oga": "audio/ogg",
+    "ogg": "audio/ogg",
+    "opus": "audio/opus",
+    "mp4": "video/mp4",
+    "m4v": "video/mp4",
+    "ogv": "video/ogg",
+    "mov": "video/quicktime",
+    "mpeg": "video/mpeg",
+    "mpg": "video/mpeg",
+    "pdf": "application/pdf",
+    "json": "application/json",
+    "jsonld": "application/ld+json",
+    "geojson": "application/geo+json",
+    "xml": "application/xml",
+    "tei": "application/tei+xml",
+    "epub": "application/epub+zip",
+    "zip": "application/zip",
+    "html": "text/html",
+    "htm": "text/html",
+    "txt": "text/plain",
+    "csv": "text/csv",
+    "vtt": "text/vtt",
+    "md": "text/markdown",
+    "rtf": "text/rtf",
+    "css": "text/css",
+    "glb": "model/gltf-binary",
+    "gltf": "model/gltf+json",
+    "obj": "model/obj",
+    "stl": "model/stl",
+    "3mf": "model/3mf",
+    "usdz": "model/vnd.usdz+zip",
+}
+
+
+class MediaTypeRegistry(object):
+    """An index of media types.
+
+    Args:
+        mediatypes (dict[str, list[str]], optional): The media types grouped
+            by top-level type. Defaults to IIIFpres.dictmediatype.mediatypedict.
+        extensions (dict[str, str], optional): The media types of the file
+            extensions. Defaults to EXTENSIONS.
+    """
+
+    def __init__(self, mediatypes=None, extensions=None):
+        if mediatypes is None:
+            mediatypes = mediatypedict
+        self._types = {}
+        self._groups = {}
+        for group, values in mediatypes.items():
+            for mediatype in values:
+                self._types[mediatype.lower()] = mediatype
+                self._groups[mediatype.lower()] = group
+        self._toplevel = frozenset(group.lower() for group in mediatypes)
+        if extensions is None:
+            extensions = EXTENSIONS
+        self._extensions = {extension.lower(): mediatype
+                            for extension, mediatype in extensions.items()}
+
+    def __contains__(self, mediatype):
+        return self.lookup(mediatype) is not None
+
+    def __len__(self):
+        return len(self._types)
+
+    def lookup(self, mediatype):
+        """Return the media type as it is written in the registry.
+
+        Args:
+            mediatype (str): The media type e.g. image/jpeg, the case is
+                ignored.
+
+        Returns:
+            str: The registered media type, the media type itself if it is
+            an unregistered type of the vendor or personal trees with a
+            structured syntax suffix or None if it is not valid.
+        """
+        if not isinstance(mediatype, str):
+            return None
+        key = mediatype.lower()
+        registered = self._types.get(key)
+        if registered is not None:
+            return registered
+        toplevel, _, subtype = key.partition("/")
+        if toplevel in self._toplevel and subtype.startswith(_TREES):
+            _, plus, suffix = subtype.rpartition("+")
+            if plus and suffix in STRUCTURED_SUFFIXES:
+                return mediatype
+        return None
+
+    def toplevel(self, mediatype):
+        """Return the top-level type of a valid media type e.g. image.
+
+        Args:
+            mediatype (str): The media type e.g. image/jpeg.
+
+        Returns:
+            str: The top-level type, the group of the media type in the
+            registry, or None if the media type is not valid.
+        """
+        if self.lookup(mediatype) is None:
+            return None
+        key = mediatype.lower()
+        return self._groups.get(key, key.partition("/")[0])
+
+    def from_extension(self, path):
+        """Return the media type of a file from its extension.
+
+        Args:
+            path (str): The file name, the path or the URL of the file or the
+                extension itself e.g. "page1.jpg", "jpg" or ".jpg".
+
+        Returns:
+            str: The media type or None if the extension is unknown.
+        """
+        path = path.split("?")[0].split("#")[0]
+        extension = path.rpartition(".")[2] if "." in path else path
+        return self._extensions.get(extension.lower())
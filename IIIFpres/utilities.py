@@ -76,9 +76,15 @@ def read_API3_json_dict(jsondict, extensions=None, save_context=False):
             newobj = iiifpapi3.refManifest()
         else:
             newobj = entitydict[obj['type']]()
-        # TODO: find better solution .update will cause height and width to be set R.
-        # newobj.__dict__ = newobj works apparently with no problem
-        newobj.__dict__.update(obj)
+        # TODO: find better solution setting all will cause height and width to be set R.
+        try:
+            for key, value in obj.items():
+                setattr(newobj, key, value)
+        except AttributeError:
+            # a property not defined by the specification on a compact class
+            newobj = newobj.Extensible()
+            for key, value in obj.items():
+                setattr(newobj, key, value)
         # Specific cases
         if obj['type'] == 'Canvas':
             if newobj.duration is not None:
@@ -122,9 +128,21 @@ def read_API3_json_file(path, extensions=None, save_context=False):
     return read_API3_json_dict(jsondict, extensions=extensions, save_context=save_context)
 
 
+def _reindex(obj):
+    """Build again the id index the object belongs to, if any."""
+    index = getattr(obj, "_index", None)
+    if index is not None:
+        index.root.reindex()
+
+
 def delete_object_byID(obj, id):
     """Deletes nested IIIF objects using the ID.
 
+    Note:
+        The whole object is walked at each call, the Manifests and the
+        Collections can remove objects by ID using an index, see
+        iiifpapi3.Manifest.remove_by_ids.
+
     Args:
         obj (dict): a dict representing the IIIF object.
         id (str): the ID of the object to be delete.
@@ -132,17 +150,34 @@ def delete_object_byID(obj, id):
     Returns:
         True: if the ID was found.
     """
-    if hasattr(obj, "__dict__"):
-        obj = obj.__dict__
+    found = _delete_object_byID(obj, id)
+    _reindex(obj)
+    return found
+
+
+def _invalidate(owner):
+    """Discard the cached JSON fragment of the IIIF object owning a list that
+    has been modified, the fragments of the objects containing it are checked
+    against it (see iiifpapi3._Fragment)."""
+    invalidate = getattr(owner, "invalidate", None)
+    if invalidate is not None:
+        invalidate()
+
+
+def _delete_object_byID(obj, id, owner=None):
+    if isinstance(obj, iiifpapi3._CoreAttributes) or hasattr(obj, "__dict__"):
+        owner = obj
+        obj = iiifpapi3._attributes(obj)
     if isinstance(obj, dict):
         for key, value in obj.items():
             if key == 'id' and value == id:
                 return True
-            delete_object_byID(value, id)
+            _delete_object_byID(value, id, owner)
     if isinstance(obj, list):
         for item in obj:
-            if delete_object_byID(item, id):
+            if _delete_object_byID(item, id, owner):
                 obj.remove(item)
+                _invalidate(owner)
     else:
         pass
 
@@ -159,23 +194,26 @@ def remove_and_insert_new(obj, id, newobj):
     Returns:
         counter (int): The number of objects removed. If 0, nothing was removed.
     """
-    def remove_and_insert_new_rec(obj, id, newobj):
+    def remove_and_insert_new_rec(obj, id, newobj, owner=None):
         nonlocal counter
-        if hasattr(obj, "__dict__"):
-            obj = obj.__dict__
+        if isinstance(obj, iiifpapi3._CoreAttributes) or hasattr(obj, "__dict__"):
+            owner = obj
+            obj = iiifpapi3._attributes(obj)
         if isinstance(obj, dict):
             for key, value in obj.items():
                 if key == 'id' and value == id:
                     counter += 1
                     return True
-                remove_and_insert_new_rec(value, id, newobj)
+                remove_and_insert_new_rec(value, id, newobj, owner)
         if isinstance(obj, list):
             for item in obj:
-                if remove_and_insert_new_rec(item, id, newobj):
+                if remove_and_insert_new_rec(item, id, newobj, owner):
                     obj.remove(item)
                     obj.append(newobj)
+                    _invalidate(owner)
         else:
             pass
     counter = 0
     remove_and_insert_new_rec(obj, id, newobj)
+    _reindex(obj)
     return counter
\ No newline at end of file
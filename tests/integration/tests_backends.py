@@ -0,0 +1,92 @@
+# -*- coding: UTF-8 -*-.
+from IIIFpres import iiifpapi3
+from IIIFpres.utilities import read_API3_json
+import unittest
+import json
+import os
+
+# python -m unittest tests_backends.py -v
+
+prj_dir = os.getcwd()
+fixture_dir = os.path.join(prj_dir, "tests", "integration", "fixtures")
+
+
+def read_fixtures():
+    """Return the IIIF objects read from the fixtures."""
+    objs = {}
+    for filename in sorted(os.listdir(fixture_dir)):
+        try:
+            obj = read_API3_json(os.path.join(fixture_dir, filename))
+            obj.json_dumps()
+        except Exception:
+            # some fixtures are tested only against the examples
+            continue
+        objs[filename] = obj
+    return objs
+
+
+class TestJSONBackends(unittest.TestCase):
+    """All the installed backends must produce the same JSON."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.previous = iiifpapi3.get_json_backend()
+        cls.objs = read_fixtures()
+        cls.backends = [name for name, backend in iiifpapi3._JSON_BACKENDS.items()
+                        if backend.available()]
+
+    @classmethod
+    def tearDownClass(cls):
+        iiifpapi3.set_json_backend(cls.previous)
+
+    def dumps_with_all_backends(self, **options):
+        for filename, obj in self.objs.items():
+            iiifpapi3.set_json_backend("json")
+            ref = obj.json_dumps(**options)
+            for name in self.backends:
+                iiifpapi3.set_json_backend(name)
+                with self.subTest(fixture=filename, backend=name, **options):
+                    res = obj.json_dumps(**options)
+                    self.assertEqual(json.loads(res), json.loads(ref))
+                    if options.get("sort_keys"):
+                        self.assertEqual(list(json.loads(res)), list(json.loads(ref)))
+
+    def test_backends(self):
+        self.assertGreater(len(self.objs), 20)
+        self.dumps_with_all_backends()
+
+    def test_backends_options(self):
+        self.dumps_with_all_backends(ensure_ascii=True)
+        self.dumps_with_all_backends(sort_keys=True)
+        self.dumps_with_all_backends(compact=True)
+        self.dumps_with_all_backends(dumps_errors=True)
+
+    def test_backends_list_context(self):
+        context = ["http://www.w3.org/ns/anno.jsonld",
+                   "http://iiif.io/api/presentation/3/context.json"]
+        manifest = self.objs["0001-mvm-image.json"]
+        for compact in (False, True):
+            iiifpapi3.set_json_backend("json")
+            ref = manifest.json_dumps(context=context, compact=compact)
+            for name in self.backends:
+                iiifpapi3.set_json_backend(name)
+                with self.subTest(backend=name, compact=compact):
+                    self.assertEqual(
+                        manifest.json_dumps(context=context, compact=compact), ref)
+
+    def test_backends_missing_required(self):
+        manifest = iiifpapi3.Manifest()
+        manifest.set_id("https://example.org/iiif/manifest")
+        manifest.add_label("en", "Manifest")
+        canvas = manifest.add_canvas_to_items()
+        canvas.set_id("https://example.org/iiif/canvas/p1")
+        for name in self.backends:
+            iiifpapi3.set_json_backend(name)
+            with self.subTest(backend=name):
+                with self.assertRaises(ValueError) as cm:
+                    manifest.json_dumps()
+                self.assertIsInstance(cm.exception.args[0], iiifpapi3.Required)
+
+
+if __name__ == "__main__":
+    unittest.main()
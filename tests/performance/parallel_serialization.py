@@ -0,0 +1,54 @@
+# Measures how json_dumps scales encoding the canvases of a large manifest
+# on a pool of processes, e.g. python parallel_serialization.py 20000
+import os
+import sys
+import time
+from IIIFpres import iiifpapi3
+
+
+def build_manifest(ncanvases):
+    iiifpapi3.BASE_URL = "https://example.org/iiif/book1/"
+    manifest = iiifpapi3.Manifest()
+    manifest.set_id(extendbase_url="manifest")
+    manifest.add_label("en", "Newspaper")
+    for idx in range(1, ncanvases + 1):
+        canvas = manifest.add_canvas_to_items()
+        canvas.set_id(extendbase_url="canvas/p%s" % idx)
+        canvas.set_height(1000)
+        canvas.set_width(750)
+        canvas.add_label("none", "p. %s" % idx)
+        annopage = canvas.add_annotationpage_to_items()
+        annopage.set_id(extendbase_url="page/p%s/1" % idx)
+        annotation = annopage.add_annotation_to_items(target=canvas.id)
+        annotation.set_id(extendbase_url="annotation/p%s-image" % idx)
+        annotation.set_motivation("painting")
+        annotation.body.set_id("https://example.org/iiif/book1/page%s/full/max/0/default.jpg" % idx)
+        annotation.body.set_type("Image")
+        annotation.body.set_format("image/jpeg")
+        annotation.body.set_width(1500)
+        annotation.body.set_height(2000)
+        service = annotation.body.add_service()
+        service.set_id("https://example.org/iiif/book1/page%s" % idx)
+        service.set_type("ImageService3")
+        service.set_profile("level2")
+    return manifest
+
+
+if __name__ == "__main__":
+    ncanvases = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    maxworkers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    manifest = build_manifest(ncanvases)
+    start = time.perf_counter()
+    reference = manifest.json_dumps()
+    single = time.perf_counter() - start
+    print("canvases: %s, cores: %s" % (ncanvases, os.cpu_count()))
+    print("workers,seconds,speedup")
+    print("1,%.3f,1.00" % single)
+    workers = 2
+    while workers <= maxworkers:
+        start = time.perf_counter()
+        res = manifest.json_dumps(workers=workers)
+        elapsed = time.perf_counter() - start
+        assert res == reference, "The parallel output differs."
+        print("%s,%.3f,%.2f" % (workers, elapsed, single / elapsed))
+        workers *= 2
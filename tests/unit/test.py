@@ -1,6 +1,17 @@
 import unittest
+import copy
+import csv
 import json
-from IIIFpres import iiifpapi3
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+from IIIFpres import BCP47_validator, bench, iiifpapi3
+from IIIFpres.utilities import read_API3_json, delete_object_byID, \
+    remove_and_insert_new
+from IIIFpres.frame import ManifestFrame, StringTable
+from IIIFpres.mediatype_registry import EXTENSIONS, MediaTypeRegistry
 from IIIFpres.iiifpapi3 import Required, Recommended
 
 # for print statements
@@ -102,7 +113,8 @@ class TestEmptyManifest(unittest.TestCase):
         with unittest.mock.patch("IIIFpres.iiifpapi3.open", open_mock, create=True):
             self.manifest.orjson_save("errortest.json", save_errors=True)
         data = '{\n  "@context": "http://iiif.io/api/presentation/3/context.json",\n  "id": {\n    "Required": "A Manifest must have the ID property."\n  },\n  "type": "Manifest",\n  "label": {\n    "Required": "A Manifest must have the label property with at least one entry."\n  },\n  "metadata": {\n    "Recommended": "A Manifest should have the metadata property with at least one item."\n  },\n  "summary": {\n    "Recommended": "A Manifest should have the summary property with at least one entry."\n  },\n  "thumbnail": {\n    "Recommended": "A Manifest should have the thumbnail property with at least one item."\n  },\n  "provider": {\n    "Recommended": "A Manifest should have the provider property with at least one item."\n  },\n  "items": {\n    "Required": "The Manifest must have an items property with at least one item"\n  }\n}'
-        open_mock.return_value.write.assert_called_once_with(data)
+        open_mock.assert_called_once_with("errortest.json", 'wb')
+        open_mock.return_value.write.assert_called_once_with(data.encode("utf-8"))
 
     def test_type_is_immutable(self):
         """Test that we can not change the type of a IIIF object with immutable
@@ -113,6 +125,23 @@ class TestEmptyManifest(unittest.TestCase):
     def test_inspect(self):
         self.assertTrue(self.manifest.inspect())
 
+    def test_inspect_quiet(self):
+        canvas = self.manifest.add_canvas_to_items()
+        canvas.set_id(extendbase_url="canvas/p1")
+        report = self.manifest.inspect(quiet=True)
+        jdump = self.manifest.json_dumps(dumps_errors=True)
+        self.assertEqual(report["missing_required"], jdump.count('"Required":'))
+        self.assertEqual(report["missing_recommended"], jdump.count('"Recommended":'))
+        self.assertIn({"path": "$.label",
+                       "description": self.manifest.label.Required},
+                      report["Required"])
+        self.assertIn("$.items[0].label",
+                      [i["path"] for i in report["Recommended"]])
+        with unittest.mock.patch('sys.stdout', new=io.StringIO()) as out:
+            self.manifest.inspect()
+        self.assertIn("Required $.label:", out.getvalue())
+        self.assertNotIn('"Required":', out.getvalue())
+
     def test_show_errors_in_browser(self):
         HTML = self.manifest.show_errors_in_browser(getHTML=True)
         text = '"Recommended": "A Manifest should have the metadata property with at least one item."'
@@ -208,6 +237,305 @@ class TestManifest(unittest.TestCase):
         with self.assertRaises(AttributeError):
             self.manifest.placeholderCanvas.set_placeholderCanvas()
 
+    def test_json_stream_matches_json_dumps(self):
+        self.manifest.add_label("it", "Immagine di Göttingen")
+        self.manifest.add_metadata("Date", "1834", "en", "en")
+        self.manifest.add_behavior("paged")
+        self.canvas.rendering = []
+        context = ["http://iiif.io/api/extension/navplace/context.json",
+                   "http://iiif.io/api/presentation/3/context.json"]
+        backend = iiifpapi3.get_json_backend()
+        self.addCleanup(iiifpapi3.set_json_backend, backend)
+        iiifpapi3.set_json_backend("json")
+        for options in ({},
+                        {"dumps_errors": True},
+                        {"ensure_ascii": True},
+                        {"sort_keys": True},
+                        {"context": context}):
+            fp = io.StringIO()
+            self.manifest.json_stream(fp, **options)
+            self.assertEqual(fp.getvalue(), self.manifest.json_dumps(**options))
+
+    def test_serialization_plan_matches_json_module(self):
+        """The plan based serializer must give the output of json.dumps."""
+        self.manifest.add_label("it", "Immagine di Göttingen")
+        self.manifest.add_metadata("Date", "1834", "en", "en")
+        self.canvas.rendering = []
+        self.canvas.duration = 1.5
+
+        def serializer(obj):
+            return {k: v for k, v in iiifpapi3._attributes(obj).items()
+                    if iiifpapi3.serializable(v)}
+        for options in ({"ensure_ascii": False},
+                        {"ensure_ascii": True},
+                        {"ensure_ascii": False, "sort_keys": True}):
+            res = json.dumps(self.manifest, default=serializer, indent=2,
+                             **options)
+            res = '{\n  "@context": "%s",\n %s' % (iiifpapi3.CONTEXT, res[3:])
+            self.assertEqual(self.manifest.json_dumps(**options), res)
+        self.assertIs(iiifpapi3._PLANS[iiifpapi3.Canvas.Extensible].cls,
+                      iiifpapi3.Canvas.Extensible)
+
+    def test_serializable_attributes(self):
+        attributes = iiifpapi3._serializable_attributes(self.canvas)
+        self.assertEqual(attributes["height"], self.height)
+        self.assertNotIn("label", attributes)
+        self.canvas.id = Required()
+        with self.assertRaises(ValueError):
+            iiifpapi3._serializable_attributes(self.canvas)
+
+    def test_to_dict_matches_json_loads(self):
+        self.manifest.add_label("it", "Immagine di Göttingen")
+        self.manifest.add_metadata("Date", "1834", "en", "en")
+        context = ["http://iiif.io/api/extension/navplace/context.json",
+                   "http://iiif.io/api/presentation/3/context.json"]
+        for options in ({},
+                        {"dumps_errors": True},
+                        {"sort_keys": True},
+                        {"context": context}):
+            for shared in (False, True):
+                res = self.manifest.to_dict(shared=shared, **options)
+                expected = json.loads(self.manifest.json_dumps(**options))
+                self.assertEqual(res, expected)
+                self.assertEqual(list(res), list(expected))
+        self.assertEqual(list(self.manifest.to_dict())[0], "@context")
+
+    def test_orjson_dumps_bytes(self):
+        self.manifest.add_label("it", "Immagine di Göttingen")
+        context = ["http://iiif.io/api/extension/navplace/context.json",
+                   "http://iiif.io/api/presentation/3/context.json"]
+        for options in ({}, {"dumps_errors": True}, {"context": context}):
+            res = self.manifest.orjson_dumps_bytes(**options)
+            self.assertIsInstance(res, bytes)
+            self.assertEqual(res.decode("utf-8"),
+                             self.manifest.orjson_dumps(**options))
+            self.assertEqual(json.loads(res), self.manifest.to_dict(**options))
+        self.assertEqual(res.decode("utf-8"),
+                         self.manifest.json_dumps(context=context))
+        self.assertEqual(self.manifest.orjson_dumps(),
+                         self.manifest.json_dumps())
+
+    def test_compact(self):
+        self.manifest.add_label("it", "Immagine di Göttingen")
+        context = ["http://iiif.io/api/extension/navplace/context.json",
+                   "http://iiif.io/api/presentation/3/context.json"]
+        for options in ({}, {"dumps_errors": True}, {"context": context}):
+            res = self.manifest.json_dumps(compact=True, **options)
+            expected = json.dumps(self.manifest.to_dict(**options),
+                                  separators=(",", ":"), ensure_ascii=False)
+            self.assertEqual(res, expected)
+            self.assertEqual(self.manifest.orjson_dumps(compact=True, **options),
+                             expected)
+            fp = io.StringIO()
+            self.manifest.json_stream(fp, compact=True, **options)
+            self.assertEqual(fp.getvalue(), expected)
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, "manifest.json")
+            self.manifest.save_stream(filename, compact=True)
+            with open(filename) as f:
+                self.assertEqual(f.read(), self.manifest.json_dumps(compact=True))
+
+    def test_json_save_sidecars(self):
+        import gzip
+        import os
+        import tempfile
+        self.manifest.add_label("en", "Picture")
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, "manifest.json")
+            self.manifest.json_save(filename, compact=True, sidecars=["gz"])
+            with open(filename) as f:
+                data = f.read()
+            with gzip.open(filename + ".gz", "rt") as f:
+                self.assertEqual(f.read(), data)
+            self.assertEqual(data, self.manifest.json_dumps(compact=True))
+            self.assertFalse(os.path.exists(filename + ".br"))
+            with self.assertRaises(ValueError):
+                self.manifest.json_save(filename, sidecars=["zip"])
+
+    def test_json_save_sidecars_utf8(self):
+        import gzip
+        import os
+        import tempfile
+        self.manifest.add_label("it", "Immagine di Göttingen")
+        with tempfile.TemporaryDirectory() as folder:
+            filename = os.path.join(folder, "manifest.json")
+            self.manifest.json_save(filename, sidecars="gz")
+            with open(filename, "rb") as f:
+                data = f.read()
+            with gzip.open(filename + ".gz", "rb") as f:
+                self.assertEqual(f.read(), data)
+            self.assertEqual(data, self.manifest.json_dumps().encode("utf-8"))
+            # the same file with an ASCII locale
+            code = ("import sys\n"
+                    "from IIIFpres import iiifpapi3\n"
+                    "manifest = iiifpapi3.Manifest()\n"
+                    "manifest.add_label('it', 'Immagine di G\\xf6ttingen')\n"
+                    "manifest.json_save(sys.argv[1], save_errors=True)\n")
+            root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            env = dict(os.environ, LC_ALL="C", PYTHONUTF8="0", PYTHONCOERCECLOCALE="0")
+            subprocess.run([sys.executable, "-c", code, filename], cwd=root, env=env,
+                           check=True)
+            with open(filename, "rb") as f:
+                self.assertIn("Göttingen".encode("utf-8"), f.read())
+
+    def test_incremental_json_dumps(self):
+        self.manifest.add_label("en", "Picture")
+        annopage = self.canvas.add_annotationpage_to_items()
+        annopage.set_id(extendbase_url="page/p1/1")
+        annotation = annopage.add_annotation_to_items(target=self.canvas.id)
+        annotation.set_id(extendbase_url="annotation/p0001-image")
+        annotation.set_motivation("painting")
+        annotation.body.set_id("https://example.org/iiif/book1/page1.jpg")
+        annotation.body.set_type("Image")
+        res = self.manifest.json_dumps(incremental=True)
+        self.assertEqual(res, self.manifest.json_dumps())
+        self.assertIsNotNone(self.canvas._fragment)
+        self.assertEqual(self.manifest.json_dumps(incremental=True), res)
+        # a method of a nested object invalidates only its fragment
+        annotation.body.set_format("image/jpeg")
+        self.assertIsNone(annotation.body._fragment)
+        self.assertIsNotNone(self.canvas._fragment)
+        res = self.manifest.json_dumps(incremental=True)
+        self.assertIn('"format": "image/jpeg"', res)
+        self.assertEqual(res, self.manifest.json_dumps())
+        # add_to invalidates the object receiving the new item
+        self.canvas.add_annotationpage_to_annotations()
+        self.assertIsNone(self.canvas._fragment)
+        with self.assertRaises(ValueError):
+            self.manifest.json_dumps(incremental=True)
+        self.canvas.annotations[0].set_id(extendbase_url="page/p1/2")
+        self.assertEqual(self.manifest.json_dumps(incremental=True),
+                         self.manifest.json_dumps())
+        # in place modifications require invalidate
+        self.canvas.label = {"en": ["Page"]}
+        self.canvas.invalidate()
+        self.assertEqual(self.manifest.json_dumps(incremental=True),
+                         self.manifest.json_dumps())
+        # the fragments depend on the options
+        self.assertEqual(
+            self.manifest.json_dumps(incremental=True, compact=True),
+            self.manifest.json_dumps(compact=True))
+
+    def test_incremental_json_dumps_untracked_objects(self):
+        """Objects containing objects that do not track changes
+        (e.g. languagemap) are not cached."""
+        self.manifest.add_label("en", "Picture")
+        metadata = self.canvas.add_metadata()
+        metadata.add_label("Date", "en")
+        metadata.add_value("1834", "en")
+        self.manifest.json_dumps(incremental=True)
+        self.assertIsNone(self.canvas._fragment)
+        metadata.add_value("1835", "en")
+        self.assertEqual(self.manifest.json_dumps(incremental=True),
+                         self.manifest.json_dumps())
+
+    def test_incremental_json_dumps_utilities(self):
+        manifest = bench.build_manifest(4)
+        manifest.json_dumps(incremental=True)
+        annotation = manifest.items[1].items[0].items[0]
+        delete_object_byID(manifest, annotation.id)
+        self.assertEqual(manifest.json_dumps(incremental=True),
+                         manifest.json_dumps())
+        manifest.json_dumps(incremental=True)
+        canvas = iiifpapi3.Canvas()
+        canvas.set_id("https://example.org/iiif/book1/canvas/new")
+        canvas.set_hightwidth(10, 10)
+        remove_and_insert_new(manifest, manifest.items[2].id, canvas)
+        res = manifest.json_dumps(incremental=True)
+        self.assertIn("canvas/new", res)
+        self.assertEqual(res, manifest.json_dumps())
+
+    def test_incremental_json_dumps_shared_values(self):
+        """The lists and dicts given to the set_* and add_* methods are
+        copied, modifying them through an object does not change the other
+        objects."""
+        self.manifest.add_label("en", "Picture")
+        label = ["Page"]
+        entry = {"label": {"en": ["Date"]}, "value": {"en": ["1834"]}}
+        canvas = self.manifest.add_canvas_to_items()
+        canvas.set_id(extendbase_url="canvas/p2")
+        canvas.set_hightwidth(10, 10)
+        for obj in (self.canvas, canvas):
+            obj.add_label("en", label)
+            obj.add_metadata(entry=entry)
+            obj.set_requiredStatement(entry=entry)
+        self.manifest.json_dumps(incremental=True)
+        self.canvas.add_label("en", "Side")
+        self.assertEqual(canvas.label, {"en": ["Page"]})
+        self.assertIsNot(canvas.metadata[0], self.canvas.metadata[0])
+        self.assertIsNot(canvas.requiredStatement, self.canvas.requiredStatement)
+        self.assertEqual(self.manifest.json_dumps(incremental=True),
+                         self.manifest.json_dumps())
+
+    def test_json_dumps_workers(self):
+        self.manifest.add_label("en", "Picture")
+        for idx in range(2, 10):
+            canvas = self.manifest.add_canvas_to_items()
+            canvas.set_id(extendbase_url="canvas/p%s" % idx)
+            canvas.set_hightwidth(self.height, self.width)
+            canvas.add_label("none", "p. %s" % idx)
+        for options in ({}, {"compact": True}, {"sort_keys": True}):
+            self.assertEqual(self.manifest.json_dumps(workers=2, **options),
+                             self.manifest.json_dumps(**options))
+        self.canvas.id = Required()
+        with self.assertRaises(ValueError):
+            self.manifest.json_dumps(workers=2)
+
+    def test_to_dict_shared(self):
+        self.manifest.add_label("en", "Picture")
+        res = self.manifest.to_dict()
+        self.assertIsNot(res["label"], self.manifest.label)
+        res = self.manifest.to_dict(shared=True)
+        self.assertIs(res["label"], self.manifest.label)
+
+    def test_json_stream_writes_in_chunks(self):
+        self.manifest.add_label("en", "Picture")
+        for _ in range(50):
+            canvas = self.manifest.add_canvas_to_items()
+            canvas.set_id(extendbase_url="canvas/p2")
+            canvas.set_hightwidth(10, 10)
+        chunks = []
+        iiifpapi3._JSONStreamEncoder(chunks.append, chunk_size=16).encode(
+            self.manifest, context=iiifpapi3.CONTEXT)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), self.manifest.json_dumps())
+
+    def test_json_stream_raises_on_required(self):
+        self.canvas.id = Required()
+        with self.assertRaises(ValueError):
+            self.manifest.json_stream(io.StringIO())
+
+    def test_set_json_backend(self):
+        backend = iiifpapi3.get_json_backend()
+        self.addCleanup(iiifpapi3.set_json_backend, backend)
+        self.assertEqual(iiifpapi3.set_json_backend("json"), "json")
+        self.assertEqual(iiifpapi3.get_json_backend(), "json")
+        with self.assertRaises(ValueError):
+            iiifpapi3.set_json_backend("notabackend")
+        self.assertEqual(iiifpapi3.get_json_backend(), "json")
+
+    def test_register_json_backend(self):
+        class Backend:
+            ensure_ascii = False
+            sort_keys = False
+
+            def dumps(self, obj, dumps_errors, ensure_ascii, sort_keys,
+                      indent, context):
+                return b'{"type": "%s"}' % obj.type.encode()
+
+        backend = iiifpapi3.get_json_backend()
+        self.addCleanup(iiifpapi3._JSON_BACKENDS.pop, "test")
+        self.addCleanup(iiifpapi3.set_json_backend, backend)
+        iiifpapi3.register_json_backend("test", Backend())
+        iiifpapi3.set_json_backend("test")
+        self.assertEqual(self.manifest.json_dumps(), '{"type": "Manifest"}')
+        # not supported options are handled by the json module
+        fp = io.StringIO()
+        self.manifest.json_stream(fp, dumps_errors=True, sort_keys=True)
+        self.assertEqual(
+            self.manifest.json_dumps(dumps_errors=True, sort_keys=True),
+            fp.getvalue())
+
 
 class Test_required_recommended_and_optionals(unittest.TestCase):
     @classmethod
@@ -738,8 +1066,30 @@ class Test_required_recommended_and_optionals(unittest.TestCase):
 
     def test_add_item_range(self):
         t = self.Canvas
-        self.Range.add_item(t)
+        self.Range.add_item(t, as_reference=False)
         self.assertEqual(self.Range.items[0], t)
+        t.set_id("https://example.org/iiif/book1/canvas/p1")
+        self.Range.add_item(t)
+        self.assertEqual(self.Range.items[1],
+                         {"id": "https://example.org/iiif/book1/canvas/p1",
+                          "type": "Canvas"})
+        with self.assertRaises(iiifpapi3.ValidationError):
+            self.Range.add_item(iiifpapi3.Canvas())
+        with self.assertRaises(iiifpapi3.ValidationError):
+            self.Range.add_canvas_to_items(iiifpapi3.Canvas())
+
+    def test_set_start_canvas(self):
+        t = self.Canvas
+        t.set_id("https://example.org/iiif/book1/canvas/p1")
+        t.add_annotationpage_to_items()
+        self.Manifest.set_start(t)
+        self.assertIsInstance(self.Manifest.start, iiifpapi3.start)
+        self.assertEqual(self.Manifest.start.id, t.id)
+        self.assertEqual(self.Manifest.start.type, "Canvas")
+        self.Range.set_start(t, as_reference=False)
+        self.assertIs(self.Range.start, t)
+        with self.assertRaises(iiifpapi3.ValidationError):
+            self.Range.set_start(iiifpapi3.Canvas())
 
     def test_behavior_auto_advance(self):
         self.Canvas.add_behavior("auto-advance")
@@ -997,12 +1347,993 @@ class Test_repr_and_print(unittest.TestCase):
         self.assertEqual(mock_stdout.getvalue(), expected_output)
 
     def test_only_numbers(self):
-        correct = "I found: a space here. \ntest \n    ^\n"
-        self.assert_stdout("https:/test ", correct)
+        # the invalid characters are returned, not printed
+        self.assert_stdout("https:/test ", "")
+        errors = iiifpapi3.uri_errors("https:/test ")
+        self.assertEqual(errors, [iiifpapi3.URIDiagnostic(
+            "https:/test ", 11, "character", " ")])
+        self.assertEqual(str(errors[0]),
+                         "I found: a space here. \nhttps:/test \n           ^")
 
     def test_repr_missing_type_and_id(self):
         self.assertEqual(repr(self.seeAlso), "Type Missing id:Missing")
 
 
+class TestRequirements(unittest.TestCase):
+    def test_shared_sentinels(self):
+        first, second = iiifpapi3.Canvas(), iiifpapi3.Canvas()
+        for name in ("id", "label", "height", "width", "items"):
+            with self.subTest(field=name):
+                self.assertIs(getattr(first, name), getattr(second, name))
+        self.assertIs(first.height, iiifpapi3.Canvas._requirements["height"])
+
+    def test_id_requirement(self):
+        self.assertEqual(iiifpapi3.Canvas().id.Required,
+                         "A Canvas must have the ID property.")
+        self.assertEqual(iiifpapi3.Manifest().id.Required,
+                         "A Manifest must have the ID property.")
+        self.assertEqual(iiifpapi3.SpecificResource().id.Recommended,
+                         "An ID is recommended.")
+
+    def test_inherited_requirements(self):
+        class MyCanvas(iiifpapi3.Canvas):
+            _requirements = {"label": Required("A label is required.")}
+
+        canvas = MyCanvas()
+        self.assertEqual(canvas.id.Required, "A MyCanvas must have the ID property.")
+        self.assertEqual(canvas.label.Required, "A label is required.")
+        self.assertIs(canvas.height, iiifpapi3.Canvas._requirements["height"])
+        dumped = json.loads(canvas.json_dumps(dumps_errors=True))
+        self.assertEqual(dumped["label"], {"Required": "A label is required."})
+
+
+class TestAddCanvasesFromColumns(unittest.TestCase):
+    base = "https://example.org/iiif/book1/"
+
+    def columns(self, n):
+        return {"ids": [self.base + "canvas/p%s" % i for i in range(1, n + 1)],
+                "labels": ["p. %s" % i for i in range(1, n + 1)],
+                "service_ids": [self.base + "page%s" % i for i in range(1, n + 1)]}
+
+    def test_same_as_setters(self):
+        columns = self.columns(3)
+        manifest = iiifpapi3.Manifest()
+        manifest.set_id(self.base + "manifest")
+        manifest.add_label("en", "Book 1")
+        canvases = manifest.add_canvases_from_columns(
+            columns["ids"], heights=1000, widths=[750, 750, 750],
+            labels=columns["labels"], service_ids=columns["service_ids"],
+            body_heights=2000, body_widths=1500)
+        self.assertEqual(manifest.items, canvases)
+        reference = iiifpapi3.Manifest()
+        reference.set_id(self.base + "manifest")
+        reference.add_label("en", "Book 1")
+        for cid, label, sid in zip(*columns.values()):
+            canvas = reference.add_canvas_to_items()
+            canvas.set_id(cid)
+            canvas.set_height(1000)
+            canvas.set_width(750)
+            canvas.add_label("none", label)
+            annopage = canvas.add_annotationpage_to_items()
+            annopage.set_id(cid + "/page/1")
+            annotation = annopage.add_annotation_to_items(target=cid)
+            annotation.set_id(cid + "/page/1/annotation/1")
+            annotation.set_motivation("painting")
+            annotation.body.set_id(sid + "/full/max/0/default.jpg")
+            annotation.body.set_type("Image")
+            annotation.body.set_format("image/jpeg")
+            annotation.body.set_height(2000)
+            annotation.body.set_width(1500)
+            service = annotation.body.add_service()
+            service.set_id(sid)
+            service.set_type("ImageService3")
+            service.set_profile("level2")
+        self.assertEqual(json.loads(manifest.json_dumps()),
+                         json.loads(reference.json_dumps()))
+        self.assertEqual(json.loads(manifest.json_dumps(dumps_errors=True)),
+                         json.loads(reference.json_dumps(dumps_errors=True)))
+
+    def test_arrays(self):
+        import array
+        columns = self.columns(2)
+        manifest = iiifpapi3.Manifest()
+        canvases = manifest.add_canvases_from_columns(
+            columns["ids"], array.array("i", [10, 20]), array.array("i", [30, 40]),
+            body_ids=[self.base + "p1.png", self.base + "p2.png"],
+            formats="image/png")
+        self.assertEqual(canvases[1].height, 20)
+        self.assertIs(canvases[1].height.__class__, int)
+        body = canvases[1].items[0].items[0].body
+        self.assertEqual(body.width, 40)
+        self.assertEqual(body.format, "image/png")
+        self.assertIsNone(body.service)
+        self.assertTrue(iiifpapi3.unused(canvases[0].label))
+
+    def test_validation(self):
+        columns = self.columns(2)
+        manifest = iiifpapi3.Manifest()
+        add = manifest.add_canvases_from_columns
+        with self.assertRaises(AssertionError):
+            add(columns["ids"][:1] + ["ftp://example.org/p2"], 10, 10,
+                service_ids=columns["service_ids"])
+        with self.assertRaises(AssertionError):
+            add([self.base + "canvas#p1"], 10, 10, service_ids=columns["service_ids"][:1])
+        with self.assertRaises(AssertionError):
+            add(columns["ids"], [10, 0], 10, service_ids=columns["service_ids"])
+        with self.assertRaises(AssertionError):
+            add(columns["ids"], 10, [10], service_ids=columns["service_ids"])
+        with self.assertRaises(AssertionError):
+            add(columns["ids"], 10, 10, service_ids=columns["service_ids"],
+                formats="image/jpg")
+        with self.assertRaises(AssertionError):
+            add(columns["ids"], 10, 10)
+        self.assertTrue(iiifpapi3.unused(manifest.items))
+        canvases = add(columns["ids"], ["10", "20"], 10,
+                       service_ids=columns["service_ids"])
+        self.assertEqual([c.height for c in canvases], [10, 20])
+
+    def test_missing_body_ids(self):
+        columns = self.columns(2)
+        manifest = iiifpapi3.Manifest()
+        with self.assertRaises(iiifpapi3.ValidationError) as cm:
+            manifest.add_canvases_from_columns(columns["ids"], 10, 10)
+        self.assertIn("body_ids", str(cm.exception))
+        with self.assertRaises(iiifpapi3.ValidationError):
+            manifest.add_canvases_from_columns(
+                columns["ids"], 10, 10, service_ids=[columns["service_ids"][0], None])
+        self.assertTrue(iiifpapi3.unused(manifest.items))
+
+
+class TestAsReference(unittest.TestCase):
+    def setUp(self):
+        self.manifest = iiifpapi3.Manifest()
+        self.manifest.set_id("https://example.org/iiif/book1/manifest")
+        self.manifest.add_label("en", "Book 1")
+        self.manifest.add_summary("en", "A book")
+        self.manifest.add_metadata("Author", "Anne Author", "en", "en")
+        self.manifest.set_navDate("1986-01-01T00:00:00+00:00")
+        canvas = self.manifest.add_canvas_to_items()
+        canvas.set_id("https://example.org/iiif/book1/canvas/p1")
+        self.manifest.add_range_to_structures()
+
+    def test_minimal_reference(self):
+        ref = self.manifest.as_reference()
+        self.assertIsInstance(ref, iiifpapi3.refManifest)
+        self.assertEqual(list(iiifpapi3._attributes(ref)),
+                         ["id", "type", "label", "thumbnail", "navDate"])
+        self.assertEqual(ref.type, "Manifest")
+        self.assertEqual(ref.label, self.manifest.label)
+        self.assertIsNot(ref.label, self.manifest.label)
+        data = json.loads(ref.json_dumps())
+        del data["@context"]
+        self.assertEqual(data, {
+            "id": "https://example.org/iiif/book1/manifest",
+            "type": "Manifest",
+            "label": {"en": ["Book 1"]},
+            "navDate": "1986-01-01T00:00:00+00:00"})
+
+    def test_fields(self):
+        ref = self.manifest.as_reference("summary")
+        self.assertEqual(ref.summary, self.manifest.summary)
+        self.assertFalse(hasattr(ref, "metadata"))
+        thumbnail = self.manifest.add_thumbnail()
+        thumbnail.set_id("https://example.org/iiif/book1/thumbnail.jpg")
+        copied = self.manifest.as_reference().thumbnail[0]
+        self.assertIsNot(copied, thumbnail)
+        self.assertEqual(copied.id, thumbnail.id)
+
+    def test_reference_not_shared(self):
+        """Modifying the Manifest doesn't modify the reference, nor the
+        JSON cached by the incremental serialization of the Collection."""
+        thumbnail = self.manifest.add_thumbnail()
+        thumbnail.set_id("https://example.org/iiif/book1/thumbnail.jpg")
+        thumbnail.set_type("Image")
+        collection = iiifpapi3.Collection()
+        collection.set_id("https://example.org/iiif/collection")
+        collection.add_label("en", "Books")
+        collection.add_manifest_to_items(self.manifest)
+        before = collection.json_dumps()
+        self.assertEqual(collection.json_dumps(incremental=True), before)
+        self.manifest.add_label("en", "Book 1, revised")
+        self.manifest.label["en"].append("Book one")
+        thumbnail.set_id("https://example.org/iiif/book1/thumbnail2.jpg")
+        self.assertEqual(collection.json_dumps(incremental=True), before)
+        self.assertEqual(collection.json_dumps(), before)
+
+    def test_add_manifest_to_items(self):
+        collection = iiifpapi3.Collection()
+        collection.set_id("https://example.org/iiif/collection")
+        collection.add_label("en", "Books")
+        collection.add_manifest_to_items(self.manifest)
+        entry = json.loads(collection.json_dumps())["items"][0]
+        self.assertEqual(sorted(entry), ["id", "label", "navDate", "type"])
+        # the Manifest is left untouched
+        self.assertEqual(len(self.manifest.items), 1)
+        self.assertEqual(len(self.manifest.structures), 1)
+
+
+class TestBCP47Validator(unittest.TestCase):
+    def test_parse(self):
+        tag = BCP47_validator.parse("zh-hant-tw")
+        self.assertEqual((tag.language, tag.script, tag.region), ("zh", "Hant", "TW"))
+        tag = BCP47_validator.parse("sl-rozaj-biske-u-co-phonebk-x-private")
+        self.assertEqual(tag.variants, ("rozaj", "biske"))
+        self.assertEqual(tag.extensions, ("u-co-phonebk",))
+        self.assertEqual(tag.privateuse, ("private",))
+        self.assertEqual(BCP47_validator.parse("zh-yue-HK").extlang, ("yue",))
+        self.assertEqual(BCP47_validator.parse("es-419").region, "419")
+        for tag in ("en--US", "en-a", "de-1901-1901", "en-a-bb-a-cc", "e", "x-"):
+            with self.subTest(tag=tag), self.assertRaises(ValueError):
+                BCP47_validator.parse(tag)
+
+    def test_validate(self):
+        for tag in ("de-DE", "sr-Latn-RS", "en-US-x-twain", "i-klingon",
+                    "x-whatever", "qaa", "en-XA", "DE-de"):
+            with self.subTest(tag=tag):
+                self.assertTrue(BCP47_validator.is_valid(tag))
+        for tag in ("xx-DE", "de-YY", "de-Abcd", "de-notvar", "qb"):
+            with self.subTest(tag=tag):
+                self.assertFalse(BCP47_validator.is_valid(tag))
+        with self.assertRaises(ValueError) as cm:
+            BCP47_validator.validate("en-YY")
+        self.assertIn("region", str(cm.exception))
+        self.assertFalse(BCP47_validator.is_valid("fr", languages={"en"}))
+
+    def test_iiifpapi3_languages(self):
+        manifest = iiifpapi3.Manifest()
+        manifest.add_label("de-DE", "Buch")
+        manifest.add_summary("zh-Hant-TW", "Book")
+        with self.assertRaises(AssertionError):
+            manifest.add_label("de-YY", "Buch")
+        languages = iiifpapi3.LANGUAGES
+        try:
+            iiifpapi3.LANGUAGES = ["en"]
+            self.assertTrue(iiifpapi3.is_valid_language("en-GB"))
+            self.assertFalse(iiifpapi3.is_valid_language("de-DE"))
+            iiifpapi3.LANGUAGES.append("tlh-Piqd")
+            self.assertTrue(iiifpapi3.is_valid_language("tlh-Piqd"))
+            self.assertTrue(iiifpapi3.is_valid_language("none"))
+        finally:
+            iiifpapi3.LANGUAGES = languages
+
+
+class TestMediaTypeRegistry(unittest.TestCase):
+    def test_lookup(self):
+        registry = MediaTypeRegistry()
+        self.assertIn("image/jpeg", registry)
+        self.assertEqual(registry.lookup("IMAGE/JPEG"), "image/jpeg")
+        self.assertEqual(registry.lookup("audio/amr"), "audio/AMR")
+        self.assertIn("application/vnd.example.book+json", registry)
+        self.assertNotIn("application/example+json", registry)
+        self.assertNotIn("application/vnd.example.book+foo", registry)
+        self.assertNotIn("foo/vnd.example+json", registry)
+        self.assertNotIn(None, registry)
+        self.assertEqual(registry.toplevel("Text/HTML"), "text")
+        self.assertIsNone(registry.toplevel("text/foo"))
+
+    def test_extensions(self):
+        registry = MediaTypeRegistry()
+        for extension, mediatype in EXTENSIONS.items():
+            with self.subTest(extension=extension):
+                self.assertEqual(registry.lookup(mediatype), mediatype)
+        self.assertEqual(registry.from_extension("page1.JPG"), "image/jpeg")
+        self.assertEqual(registry.from_extension(".jp2"), "image/jp2")
+        self.assertEqual(
+            iiifpapi3.format_from_extension("https://example.org/a.pdf?x=1"),
+            "application/pdf")
+        self.assertIsNone(registry.from_extension("page1"))
+
+    def test_set_format(self):
+        thumbnail = iiifpapi3.thumbnail()
+        thumbnail.set_format("image/JPEG")
+        with self.assertRaises(AssertionError):
+            thumbnail.set_format("image/jpg")
+        with self.assertRaises(AssertionError):
+            thumbnail.set_format("image/myformat")
+        iiifpapi3.MEDIATYPES["image"].append("image/myformat")
+        try:
+            thumbnail.set_format("image/myformat")
+        finally:
+            iiifpapi3.MEDIATYPES["image"].remove("image/myformat")
+        with self.assertRaises(AssertionError):
+            thumbnail.set_format("image/myformat")
+        body = iiifpapi3.bodycommenting()
+        body.set_format("text/plain")
+        with self.assertRaises(AssertionError):
+            body.set_format("image/jpeg")
+
+
+class TestValidateURIs(unittest.TestCase):
+    def test_validate_uris(self):
+        uris = ["https://example.org/iiif/%s" % i for i in range(3)]
+        self.assertEqual(iiifpapi3.validate_uris(uris), [])
+        uris += ["https://example.org/a b|c", "ftp://example.org",
+                 "https://example.org/c#f", None, "https://example.org:80/"]
+        errors = iiifpapi3.validate_uris(uris, canvas=True)
+        self.assertEqual([(e.index, e.reason, e.character) for e in errors], [
+            (3, "character", " "), (3, "character", "|"), (4, "scheme", None),
+            (5, "fragment", "#"), (6, "scheme", None), (7, "character", ":")])
+        self.assertEqual(errors[0].position, 21)
+        self.assertEqual(iiifpapi3.validate_uris(uris[5:6]), [])
+
+    def test_invalid_characters(self):
+        characters = iiifpapi3.INVALID_URI_CHARACTERS
+        try:
+            iiifpapi3.INVALID_URI_CHARACTERS = characters.replace(" ", "")
+            self.assertTrue(iiifpapi3.check_valid_URI("https://example.org/a b"))
+        finally:
+            iiifpapi3.INVALID_URI_CHARACTERS = characters
+        self.assertFalse(iiifpapi3.check_valid_URI("https://example.org/a b"))
+        canvas = iiifpapi3.Canvas()
+        with self.assertRaises(AssertionError) as cm:
+            canvas.set_id("https://example.org/a b")
+        self.assertIn("a space", str(cm.exception))
+
+
+class TestValidate(unittest.TestCase):
+    def build(self):
+        manifest = iiifpapi3.Manifest()
+        manifest.set_id("https://example.org/iiif/book1/manifest")
+        manifest.add_label("en", "Book 1")
+        canvas = manifest.add_canvas_to_items()
+        canvas.set_id("https://example.org/iiif/book1/canvas/p1")
+        canvas.set_height(1800)
+        canvas.set_width(1200)
+        annopage = canvas.add_annotationpage_to_items()
+        annopage.set_id("https://example.org/iiif/book1/page/p1/1")
+        annotation = annopage.add_annotation_to_items(target=canvas.id)
+        annotation.set_id("https://example.org/iiif/book1/annotation/p1")
+        annotation.set_motivation("painting")
+        annotation.body.set_id("https://example.org/iiif/book1/p1.jpg")
+        annotation.body.set_type("Image")
+        annotation.body.set_format("image/jpeg")
+        return manifest, canvas, annotation
+
+    def test_valid_tree(self):
+        manifest, canvas, annotation = self.build()
+        report = manifest.validate()
+        self.assertEqual(report["invalid"], 0)
+        self.assertEqual(report["Invalid"], [])
+        self.assertIn("missing_required", report)
+
+    def test_strict_mode(self):
+        canvas = iiifpapi3.Canvas()
+        with self.assertRaises(AssertionError):
+            canvas.set_height("tall")
+        with self.assertRaises(AssertionError):
+            canvas.set_navDate("2020")
+        with self.assertRaises(iiifpapi3.ValidationError):
+            canvas.add_behavior("paged")
+
+    def test_optimized(self):
+        """The values are checked also when the assertions are removed."""
+        code = ("from IIIFpres import iiifpapi3\n"
+                "canvas = iiifpapi3.Canvas()\n"
+                "try:\n"
+                "    canvas.set_height('tall')\n"
+                "except iiifpapi3.ValidationError:\n"
+                "    pass\n"
+                "with iiifpapi3.configure(validation='off'):\n"
+                "    canvas.set_id('https://example.org/canvas/p 1')\n"
+                "    canvas.set_width('wide')\n"
+                "print(canvas.validate()['invalid'])\n")
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        out = subprocess.run([sys.executable, "-O", "-c", code], cwd=root,
+                             capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "2")
+
+    def test_validation_off(self):
+        with iiifpapi3.configure(validation="off"):
+            manifest, canvas, annotation = self.build()
+            manifest.add_label("xx-qq", "Libro 1")
+            manifest.set_navDate("2020")
+            canvas.set_id("https://example.org/iiif/book1/canvas/p 1")
+            canvas.set_height("tall")
+            canvas.set_width("1200")
+            annotation.body.set_format("image/jpg")
+            self.assertEqual(canvas.width, 1200)
+            self.assertEqual(canvas.height, "tall")
+        report = manifest.validate()
+        paths = [field["path"] for field in report["Invalid"]]
+        self.assertEqual(report["invalid"], 5)
+        for path in ("$.label", "$.navDate", "$.items[0].id",
+                     "$.items[0].height",
+                     "$.items[0].items[0].items[0].body.format"):
+            self.assertIn(path, paths)
+        height = report["Invalid"][paths.index("$.items[0].height")]
+        self.assertIn("tall", height["description"])
+
+
+class TestConfigure(unittest.TestCase):
+    def tearDown(self):
+        iiifpapi3.configure(validation="strict", track_required=True)
+
+    def test_defaults(self):
+        self.assertEqual(iiifpapi3.get_configuration(),
+                         {"validation": "strict", "track_required": True,
+                          "compact_objects": False})
+        with self.assertRaises(ValueError):
+            iiifpapi3.configure(validation="debug")
+
+    def test_context_manager(self):
+        with iiifpapi3.configure(validation="off", track_required=False) as previous:
+            self.assertEqual(previous.validation, "strict")
+            self.assertTrue(previous.track_required)
+            self.assertEqual(iiifpapi3.get_configuration(),
+                             {"validation": "off", "track_required": False,
+                              "compact_objects": False})
+        self.assertEqual(iiifpapi3.get_configuration(),
+                         {"validation": "strict", "track_required": True,
+                          "compact_objects": False})
+        iiifpapi3.configure(validation="fast")
+        self.assertEqual(iiifpapi3.get_configuration()["validation"], "fast")
+
+    def test_fast(self):
+        iiifpapi3.configure(validation="fast")
+        canvas = iiifpapi3.Canvas()
+        canvas.set_id("https://example.org/iiif/canvas/p 1")
+        canvas.add_label("xx-qq", "Page 1")
+        canvas.set_navDate("2020")
+        with self.assertRaises(AssertionError):
+            canvas.set_height("tall")
+        with self.assertRaises(AssertionError):
+            canvas.add_behavior("hidden-nav")
+        canvas.set_height("1800")
+        self.assertEqual(canvas.height, 1800)
+
+    def test_off(self):
+        iiifpapi3.configure(validation="off")
+        canvas = iiifpapi3.Canvas()
+        canvas.set_height("tall")
+        canvas.add_behavior("hidden-nav")
+        self.assertEqual(canvas.height, "tall")
+
+    def test_per_thread(self):
+        import threading
+        levels = []
+        iiifpapi3.configure(validation="off")
+
+        def build():
+            levels.append(iiifpapi3.get_configuration()["validation"])
+            canvas = iiifpapi3.Canvas()
+            with self.assertRaises(AssertionError):
+                canvas.set_height("tall")
+        thread = threading.Thread(target=build)
+        thread.start()
+        thread.join()
+        self.assertEqual(levels, ["strict"])
+        self.assertEqual(iiifpapi3.get_configuration()["validation"], "off")
+
+    def test_track_required(self):
+        manifest = iiifpapi3.Manifest()
+        manifest.set_id("https://example.org/iiif/book1/manifest")
+        with self.assertRaises(ValueError):
+            manifest.json_dumps()
+        with iiifpapi3.configure(track_required=False):
+            with unittest.mock.patch("sys.stdout", new_callable=io.StringIO) as out:
+                res = json.loads(manifest.json_dumps())
+                self.assertEqual(manifest.to_dict()["id"], manifest.id)
+            self.assertEqual(out.getvalue(), "")
+            self.assertNotIn("label", res)
+            self.assertEqual(res["type"], "Manifest")
+            self.assertGreater(
+                manifest.inspect(quiet=True)["missing_required"], 0)
+        with self.assertRaises(ValueError):
+            manifest.json_dumps()
+        with self.assertRaises(ValueError):
+            manifest.to_dict()
+
+
+class TestIdIndex(unittest.TestCase):
+    base = "https://example.org/iiif/book1/"
+
+    def manifest(self):
+        manifest = bench.build_manifest(4)
+        rng = manifest.add_range_to_structures()
+        rng.set_id(self.base + "range/r1")
+        rng.add_label("en", "Chapter 1")
+        rng.add_canvas_to_items(self.base + "canvas/p1")
+        return manifest
+
+    def test_lookup(self):
+        manifest = self.manifest()
+        canvas = manifest.items[1]
+        self.assertIs(manifest.get_by_id(self.base + "canvas/p2"), canvas)
+        manifest.enable_id_index()
+        self.assertIs(manifest.get_by_id(self.base + "canvas/p2"), canvas)
+        self.assertIs(manifest.get_by_id(self.base + "canvas/p1"), manifest.items[0])
+        self.assertEqual(manifest.get_all_by_id(self.base + "canvas/p1"), [manifest.items[0]])
+        self.assertTrue(manifest.contains_id(self.base + "page/p3/1"))
+        self.assertFalse(manifest.contains_id(self.base + "canvas/p9"))
+        self.assertIsNone(manifest.get_by_id(self.base + "canvas/p9"))
+
+    def test_updates(self):
+        manifest = self.manifest()
+        manifest.enable_id_index()
+        canvas = manifest.items[1]
+        canvas.set_id(self.base + "canvas/new")
+        self.assertIs(manifest.get_by_id(self.base + "canvas/new"), canvas)
+        self.assertFalse(manifest.contains_id(self.base + "canvas/p2"))
+        page = canvas.add_annotationpage_to_annotations()
+        page.set_id(self.base + "comments/p2")
+        annotation = page.add_annotation_to_items(target=canvas.id)
+        annotation.set_id(self.base + "comments/p2/1")
+        self.assertIs(manifest.get_by_id(self.base + "comments/p2/1"), annotation)
+        added = manifest.add_canvases_from_columns(
+            [self.base + "canvas/p5"], 10, 10, service_ids=self.base + "page5")
+        self.assertIs(manifest.get_by_id(self.base + "canvas/p5"), added[0])
+        self.assertTrue(manifest.contains_id(self.base + "canvas/p5/page/1"))
+
+    def test_remove(self):
+        manifest = self.manifest()
+        expected = self.manifest()
+        expected.items[1:3] = []
+        manifest.enable_id_index()
+        removed = manifest.remove_by_ids([self.base + "canvas/p2", self.base + "canvas/p3"])
+        self.assertEqual(removed, 2)
+        self.assertEqual(manifest.json_dumps(), expected.json_dumps())
+        self.assertFalse(manifest.contains_id(self.base + "page/p2/1"))
+        self.assertEqual(manifest.remove_by_id(self.base + "canvas/p1"), 1)
+        self.assertEqual(len(manifest.items), 1)
+        delete_object_byID(manifest, self.base + "canvas/p4")
+        self.assertFalse(manifest.contains_id(self.base + "canvas/p4"))
+        self.assertFalse(manifest.contains_id(self.base + "page/p4/1"))
+
+    def test_duplicates(self):
+        manifest = self.manifest()
+        ref = iiifpapi3.Canvas()
+        ref.set_id(self.base + "canvas/p2")
+        ref.set_height(1000)
+        ref.set_width(750)
+        manifest.structures[0].add_item(ref)
+        self.assertEqual(manifest.duplicate_ids(), {})
+        canvas = manifest.add_canvas_to_items()
+        canvas.set_id(self.base + "canvas/p4")
+        manifest.enable_id_index()
+        duplicates = manifest.duplicate_ids()
+        self.assertEqual(list(duplicates), [self.base + "canvas/p4"])
+        self.assertIs(duplicates[self.base + "canvas/p4"][1], canvas)
+
+    def test_duplicates_in_indexed_collection(self):
+        """The temporary index of a Manifest doesn't detach its objects from
+        the index of the Collection containing it."""
+        manifest = self.manifest()
+        manifest.items[1].set_id(self.base + "canvas/p1")
+        collection = iiifpapi3.Collection()
+        collection.set_id(self.base + "collection")
+        collection.add_item(manifest)
+        collection.enable_id_index()
+        index = manifest.items[1]._index
+        duplicates = manifest.duplicate_ids()
+        self.assertEqual(list(duplicates), [self.base + "canvas/p1"])
+        self.assertIs(manifest._index, index)
+        self.assertIs(manifest.items[1]._index, index)
+        manifest.items[2].set_id(self.base + "canvas/moved")
+        self.assertIs(collection.get_by_id(self.base + "canvas/moved"),
+                      manifest.items[2])
+
+    def test_set_motivation(self):
+        manifest = self.manifest()
+        manifest.enable_id_index()
+        annotation = manifest.items[0].items[0].items[0]
+        old = annotation.body
+        self.assertIs(manifest.get_by_id(old.id), old)
+        annotation.set_motivation("painting")
+        self.assertIsNot(annotation.body, old)
+        self.assertFalse(manifest.contains_id(old.id))
+        self.assertIsNone(getattr(old, "_index", None))
+        annotation.body.set_id(self.base + "image/new.jpg")
+        self.assertIs(manifest.get_by_id(self.base + "image/new.jpg"),
+                      annotation.body)
+
+    def test_copy(self):
+        manifest = self.manifest()
+        manifest.enable_id_index()
+        copied = copy.deepcopy(manifest)
+        self.assertIsNone(getattr(copied, "_index", None))
+        self.assertIsNone(getattr(copied.items[0], "_index", None))
+        self.assertEqual(copied.json_dumps(), manifest.json_dumps())
+        copied.items[0].set_id(self.base + "canvas/copy")
+        self.assertFalse(manifest.contains_id(self.base + "canvas/copy"))
+        manifest.disable_id_index()
+        self.assertIsNone(getattr(manifest.items[0], "_index", None))
+
+
+class TestParentLinks(unittest.TestCase):
+
+    def setUp(self):
+        iiifpapi3.PARENT_LINKS = True
+
+    def tearDown(self):
+        iiifpapi3.PARENT_LINKS = False
+
+    def test_path(self):
+        manifest = bench.build_manifest(3)
+        annotation = manifest.items[2].items[0].items[0]
+        self.assertEqual(annotation.path(), "$.items[2].items[0].items[0]")
+        self.assertIs(annotation.get_parent(), manifest.items[2].items[0])
+        self.assertIs(annotation.get_root(), manifest)
+        self.assertEqual(manifest.path(), "$")
+        service = annotation.body.add_service()
+        # set_motivation links the body it creates
+        self.assertEqual(service.path(), "$.items[2].items[0].items[0].body.service[1]")
+        manifest.link_parents()
+        self.assertEqual(service.path(), "$.items[2].items[0].items[0].body.service[1]")
+        added = manifest.add_canvases_from_columns(
+            ["https://example.org/iiif/book1/canvas/p4"], 10, 10,
+            service_ids="https://example.org/iiif/book1/page4")
+        self.assertEqual(added[0].items[0].items[0].body.path(),
+                         "$.items[3].items[0].items[0].body")
+
+    def test_disabled(self):
+        iiifpapi3.PARENT_LINKS = False
+        manifest = bench.build_manifest(1)
+        self.assertIsNone(manifest.items[0].get_parent())
+        self.assertEqual(manifest.items[0].path(), "$")
+
+    def test_read(self):
+        iiifpapi3.PARENT_LINKS = False
+        manifest = read_API3_json('tests/integration/fixtures/0009-book-1.json')
+        manifest.link_parents()
+        self.assertEqual(manifest.items[4].items[0].items[0].path(),
+                         "$.items[4].items[0].items[0]")
+
+    def test_detach(self):
+        manifest = bench.build_manifest(3)
+        manifest.enable_id_index()
+        canvas = manifest.items[1]
+        page = canvas.items[0]
+        page.detach()
+        self.assertEqual(canvas.items, [])
+        self.assertFalse(manifest.contains_id(page.id))
+        canvas.detach()
+        self.assertEqual([c.id for c in manifest.items],
+                         ["https://example.org/iiif/book1/canvas/p1",
+                          "https://example.org/iiif/book1/canvas/p3"])
+        with self.assertRaises(ValueError):
+            canvas.detach()
+        self.assertEqual(page.path(), "$")
+        removed = manifest.items[1]
+        manifest.remove_by_id(removed.id)
+        with self.assertRaises(ValueError):
+            removed.path()
+
+    def test_weak(self):
+        manifest = bench.build_manifest(1)
+        canvas = manifest.items[0]
+        del manifest
+        self.assertIsNone(canvas.get_parent())
+        with self.assertRaises(ValueError):
+            canvas.path()
+        self.assertIsNone(getattr(copy.deepcopy(canvas), "_parent", None))
+
+
+class TestManifestFrame(unittest.TestCase):
+    base = "https://example.org/iiif/book1/"
+
+    def columns(self, n):
+        return {"ids": [self.base + "canvas/p%s" % i for i in range(1, n + 1)],
+                "heights": 1000,
+                "widths": [750 + i % 3 for i in range(n)],
+                "labels": ["p. %s" % i for i in range(1, n + 1)],
+                "service_ids": [self.base + "page%s" % i for i in range(1, n + 1)]}
+
+    def header(self):
+        manifest = iiifpapi3.Manifest()
+        manifest.set_id(self.base + "manifest")
+        manifest.add_label("en", "Book 1")
+        manifest.add_behavior("paged")
+        return manifest
+
+    def test_from_columns(self):
+        frame = ManifestFrame.from_columns(manifest=self.header(), **self.columns(6))
+        self.assertEqual(len(frame), 6)
+        self.assertEqual(frame.objects, {})
+        self.assertEqual(frame.widths.typecode, "L")
+        self.assertEqual(frame.formats.table, ["image/jpeg"])
+        manifest = self.header()
+        manifest.add_canvases_from_columns(**self.columns(6))
+        expected = manifest.json_dumps()
+        self.assertEqual(frame.json_dumps(), expected)
+        self.assertEqual(frame.to_manifest().json_dumps(), expected)
+        self.assertEqual(frame.json_dumps(dumps_errors=True),
+                         manifest.json_dumps(dumps_errors=True))
+        with self.assertRaises(AssertionError):
+            ManifestFrame.from_columns(**dict(self.columns(2), heights=[1, -1]))
+
+    def test_from_manifest(self):
+        manifest = bench.build_manifest(5)
+        expected = manifest.json_dumps()
+        frame = ManifestFrame.from_manifest(manifest)
+        self.assertEqual(frame.objects, {})
+        self.assertEqual(frame.page_ids[0], self.base + "page/p1/1")
+        self.assertEqual(json.loads(frame.json_dumps()), json.loads(expected))
+        self.assertEqual(manifest.json_dumps(), expected)
+        rebuilt = frame.to_manifest()
+        self.assertIsNot(rebuilt.label, manifest.label)
+        self.assertEqual(rebuilt.json_dumps(), frame.json_dumps())
+
+    def test_other_canvases(self):
+        manifest = self.header()
+        manifest.add_canvases_from_columns(**self.columns(3))
+        canvas = manifest.items[1]
+        annopage = canvas.add_annotationpage_to_annotations()
+        annopage.set_id(self.base + "comments/p2")
+        frame = ManifestFrame.from_manifest(manifest)
+        self.assertEqual(list(frame.objects), [1])
+        self.assertEqual(frame.ids[1], canvas.id)
+        expected = manifest.json_dumps()
+        self.assertEqual(frame.json_dumps(), expected)
+        self.assertEqual(frame.to_manifest().json_dumps(), expected)
+        last = frame.sort(by="widths", reverse=True)
+        self.assertEqual(list(last.widths), [752, 751, 750])
+        self.assertEqual(list(last.objects), [1])
+        self.assertEqual(json.loads(last.json_dumps())["items"][1]["annotations"][0]["id"],
+                         self.base + "comments/p2")
+
+    def test_sort_filter(self):
+        frame = ManifestFrame.from_columns(manifest=self.header(), **self.columns(7))
+        sorted_frame = frame.sort(by=("widths", "ids"))
+        self.assertEqual(list(sorted_frame.widths), [750, 750, 750, 751, 751, 752, 752])
+        self.assertEqual(sorted_frame.ids[:3], [self.base + "canvas/p%s" % i for i in (1, 4, 7)])
+        self.assertEqual(sorted_frame.labels[:3], ["p. 1", "p. 4", "p. 7"])
+        filtered = frame.filter([w == 751 for w in frame.widths])
+        self.assertEqual(filtered.ids, [self.base + "canvas/p2", self.base + "canvas/p5"])
+        self.assertEqual(list(filtered.formats), ["image/jpeg", "image/jpeg"])
+        items = json.loads(filtered.json_dumps())["items"]
+        self.assertEqual([i["id"] for i in items], filtered.ids)
+        self.assertEqual(len(frame), 7)
+        empty = frame.filter([False] * 7)
+        self.assertEqual(len(empty), 0)
+        self.assertTrue(iiifpapi3.unused(empty.to_manifest().items))
+
+    def test_sort_missing_values(self):
+        columns = self.columns(4)
+        columns["labels"] = ["p. 3", None, "p. 1", None]
+        frame = ManifestFrame.from_columns(manifest=self.header(), **columns)
+        self.assertEqual(frame.sort(by="labels").labels, ["p. 1", "p. 3", None, None])
+        self.assertEqual(frame.sort(by="labels", reverse=True).labels,
+                         [None, None, "p. 3", "p. 1"])
+        self.assertEqual(frame.sort(by=("labels", "ids")).ids,
+                         [self.base + "canvas/p%s" % i for i in (3, 1, 2, 4)])
+
+    def test_header_not_mutated(self):
+        manifest = self.header()
+        manifest.add_canvases_from_columns(**self.columns(2))
+        items = manifest.items
+
+        writes = []
+
+        class Watched(iiifpapi3.Manifest):
+            def __setattr__(self, name, value):
+                if self is manifest:
+                    writes.append(name)
+                super().__setattr__(name, value)
+        manifest.__class__ = Watched
+        try:
+            frame = ManifestFrame.from_manifest(manifest)
+            self.assertEqual(writes, [])
+        finally:
+            manifest.__class__ = iiifpapi3.Manifest
+        self.assertIs(manifest.items, items)
+        self.assertEqual(frame.json_dumps(), manifest.json_dumps())
+
+    def test_string_table(self):
+        table = StringTable(["image/jpeg", "image/png", "image/jpeg"])
+        self.assertEqual(table.table, ["image/jpeg", "image/png"])
+        self.assertEqual(list(table.codes), [0, 1, 0])
+        self.assertEqual(table[2], "image/jpeg")
+        self.assertEqual(table.take([1, 1]).tolist(), ["image/png", "image/png"])
+
+
+class TestInternShared(unittest.TestCase):
+
+    def manifest(self):
+        manifest = iiifpapi3.Manifest()
+        manifest.set_id("https://example.org/iiif/book1/manifest")
+        manifest.add_label("en", "Book 1")
+        for idx in range(1, 4):
+            canvas = manifest.add_canvas_to_items()
+            canvas.set_id("https://example.org/iiif/book1/canvas/p%s" % idx)
+            canvas.set_height(1000)
+            canvas.set_width(750)
+            canvas.set_requiredStatement(label="Attribution", value="Example",
+                                         language_l="en", language_v="en")
+            annopage = canvas.add_annotationpage_to_items()
+            annopage.set_id("https://example.org/iiif/book1/page/p%s/1" % idx)
+            annotation = annopage.add_annotation_to_items(target=canvas.id)
+            annotation.set_id("https://example.org/iiif/book1/annotation/p%s" % idx)
+            annotation.set_motivation("painting")
+            annotation.body.set_id("https://example.org/iiif/book1/page/default.jpg")
+            annotation.body.set_type("Image")
+            annotation.body.set_format("".join(["image/", "jpeg"]))
+            srv = annotation.body.add_service()
+            srv.set_id("https://example.org/iiif/book1/page")
+            srv.set_type("ImageService3")
+            srv.set_profile("level2")
+            srv.add_service({"@id": "https://example.org/iiif/auth/login",
+                             "@type": "AuthCookieService1"})
+        return manifest
+
+    def test_same_output(self):
+        manifest = self.manifest()
+        expected = manifest.json_dumps()
+        self.assertGreater(iiifpapi3.intern_shared(manifest), 0)
+        self.assertEqual(manifest.json_dumps(), expected)
+        self.assertEqual(manifest.json_dumps(dumps_errors=True),
+                         self.manifest().json_dumps(dumps_errors=True))
+
+    def test_shared_parts(self):
+        manifest = self.manifest()
+        iiifpapi3.intern_shared(manifest)
+        first, second = manifest.items[0], manifest.items[1]
+        body1 = first.items[0].items[0].body
+        body2 = second.items[0].items[0].body
+        self.assertIs(body1.format, body2.format)
+        # the mutable parts are not shared
+        self.assertIsNot(body1, body2)
+        self.assertIsNot(body1.service[0], body2.service[0])
+        self.assertEqual(first.requiredStatement, second.requiredStatement)
+        self.assertIsNot(first.requiredStatement, second.requiredStatement)
+        body1.set_format("image/png")
+        body1.service[0].set_profile("level1")
+        first.requiredStatement["value"]["en"].append("Other")
+        self.assertEqual(body2.format, "image/jpeg")
+        self.assertEqual(body2.service[0].profile, "level2")
+        self.assertEqual(second.requiredStatement["value"], {"en": ["Example"]})
+
+    def test_read_manifest(self):
+        manifest = read_API3_json('tests/integration/fixtures/0009-book-1.json')
+        expected = manifest.json_dumps()
+        iiifpapi3.intern_shared(manifest)
+        self.assertEqual(manifest.json_dumps(), expected)
+        formats = [c.items[0].items[0].body["format"] for c in manifest.items]
+        self.assertGreater(len(formats), 1)
+        self.assertTrue(all(f is formats[0] for f in formats))
+
+
+class TestCompactObjects(unittest.TestCase):
+    def build(self):
+        canvas = iiifpapi3.Canvas()
+        canvas.set_id("https://example.org/iiif/book1/canvas/p1")
+        canvas.set_height(10)
+        canvas.set_width(10)
+        annotation = canvas.add_annotationpage_to_items().add_annotation_to_items(
+            target=canvas.id)
+        annotation.set_motivation("painting")
+        annotation.body.add_service()
+        return canvas, annotation
+
+    def test_instance_dict_by_default(self):
+        canvas, annotation = self.build()
+        self.assertIs(canvas.__class__, iiifpapi3.Canvas.Extensible)
+        self.assertIsInstance(canvas, iiifpapi3.Canvas)
+        canvas.navPlace = {"type": "FeatureCollection"}
+        annotation.body.service[0].extra = "value"
+        dumped = json.loads(canvas.json_dumps(dumps_errors=True))
+        self.assertEqual(dumped["navPlace"], {"type": "FeatureCollection"})
+        body = dumped["items"][0]["items"][0]["body"]
+        self.assertEqual(body["service"][0]["extra"], "value")
+
+    def test_compact_objects(self):
+        expected = self.build()[0].json_dumps(dumps_errors=True)
+        with iiifpapi3.configure(compact_objects=True):
+            canvas, annotation = self.build()
+        self.assertIs(canvas.__class__, iiifpapi3.Canvas)
+        for obj in (canvas, canvas.items[0], annotation, annotation.body,
+                    annotation.body.service[0]):
+            self.assertFalse(hasattr(obj, "__dict__"))
+        with self.assertRaises(AttributeError):
+            canvas.navPlace = {}
+        self.assertEqual(canvas.json_dumps(dumps_errors=True), expected)
+        # the copies keep the class whatever the settings
+        self.assertIs(copy.deepcopy(canvas).__class__, iiifpapi3.Canvas)
+        self.assertIs(pickle.loads(pickle.dumps(canvas)).__class__, iiifpapi3.Canvas)
+        self.assertIs(copy.deepcopy(iiifpapi3.Canvas()).__class__,
+                      iiifpapi3.Canvas.Extensible)
+
+    def test_extensible(self):
+        canvas = iiifpapi3.Canvas.Extensible()
+        self.assertIsInstance(canvas, iiifpapi3.Canvas)
+        canvas.set_id("https://example.org/iiif/book1/canvas/p1")
+        canvas.set_height(10)
+        canvas.set_width(10)
+        canvas.navPlace = {"type": "FeatureCollection"}
+        dumped = json.loads(canvas.json_dumps())
+        self.assertEqual(dumped['navPlace'], {"type": "FeatureCollection"})
+        self.assertEqual(dumped['type'], "Canvas")
+
+    def test_read_unknown_property(self):
+        manifest = iiifpapi3.Manifest()
+        manifest.set_id("https://example.org/iiif/book1/manifest")
+        manifest.add_label("en", "Book 1")
+        canvas = iiifpapi3.Canvas.Extensible()
+        canvas.set_id("https://example.org/iiif/book1/canvas/p1")
+        canvas.set_height(10)
+        canvas.set_width(10)
+        canvas.navPlace = {"type": "FeatureCollection"}
+        manifest.add_item(canvas)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "manifest.json")
+            manifest.json_save(path)
+            read = read_API3_json(path)
+        self.assertEqual(read.items[0].navPlace, {"type": "FeatureCollection"})
+        self.assertEqual(read.json_dumps(), manifest.json_dumps())
+
+
+class TestLazyAttributes(unittest.TestCase):
+    def test_unset_optional_not_stored(self):
+        manifest = iiifpapi3.Manifest()
+        self.assertEqual(list(manifest.__dict__),
+                         ["id", "type", "label", "metadata", "summary",
+                          "thumbnail", "provider", "items"])
+        self.assertIsNone(manifest.rights)
+        self.assertIsNone(manifest.__class__.rights)
+        self.assertTrue(iiifpapi3.unused(manifest.requiredStatement))
+        manifest.set_rights("http://creativecommons.org/licenses/by/4.0/")
+        self.assertIn("rights", manifest.__dict__)
+        self.assertIsNone(iiifpapi3.Manifest().rights)
+        tmb = iiifpapi3.thumbnail()
+        self.assertEqual(list(tmb.__dict__),
+                         ["id", "type", "format", "height", "width"])
+        self.assertIsNone(tmb.service)
+
+    def test_add_to_optional(self):
+        manifest = iiifpapi3.Manifest()
+        self.assertNotIn("annotations", manifest.__dict__)
+        page = manifest.add_annotationpage_to_annotations()
+        self.assertEqual(manifest.annotations, [page])
+        self.assertIsNone(iiifpapi3.Manifest().annotations)
+
+    def test_json_order(self):
+        """The properties are dumped in the order of the class, whatever
+        the order they were set in."""
+        manifest = iiifpapi3.Manifest()
+        manifest.set_id("https://example.org/iiif/book1/manifest")
+        manifest.set_viewingDirection("right-to-left")
+        manifest.set_navDate("1986-01-01T00:00:00Z")
+        manifest.add_label("en", "Book 1")
+        manifest.set_rights("http://creativecommons.org/licenses/by/4.0/")
+        manifest.add_behavior("paged")
+        manifest.add_canvas_to_items()
+        keys = list(json.loads(manifest.json_dumps(dumps_errors=True)))
+        self.assertEqual(keys, [
+            "@context", "id", "type", "label", "metadata", "summary",
+            "rights", "thumbnail", "behavior", "provider", "navDate",
+            "viewingDirection", "items"])
+        self.assertEqual(list(manifest.to_dict(dumps_errors=True)), keys)
+        thumbnail = iiifpapi3.thumbnail()
+        thumbnail.set_duration(1.5)
+        thumbnail.add_service().set_id("https://example.org/service")
+        self.assertEqual(
+            list(iiifpapi3._attributes(thumbnail)),
+            ["id", "type", "service", "format", "height", "width", "duration"])
+
+class TestBench(unittest.TestCase):
+    def test_scenarios(self):
+        for name in bench.available_scenarios():
+            with self.subTest(scenario=name):
+                res = bench.run_scenario(name, 2, repeat=1)
+                self.assertEqual(tuple(res), bench.FIELDS)
+                self.assertEqual(res['repeat'], 1)
+                self.assertGreater(res['peak_memory_kb'], 0)
+                self.assertGreaterEqual(res['retained_memory_kb'], 0)
+
+    def test_write_results(self):
+        res = {'version': '0', 'results': [bench.run_scenario('build', 2, repeat=1)]}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench.csv")
+            bench.write_results(res, path, format="csv")
+            bench.write_results(res, path, format="csv")
+            with open(path) as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(len(rows), 2)
+            self.assertEqual(rows[0]['scenario'], 'build')
+            path = os.path.join(tmp, "bench.json")
+            bench.write_results(res, path)
+            with open(path) as f:
+                self.assertEqual(json.load(f)['results'][0]['size'], 2)
+
+
 if __name__ == "__main__":
     unittest.main()